@@ -3,6 +3,7 @@ from .executor import Executor
 from .lexer import Lexer
 from .main import main
 from .parser import Parser
+from .program import Program, compile_program
 from .transformer_ast import Transformer
 
-__all__ = ['main', 'Lexer', 'Parser', 'Transformer', 'Executor', 'Environment']
+__all__ = ['main', 'Lexer', 'Parser', 'Transformer', 'Executor', 'Environment', 'Program', 'compile_program']
@@ -0,0 +1,157 @@
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+COMPENSATED_SUM = sys.version_info >= (3, 12)
+
+
+class ArrayOperation:
+    """
+    NumPy counterpart of Operation for combining semicolon batches during factorized evaluation.
+
+    Each operand value set becomes a one-dimensional array laid out along its own axis, so the outer product of k
+    sets is formed by broadcasting and reduced left to right with one vectorized ufunc per operand. Raveling the
+    result in C order yields the cartesian order used by Executor.combine (first set varying slowest).
+
+    The results must be indistinguishable from Operation.calculate, so combine() declines (returns None) whenever the
+    array path could differ and the caller falls back to pure Python:
+    - NumPy is not installed, or there are no operands or more than MAX_DIMENSIONS sets;
+    - a set mixes types or holds anything but int or float (bool, None, str, ...);
+    - int operands could overflow int64, or exceed 2**53 in a division (Python divides ints exactly);
+    - '+' over three or more sets including floats on Python 3.12+, where the builtin sum() used by Operation is
+      compensated and left-to-right addition may differ in the last bit (COMPENSATED_SUM);
+    - '*' over floats where a set contains zero (Operation returns the int 0 in that case);
+    - '/' where a divisor set contains zero, so the Python path raises ZeroDivisionError("Division by zero") at the
+      failing combination, after the combinations before it have been calculated and sent to their arrow targets.
+
+    Attributes:
+        MAX_DIMENSIONS (int): Upper bound on operand sets reduced in one broadcast.
+        reducers (dict[str, Callable]): Map of operator to broadcast reduction.
+
+    Methods:
+        available() -> bool: Whether NumPy could be imported.
+        combine(operator, value_sets) -> numpy.ndarray | None: Vectorized outer-product reduction, or None to fall back.
+        as_array(values) -> numpy.ndarray | None: Convert a value set, or None when it is not homogeneous int/float.
+        concatenate(parts) -> list | numpy.ndarray: Join branch value sets, staying in NumPy when every part is an array
+            of the same dtype (mixing int and float branches must keep Python's per-value types).
+    """
+
+    MAX_DIMENSIONS = 32
+    INT64_LIMIT = 2 ** 63
+    EXACT_FLOAT_LIMIT = 2 ** 53
+
+    def __init__(self):
+        self.reducers = {
+            '+': self._sum,
+            '-': self._minus,
+            '*': self._multiply,
+            '/': self._divide
+        }
+
+    @staticmethod
+    def available() -> bool:
+        return np is not None
+
+    def combine(self, operator: str, value_sets: list):
+        if np is None or operator not in self.reducers or not value_sets or len(value_sets) > self.MAX_DIMENSIONS:
+            return None
+        arrays = []
+        for values in value_sets:
+            array = self.as_array(values)
+            if array is None:
+                return None
+            arrays.append(array)
+        if not self.within_limits(operator, arrays):
+            return None
+        dimensions = len(arrays)
+        operands = []
+        for axis, array in enumerate(arrays):
+            shape = [1] * dimensions
+            shape[axis] = array.shape[0]
+            operands.append(array.reshape(shape))
+        with np.errstate(all='ignore'):
+            result = self.reducers[operator](operands)
+        if result is None:
+            return None
+        shape = tuple(array.shape[0] for array in arrays)
+        return np.broadcast_to(result, shape).ravel()
+
+    @staticmethod
+    def as_array(values):
+        if isinstance(values, np.ndarray):
+            if values.dtype.kind == 'f':
+                return values.astype(np.float64, copy=False).ravel()
+            if values.dtype.kind in 'iu' and values.dtype.itemsize <= 8:
+                if values.dtype.kind == 'u' and values.size and int(values.max()) >= ArrayOperation.INT64_LIMIT:
+                    return None
+                return values.astype(np.int64, copy=False).ravel()
+            return None
+        kinds = set(map(type, values))
+        if kinds == {float}:
+            return np.array(values, dtype=np.float64)
+        if kinds == {int}:
+            if max(values) >= ArrayOperation.INT64_LIMIT or min(values) < -ArrayOperation.INT64_LIMIT:
+                return None
+            return np.array(values, dtype=np.int64)
+        return None
+
+    def within_limits(self, operator: str, arrays: list) -> bool:
+        bounds = [int(np.abs(array).max()) if array.size else 0 for array in arrays if array.dtype.kind == 'i']
+        if not bounds:
+            return True
+        if operator == '/':
+            return max(bounds) <= self.EXACT_FLOAT_LIMIT
+        if operator == '*':
+            total = 1
+            for bound in bounds:
+                total *= bound
+        else:
+            total = sum(bounds)
+        return total < self.INT64_LIMIT
+
+    @staticmethod
+    def concatenate(parts: list):
+        if np is not None and parts and all(isinstance(part, np.ndarray) for part in parts):
+            if len({part.dtype for part in parts}) == 1:
+                return np.concatenate(parts)
+        values = []
+        for part in parts:
+            values.extend(part.tolist() if np is not None and isinstance(part, np.ndarray) else part)
+        return values
+
+    @staticmethod
+    def _sum(operands: list):
+        if COMPENSATED_SUM and len(operands) > 2 and any(operand.dtype.kind == 'f' for operand in operands):
+            return None
+        result = 0
+        for operand in operands:
+            result = result + operand
+        return result
+
+    @staticmethod
+    def _minus(operands: list):
+        result = operands[0]
+        for operand in operands[1:]:
+            result = result - operand
+        return result
+
+    @staticmethod
+    def _multiply(operands: list):
+        if any(operand.dtype.kind == 'f' for operand in operands) and any((operand == 0).any() for operand in operands):
+            return None
+        result = 1
+        for operand in operands:
+            result = result * operand
+        return result
+
+    @staticmethod
+    def _divide(operands: list):
+        if any((operand == 0).any() for operand in operands[1:]):
+            return None
+        result = operands[0]
+        for operand in operands[1:]:
+            result = result / operand
+        return result
@@ -0,0 +1,152 @@
+import glob
+import json
+import os
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+
+from .program_cache import ProgramCache, load_program
+from .server import run_isolated
+
+GLOB_CHARACTERS = frozenset('*?[')
+
+
+def is_pattern(source: str) -> bool:
+    return not GLOB_CHARACTERS.isdisjoint(source)
+
+
+def expand_sources(sources: Iterable[str]) -> list[str]:
+    """
+    Turn file paths, glob patterns and directories into a list of files, in the order given and without duplicates.
+
+    Directories contribute every .fscc file below them and patterns every match (both sorted; '**' recurses). Plain
+    paths are kept even when they do not exist, so the batch reports them as failed instead of dropping them.
+    """
+
+    files = []
+    seen = set()
+    for source in sources:
+        if os.path.isdir(source):
+            matches = sorted(glob.glob(os.path.join(glob.escape(source), '**', '*.fscc'), recursive=True))
+        elif is_pattern(source):
+            matches = sorted(glob.glob(source, recursive=True))
+        else:
+            matches = [source]
+        for file in matches:
+            if file not in seen:
+                seen.add(file)
+                files.append(file)
+    return files
+
+
+@lru_cache(maxsize=None)
+def worker_cache(directory: str | None) -> ProgramCache:
+    return ProgramCache(directory)
+
+
+def run_file(file: str, engine: str = 'tree', backend: str = 'python', use_cache: bool = True,
+             cache_directory: str | None = None, combination_limit: int | None = None) -> dict:
+    """Execute one file in isolation; the run_isolated response plus 'file' and 'seconds'. Never raises."""
+
+    start = time.perf_counter()
+    cache = worker_cache(cache_directory) if use_cache else None
+    result = run_isolated(lambda: load_program(file, cache), engine, backend, combination_limit=combination_limit)
+    result['file'] = file
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+class BatchReport:
+    """
+    Aggregated outcome of a batch run.
+
+    Attributes:
+        files (list[dict]): run_file result per file, in input order.
+        seconds (float): Wall-clock time of the whole batch.
+
+    Methods:
+        succeeded() -> list[dict]: Results of the files that ran to completion.
+        failed() -> list[dict]: Results of the files that raised; 'error' holds the exception type and args.
+        to_dict() -> dict: Counts, timing and every per-file result.
+        to_json() -> str: to_dict() as JSON.
+        format(limit=20) -> str: Text summary listing the first limit failures.
+    """
+
+    def __init__(self, files: list[dict], seconds: float):
+        self.files = files
+        self.seconds = seconds
+
+    def succeeded(self) -> list[dict]:
+        return [result for result in self.files if result['ok']]
+
+    def failed(self) -> list[dict]:
+        return [result for result in self.files if not result['ok']]
+
+    def to_dict(self) -> dict:
+        failed = len(self.failed())
+        return {'files': len(self.files), 'succeeded': len(self.files) - failed, 'failed': failed,
+                'seconds': self.seconds, 'results': self.files}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def format(self, limit: int = 20) -> str:
+        failed = self.failed()
+        lines = [f"{len(self.files)} files, {len(self.files) - len(failed)} succeeded, {len(failed)} failed "
+                 f"in {self.seconds:.3f} s"]
+        for result in failed[:limit]:
+            error = result['error']
+            lines.append(f"  {result['file']}: {error['type']}: {', '.join(error['args'])}")
+        if len(failed) > limit:
+            lines.append(f"  ... and {len(failed) - limit} more")
+        return '\n'.join(lines)
+
+
+class BatchRunner:
+    """
+    Runs many .fscc files on one pool of warm worker processes.
+
+    The pool is started once for the whole batch and files are handed to it in chunks, so interpreter start-up,
+    imports and the program cache are paid per worker rather than per file. Every file gets its own Executor (see
+    run_isolated), and a file that fails to read, parse or execute only marks its own result as failed. With one
+    worker the files run in this process.
+
+    Attributes:
+        workers (int): Worker processes.
+        engine (str): 'tree', 'factorized', 'vm' or 'python'.
+        backend (str): Executor backend.
+        use_cache (bool): Whether workers go through ProgramCache.
+        cache_directory (str | None): ProgramCache location.
+        combination_limit (int | None): Executor combination_limit of every file (factorized chunking).
+
+    Methods:
+        iter_run(files) -> Iterator[dict]: run_file results in input order, as they become available.
+        run(files) -> BatchReport: Run every file and aggregate the results.
+    """
+
+    def __init__(self, workers: int = 1, engine: str = 'tree', backend: str = 'python', use_cache: bool = True,
+                 cache_directory: str | None = None, combination_limit: int | None = None):
+        if workers < 1:
+            raise ValueError(f"Invalid number of workers: {workers}")
+        self.workers = workers
+        self.engine = engine
+        self.backend = backend
+        self.use_cache = use_cache
+        self.cache_directory = cache_directory
+        self.combination_limit = combination_limit
+
+    def iter_run(self, files: list[str]) -> Iterator[dict]:
+        task = partial(run_file, engine=self.engine, backend=self.backend, use_cache=self.use_cache,
+                       cache_directory=self.cache_directory, combination_limit=self.combination_limit)
+        if self.workers == 1 or len(files) < 2:
+            yield from map(task, files)
+            return
+        chunk_size = max(1, min(64, len(files) // (self.workers * 4)))
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            yield from pool.map(task, files, chunksize=chunk_size)
+
+    def run(self, files: list[str]) -> BatchReport:
+        start = time.perf_counter()
+        results = list(self.iter_run(files))
+        return BatchReport(results, time.perf_counter() - start)
@@ -0,0 +1,189 @@
+from collections.abc import Iterable, Iterator
+
+from .node_fscc import Node
+from .token_fscc import NodeType
+
+PUSH_CONST = 0
+LOAD_VAR = 1
+LOAD_NAME = 2
+REDUCE_ADD = 3
+REDUCE_SUB = 4
+REDUCE_MUL = 5
+REDUCE_DIV = 6
+REDUCE = 7
+STORE = 8
+PRINT = 9
+ARROW = 10
+EVAL = 11
+RESULT = 12
+POP = 13
+
+OPCODE_NAMES = ('PUSH_CONST', 'LOAD_VAR', 'LOAD_NAME', 'REDUCE_ADD', 'REDUCE_SUB', 'REDUCE_MUL', 'REDUCE_DIV', 'REDUCE',
+                'STORE', 'PRINT', 'ARROW', 'EVAL', 'RESULT', 'POP')
+REDUCERS = {'+': REDUCE_ADD, '-': REDUCE_SUB, '*': REDUCE_MUL, '/': REDUCE_DIV}
+
+
+class Compiler:
+    """
+    Lowers transformed statements (Transformer.iter_transform output, resolved by VariableResolver) into flat bytecode
+    for vm.VirtualMachine.
+
+    Code is a list of (opcode, argument) pairs without jumps: a task pushes its operands left to right (PUSH_CONST for
+    literals, LOAD_VAR for resolved variables, LOAD_NAME for unresolved identifiers, nested tasks inline), reduces them
+    with REDUCE_ADD/SUB/MUL/DIV n (REDUCE (operator, n) for anything else) and applies its '->' targets to the value on
+    top of the stack with STORE (frame slot), PRINT or ARROW (any other target). A CALCULATION ends with RESULT, which
+    pops the statement's result; a VARIABLE_ASSIGNMENT pushes each value, applies its targets and POPs it. A task
+    whose targets the instructions cannot express (a computed target after '->', or a '->' without a target) becomes
+    EVAL task, which runs it through Executor.execute_single_command, so every statement keeps the tree-walker's
+    evaluation order, side effects and errors.
+
+    Variants share the subtrees Transformer did not rewrite, so a nested task compiled a second time has its code
+    cached by node (nodes are immutable) and copied on later encounters; tasks inside a cached one are not cached
+    again, which keeps compiling deep expressions linear. The cache holds up to FRAGMENT_CACHE_LIMIT entries.
+
+    Attributes:
+        FRAGMENT_CACHE_LIMIT (int): Cached tasks kept before the cache is cleared.
+        fragments (dict[int, tuple[Node, list | None]]): Per task node id, the node (kept alive with the entry) and its
+            code, or None when it has only been compiled once.
+
+    Methods:
+        compile_statement(statement) -> list[tuple]: Code of one transformed top-level statement.
+        iter_compile(statements) -> Iterator[list[tuple]]: Code per statement, one statement at a time.
+        compile_statements(statements) -> list[tuple]: Code of every statement, concatenated.
+    """
+
+    FRAGMENT_CACHE_LIMIT = 4096
+
+    def __init__(self):
+        self.fragments = {}
+
+    def iter_compile(self, statements: Iterable[Node]) -> Iterator[list[tuple]]:
+        for statement in statements:
+            yield self.compile_statement(statement)
+
+    def compile_statements(self, statements: Iterable[Node]) -> list[tuple]:
+        code = []
+        for statement in statements:
+            code.extend(self.compile_statement(statement))
+        return code
+
+    def compile_statement(self, statement: Node) -> list[tuple]:
+        code = []
+        if statement.type == NodeType.CALCULATION.value:
+            if statement.args.type == NodeType.TASK_NODE.value:
+                self.compile_task(statement.args, code)
+            else:
+                code.append((EVAL, statement.args))
+            code.append((RESULT, None))
+        elif statement.type == NodeType.VARIABLE_ASSIGNMENT.value:
+            for value, *targets in statement.args:
+                code.append((PUSH_CONST, value.args))
+                code.extend([self.target(target) for target in targets])
+                code.append((POP, None))
+        return code
+
+    def compile_task(self, task: Node, code: list):
+        task_type = NodeType.TASK_NODE.value
+        variable_type = NodeType.VARIABLE.value
+        scalar_type = NodeType.SCALAR.value
+        fragments = self.fragments
+        layout = self.layout(task)
+        if layout is None:
+            code.append((EVAL, task))
+            return
+        pending = []
+        end, targets = layout
+        node, position, count, start = task, 0, 0, None
+        while True:
+            args = node.args
+            for position in range(position, end):
+                current = args[position]
+                if current.type == task_type:
+                    fragment = fragments.get(id(current))
+                    if fragment is not None and fragment[0] is current and fragment[1] is not None:
+                        code.extend(fragment[1])
+                        count += 1
+                        continue
+                    layout = self.layout(current)
+                    if layout is not None:
+                        break
+                    code.append((EVAL, current))
+                elif current.type == variable_type:
+                    code.append((LOAD_VAR, current))
+                elif current.type != scalar_type:
+                    continue
+                elif isinstance(current.args, str):
+                    code.append((LOAD_NAME, current.args))
+                else:
+                    code.append((PUSH_CONST, current.args))
+                count += 1
+            else:
+                operator = node.command.args if node.command else None
+                if operator in REDUCERS:
+                    code.append((REDUCERS[operator], count))
+                else:
+                    code.append((REDUCE, (operator, count)))
+                code.extend(targets)
+                if start is not None:
+                    if len(fragments) >= self.FRAGMENT_CACHE_LIMIT:
+                        fragments.clear()
+                    fragments[id(node)] = (node, code[start:] if start >= 0 else None)
+                if not pending:
+                    return
+                node, end, targets, position, count, start = pending.pop()
+                count += 1
+                continue
+            pending.append((node, end, targets, position + 1, count, start))
+            node, position, count, start = current, 0, 0, self.cache_start(current, code, start)
+            end, targets = layout
+
+    def cache_start(self, task: Node, code: list, parent_start: int | None) -> int | None:
+        """Where task's code starts if it is to be cached (second compilation), -1 to record it as compiled once, or
+        None inside a task that is being cached."""
+
+        if parent_start is not None and parent_start >= 0:
+            return None
+        fragment = self.fragments.get(id(task))
+        if fragment is not None and fragment[0] is task:
+            return len(code)
+        return -1
+
+    def layout(self, task: Node) -> tuple[int, list] | None:
+        """Index of the first '->' in task.args and the target instructions, or None when EVAL must run the task."""
+
+        args = task.args
+        for end, current in enumerate(args):
+            if current.args == '->':
+                break
+        else:
+            return len(args), []
+        targets = []
+        segment_start = False
+        for current in args[end:]:
+            if current.args == '->':
+                if segment_start:
+                    return None
+                segment_start = True
+            elif current.type not in (NodeType.SCALAR.value, NodeType.VARIABLE.value):
+                return None
+            elif segment_start:
+                segment_start = False
+                targets.append(self.target(current))
+        if segment_start:
+            return None
+        return end, targets
+
+    @staticmethod
+    def target(node: Node) -> tuple:
+        if node.type == NodeType.VARIABLE.value:
+            return STORE, node
+        if node.args == 'print':
+            return PRINT, None
+        return ARROW, node.args
+
+
+def disassemble(code: list[tuple]) -> str:
+    """One line per instruction: offset, opcode name and argument."""
+
+    return '\n'.join([f'{offset:6}  {OPCODE_NAMES[opcode]:<10}' + ('' if argument is None else f'  {argument!r}')
+                      for offset, (opcode, argument) in enumerate(code)])
@@ -0,0 +1,285 @@
+import ast
+import csv
+import mmap
+import os
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+
+from .array_backend import np
+from .lexer import Lexer
+from .node_fscc import Node
+from .token_fscc import NodeType, TokenType
+
+DTYPES = {
+    'f8': 'd', 'f4': 'f',
+    'i8': 'q', 'i4': 'i', 'i2': 'h', 'i1': 'b',
+    'u8': 'Q', 'u4': 'I', 'u2': 'H', 'u1': 'B',
+    'b1': '?',
+}
+NPY_MAGIC = b'\x93NUMPY'
+NATIVE_ORDER = '<' if sys.byteorder == 'little' else '>'
+
+
+class DataColumn(Sequence):
+    """
+    One-dimensional numeric dataset bound to a variable name, used as the args of a MULTI_EXPR node.
+
+    Every value is a branch of the batch: indexing and iteration produce SCALAR nodes one at a time, so Transformer
+    expands a bound column exactly like a written-out ';' batch, while Transformer.count, split and select and the
+    factorized Executor use len() and values directly. values is a memoryview over a memory-mapped file (raw binary and
+    .npy) or an array (CSV), so the data is never copied into Python lists; indexing it yields Python int, float or
+    bool. Columns opened from a file pickle as that file (and their window into it), so worker processes map the file
+    again instead of receiving the data.
+
+    Attributes:
+        values (Sequence): The numbers, indexable without copying.
+        source (tuple | None): (path, spec, start, stop) to reopen the column, or None for in-memory data.
+
+    Methods:
+        batch(arrays=False): values, or a NumPy view of them when arrays is True and NumPy is installed.
+    """
+
+    __slots__ = ['values', 'source']
+
+    def __init__(self, values: Sequence, source: tuple | None = None):
+        if not isinstance(values, (memoryview, list)):
+            try:
+                values = memoryview(values)
+            except TypeError:
+                values = list(values)
+        self.values = values
+        self.source = source
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self.values))
+            if step != 1:
+                raise ValueError("DataColumn slices must be contiguous")
+            source = None
+            if self.source is not None:
+                path, spec, offset, _ = self.source
+                source = path, spec, offset + start, offset + max(start, stop)
+            return DataColumn(self.values[start:stop], source)
+        return Node(NodeType.SCALAR.value, self.values[index])
+
+    def __iter__(self) -> Iterator[Node]:
+        scalar_type = NodeType.SCALAR.value
+        for value in self.values:
+            yield Node(scalar_type, value)
+
+    def __repr__(self) -> str:
+        return f'DataColumn({len(self.values)} values)'
+
+    def __reduce__(self):
+        if self.source is None:
+            return DataColumn, (list(self.values),)
+        return load_column, self.source
+
+    def batch(self, arrays: bool = False):
+        if arrays and np is not None and isinstance(self.values, memoryview):
+            return np.asarray(self.values)
+        return self.values
+
+
+def map_file(path: str) -> memoryview:
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return memoryview(b'')
+        return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def cast(buffer: memoryview, dtype: str, path: str) -> memoryview:
+    if dtype not in DTYPES:
+        raise ValueError(f"Invalid dtype {dtype!r} for {path}; expected one of {', '.join(DTYPES)}")
+    itemsize = int(dtype[1:])
+    if len(buffer) % itemsize:
+        raise ValueError(f"{path}: size {len(buffer)} is not a multiple of {itemsize} ({dtype})")
+    return buffer.cast('B').cast(DTYPES[dtype])
+
+
+def open_raw(path: str, dtype: str = 'f8') -> DataColumn:
+    """Map a raw binary file of native-endian dtype values ('f8', 'f4', 'i8', ..., 'u1', 'b1')."""
+
+    return DataColumn(cast(map_file(path), dtype, path), (path, dtype, 0, None))
+
+
+def open_npy(path: str) -> DataColumn:
+    """
+    Map a one-dimensional .npy file (format versions 1 to 3) in native byte order.
+
+    Raises:
+        ValueError: When the file is not a .npy file, is not one-dimensional or has an unsupported dtype.
+    """
+
+    buffer = map_file(path)
+    if bytes(buffer[:6]) != NPY_MAGIC:
+        raise ValueError(f"{path}: not a .npy file")
+    if buffer[6] == 1:
+        length, start = int.from_bytes(buffer[8:10], 'little'), 10
+    else:
+        length, start = int.from_bytes(buffer[8:12], 'little'), 12
+    header = ast.literal_eval(bytes(buffer[start:start + length]).decode('latin1'))
+    descr, shape = header['descr'], header['shape']
+    if not isinstance(descr, str) or descr[0] not in ('|', '=', NATIVE_ORDER) or descr[1:] not in DTYPES:
+        raise ValueError(f"{path}: unsupported dtype {descr!r}")
+    if len(shape) != 1:
+        raise ValueError(f"{path}: expected a one-dimensional array, got shape {shape}")
+    offset = start + length
+    data = buffer[offset:offset + shape[0] * int(descr[2:])]
+    return DataColumn(cast(data, descr[1:], path), (path, None, 0, None))
+
+
+def read_csv_column(path: str, column: str | None = None) -> DataColumn:
+    """
+    Read one column of a CSV file into a float64 array: column is a header name or a 0-based index (default 0). A
+    first row that is not numeric is taken as the header.
+
+    Raises:
+        ValueError: For an unknown column or a value that is not a number.
+    """
+
+    values = array('d')
+    with open(path, encoding='utf-8', newline='') as file:
+        rows = csv.reader(file)
+        first = next(rows, None)
+        if first is None:
+            return DataColumn(memoryview(values), (path, column, 0, None))
+        try:
+            [float(cell) for cell in first]
+            header = None
+        except ValueError:
+            header = first
+        if column is None or column.isdigit():
+            index = int(column or 0)
+        elif header is not None and column in header:
+            index = header.index(column)
+        else:
+            raise ValueError(f"{path}: no column {column!r}")
+        line = 1
+        try:
+            if header is None:
+                values.append(float(first[index]))
+            for line, row in enumerate(rows, start=2):
+                if row:
+                    values.append(float(row[index]))
+        except (ValueError, IndexError):
+            raise ValueError(f"{path}: invalid value in column {column or 0!r}, line {line}") from None
+    return DataColumn(memoryview(values), (path, column, 0, None))
+
+
+def open_column(path: str, spec: str | None = None) -> DataColumn:
+    """Open path by its extension: .npy, .csv (spec is the column) or raw binary (spec is the dtype, default 'f8')."""
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.npy':
+        if spec is not None:
+            raise ValueError(f"{path}: .npy files take no dtype or column")
+        return open_npy(path)
+    if extension == '.csv':
+        return read_csv_column(path, spec)
+    return open_raw(path, spec or 'f8')
+
+
+def load_column(path: str, spec: str | None, start: int, stop: int | None) -> DataColumn:
+    """Reopen a column from its DataColumn.source (used when a column is unpickled in another process)."""
+
+    column = open_column(path, spec)
+    return column[start:stop] if start or stop is not None else column
+
+
+def parse_binding(text: str) -> tuple[str, DataColumn]:
+    """
+    Parse a --bind value NAME=PATH[:SPEC] and open the column.
+
+    NAME must be a word the lexer reads as a variable name, so builtins and keywords (print, True, False, None) are
+    rejected.
+
+    Raises:
+        ValueError: When text has no NAME= part, NAME is not a variable name or the file cannot be bound.
+    """
+
+    name, separator, path = text.partition('=')
+    if not separator or not path:
+        raise ValueError(f"Invalid binding: {text!r}; expected NAME=PATH[:SPEC]")
+    if not is_variable_name(name):
+        raise ValueError(f"Invalid binding: {name!r} is not a variable name")
+    spec = None
+    head, separator, tail = path.rpartition(':')
+    if separator and head and os.sep not in tail and not os.path.exists(path):
+        path, spec = head, tail
+    return name, open_column(path, spec)
+
+
+def is_variable_name(name: str) -> bool:
+    try:
+        tokens = Lexer(name).make_tokens()
+    except SyntaxError:
+        return False
+    return len(tokens) == 1 and tokens[0].type == TokenType.TT_IDENTIFIER.value and tokens[0].value == name
+
+
+def bind_data(statements: Iterable[Node], bindings: Mapping[str, Sequence]) -> Iterator[Node]:
+    """
+    Replace every read of a bound name in Parser output with a MULTI_EXPR batch over its DataColumn.
+
+    Values in bindings are DataColumn objects or any sequence of numbers (list, array, memoryview, NumPy array); each
+    name gets one batch node shared by all its reads. Runs before VariableResolver, so bound names never become
+    variables. Statements are rewritten one at a time with an explicit stack.
+
+    Raises:
+        ValueError: When a statement assigns to a bound name.
+    """
+
+    from .dependencies import statement_effects
+
+    batches = {name: Node(NodeType.MULTI_EXPR.value, values if isinstance(values, DataColumn) else DataColumn(values))
+               for name, values in bindings.items()}
+    for statement in statements:
+        written = statement_effects(statement).writes.intersection(batches)
+        if written:
+            raise ValueError(f"Cannot assign to bound variable {sorted(written)[0]!r}, line {statement.line}")
+        if statement.type == NodeType.CALCULATION.value and batches:
+            yield Node(statement.type, bind_node(statement.args, batches), line=statement.line)
+        else:
+            yield statement
+
+
+def bind_node(node: Node, batches: dict[str, Node]) -> Node:
+    task_type = NodeType.TASK_NODE.value
+    scalar_type = NodeType.SCALAR.value
+    batch_types = (NodeType.MULTI_EXPR.value, task_type)
+    if node.type not in batch_types:
+        return batches.get(node.args, node) if node.type == scalar_type and isinstance(node.args, str) else node
+    pending = []
+    args = []
+    arrow = False
+    position = 0
+    while True:
+        children = node.args
+        is_task = node.type == task_type
+        for position in range(position, len(children)):
+            current = children[position]
+            if is_task and current.type == scalar_type and current.args == '->':
+                arrow = True
+                args.append(current)
+            elif arrow:
+                args.append(current)
+            elif current.type in batch_types and current.args.__class__ is not DataColumn:
+                break
+            elif current.type == scalar_type and isinstance(current.args, str):
+                args.append(batches.get(current.args, current))
+            else:
+                args.append(current)
+        else:
+            bound = Node(node.type, args, node.command)
+            if not pending:
+                return bound
+            node, position, args, arrow = pending.pop()
+            args.append(bound)
+            continue
+        pending.append((node, position + 1, args, arrow))
+        node, position, args, arrow = current, 0, [], False
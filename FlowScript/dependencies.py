@@ -0,0 +1,137 @@
+from .data_binding import DataColumn
+from .node_fscc import Node
+from .token_fscc import NodeType
+
+
+class StatementEffects:
+    """
+    Variables a top-level statement reads and writes through Environment.
+
+    Attributes:
+        reads (set[str]): Identifiers looked up in value positions, including nested tasks and semicolon branches.
+        writes (set[str]): Arrow targets other than 'print', and VARIABLE_ASSIGNMENT targets.
+        prints (bool): Whether the statement routes any value to the print built-in.
+        dynamic (bool): True when an arrow target is computed at run time, so the effects cannot be known statically.
+    """
+
+    __slots__ = ['reads', 'writes', 'prints', 'dynamic']
+
+    def __init__(self):
+        self.reads = set()
+        self.writes = set()
+        self.prints = False
+        self.dynamic = False
+
+    def add_target(self, target):
+        if target == 'print':
+            self.prints = True
+        else:
+            self.writes.add(target)
+
+    def __repr__(self) -> str:
+        return f'StatementEffects(reads={sorted(map(str, self.reads))}, writes={sorted(map(str, self.writes))})'
+
+
+def statement_effects(statement: Node) -> StatementEffects:
+    """
+    Collect the reads and writes of one top-level CALCULATION or VARIABLE_ASSIGNMENT node from Parser.parse.
+
+    Walks the tree with an explicit stack. Inside a task node, scalars before the first '->' are operands (identifiers
+    among them are reads); after it, the first operand of every '->' segment is the target the Executor assigns to.
+    """
+
+    effects = StatementEffects()
+    if statement.type == NodeType.VARIABLE_ASSIGNMENT.value:
+        for targets in statement.args[1:]:
+            for target in targets:
+                effects.add_target(target.args)
+        return effects
+    stack = [statement.args]
+    while stack:
+        node = stack.pop()
+        if node.type == NodeType.SCALAR.value:
+            if isinstance(node.args, str) and node.args != '->':
+                effects.reads.add(node.args)
+            continue
+        if node.type != NodeType.TASK_NODE.value:
+            if node.args.__class__ is not DataColumn:
+                stack.extend(node.args)
+            continue
+        arrows = segment_start = False
+        for current in node.args:
+            if current.type == NodeType.SCALAR.value:
+                if current.args == '->':
+                    arrows = segment_start = True
+                elif segment_start:
+                    segment_start = False
+                    effects.add_target(current.args)
+                elif not arrows and isinstance(current.args, str):
+                    effects.reads.add(current.args)
+            else:
+                if segment_start:
+                    segment_start = False
+                    effects.dynamic = True
+                stack.append(current)
+    return effects
+
+
+class DependencyGraph:
+    """
+    Read/write dependency DAG over top-level statements as produced by Parser.parse.
+
+    Statement j depends on statement i < j when j reads a variable last written by i (read after write), writes a
+    variable i reads before any later write (write after read), or writes a variable last written by i (write after
+    write). A statement with dynamic effects is a barrier that depends on every earlier statement and precedes every
+    later one. Print output is not an edge: callers emit captured output in statement order.
+
+    Attributes:
+        statements (list[Node]): The analyzed top-level nodes.
+        effects (list[StatementEffects]): Effects per statement.
+        dependencies (list[set[int]]): Indices each statement depends on.
+
+    Methods:
+        levels() -> list[list[int]]: Statement indices grouped by longest-path depth; each group only depends on earlier
+            groups, so its members can run concurrently.
+    """
+
+    def __init__(self, statements: list[Node]):
+        self.statements = statements
+        self.effects = [statement_effects(statement) for statement in statements]
+        self.dependencies = [set() for _ in statements]
+        last_writer = {}
+        readers = {}
+        barrier = None
+        for index, effects in enumerate(self.effects):
+            dependencies = self.dependencies[index]
+            if effects.dynamic:
+                dependencies.update(range(index))
+                barrier = index
+                last_writer.clear()
+                readers.clear()
+                continue
+            if barrier is not None:
+                dependencies.add(barrier)
+            for name in effects.reads:
+                if name in last_writer:
+                    dependencies.add(last_writer[name])
+            for name in effects.writes:
+                if name in last_writer:
+                    dependencies.add(last_writer[name])
+                dependencies.update(readers.get(name, ()))
+            for name in effects.reads:
+                readers.setdefault(name, []).append(index)
+            for name in effects.writes:
+                last_writer[name] = index
+                readers[name] = []
+            dependencies.discard(index)
+
+    def levels(self) -> list[list[int]]:
+        depth = []
+        groups = []
+        for index, dependencies in enumerate(self.dependencies):
+            level = max((depth[dependency] + 1 for dependency in dependencies), default=0)
+            depth.append(level)
+            if level == len(groups):
+                groups.append([])
+            groups[level].append(index)
+        return groups
@@ -1,9 +1,87 @@
+from collections.abc import Iterator, MutableMapping
+
+UNSET = object()
+
+
+class Frame:
+    """
+    Flat variable storage: every name gets a fixed slot index and its value lives in a list at that index.
+
+    Slots are handed out by slot() (used by resolve_variables at compile time) and never move, so resolved code reads
+    and writes values[slot] directly. A slot holding UNSET is a variable that has not been assigned yet.
+
+    Attributes:
+        slots (dict[str, int]): Slot index per variable name.
+        names (list[str]): Variable name per slot index.
+        values (list): Current value per slot index, or UNSET.
+
+    Methods:
+        slot(name) -> int: Slot index of name, allocating one on first use.
+        clear(): Unset every variable, keeping the slot assignment.
+    """
+
+    __slots__ = ['slots', 'names', 'values']
+
+    def __init__(self):
+        self.slots = {}
+        self.names = []
+        self.values = []
+
+    def slot(self, name: str) -> int:
+        slot = self.slots.get(name)
+        if slot is None:
+            slot = self.slots[name] = len(self.names)
+            self.names.append(name)
+            self.values.append(UNSET)
+        return slot
+
+    def clear(self):
+        self.values[:] = [UNSET] * len(self.values)
+
+
+class FrameView(MutableMapping):
+    """Dict-like view of the assigned variables of a Frame, in slot order."""
+
+    __slots__ = ['frame']
+
+    def __init__(self, frame: Frame):
+        self.frame = frame
+
+    def __getitem__(self, name: str):
+        slot = self.frame.slots.get(name)
+        if slot is not None:
+            value = self.frame.values[slot]
+            if value is not UNSET:
+                return value
+        raise KeyError(name)
+
+    def __setitem__(self, name: str, value):
+        self.frame.values[self.frame.slot(name)] = value
+
+    def __delitem__(self, name: str):
+        self[name]
+        self.frame.values[self.frame.slots[name]] = UNSET
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name, value in zip(self.frame.names, self.frame.values) if value is not UNSET)
+
+    def __len__(self) -> int:
+        return sum(value is not UNSET for value in self.frame.values)
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
 class Environment:
     """
     Lightweight environment for storing and retrieving variables by scope.
 
+    Global variables live in a slot-indexed Frame; variables['global'] is a dict-like FrameView over it, so existing
+    name-based code keeps working while resolved code (see resolve_variables) reads and writes frame.values directly.
+
     Attributes:
-        variables (dict[str, dict[str, int | float]]): Mapping of scope names to variable dictionaries.
+        frame (Frame): Slot storage of the global scope.
+        variables (dict[str, MutableMapping[str, int | float]]): Mapping of scope names to variable mappings.
 
     Methods:
         add_variable(value, name, parent='global'):
@@ -11,15 +89,34 @@ class Environment:
         lookup(variable, parent='global') -> int | float:
             Return the value of a variable from the specified scope.
             Raises KeyError if the variable is not found.
+        clear():
+            Remove every global variable, keeping slot indexes valid for already resolved code.
     """
 
     def __init__(self):
-        self.variables = {'global': {}}
+        self.frame = Frame()
+        self.variables = {'global': FrameView(self.frame)}
 
     def add_variable(self, value, name: str, parent: str = 'global'):
-        self.variables[parent][name] = value
+        if parent == 'global':
+            frame = self.frame
+            slot = frame.slots.get(name)
+            if slot is None:
+                slot = frame.slot(name)
+            frame.values[slot] = value
+        else:
+            self.variables[parent][name] = value
 
     def lookup(self, variable: str, parent: str = 'global') -> int | float:
-        if parent in self.variables and variable in self.variables[parent]:
+        if parent == 'global':
+            slot = self.frame.slots.get(variable)
+            if slot is not None:
+                value = self.frame.values[slot]
+                if value is not UNSET:
+                    return value
+        elif parent in self.variables and variable in self.variables[parent]:
             return self.variables[parent][variable]
         raise KeyError(f"Variable '{variable}' not found in environment")
+
+    def clear(self):
+        self.frame.clear()
@@ -1,6 +1,14 @@
+from collections.abc import Iterator
+from itertools import islice, product
+
 from .token_fscc import NodeType
 from .builtins_fscc import *
-from .environment import Environment
+from .array_backend import ArrayOperation
+from .data_binding import DataColumn
+from .environment import Environment, UNSET
+from .memo import MemoizingOperation
+from .node_fscc import Node
+from .transformer_ast import Transformer
 
 
 class Executor:
@@ -8,77 +16,377 @@ class Executor:
     Interpreter that evaluates a small expression language AST, supporting arithmetic, multi-expression evaluation, variable assignment, and simple built-ins.
 
     Attributes:
-        operation (Operation): Arithmetic engine for '+', '-', '*', '/'.
+        operation (Operation): Arithmetic engine for '+', '-', '*', '/'; a MemoizingOperation holding the last
+            memo_size distinct calculations when memo_size is given (see memo.py).
         env (Environment): Scoped variable store with lookup and assignment.
         builtin_functions (BuiltinsFunction): Built-in function registry (e.g., print).
+        transformer (Transformer): Expands statements that factorized evaluation cannot handle.
+        array_operation (ArrayOperation | None): Vectorized batch combiner, set when backend='numpy' and NumPy imports.
+        output (OutputBuffer | None): Receives printed values when set; otherwise each value goes through print().
+        BATCH_SIZE (int): Largest list of results iter_factorized yields for one root outer product.
+        combination_limit (int | None): Factorized branches with more combinations are split with Transformer.split and
+            evaluated one piece at a time, so no value set grows past the limit (see planner.Planner).
+
+    Factorized evaluation works on the untransformed parser output: each MULTI_EXPR branch is evaluated once into a
+    value set, and a TASK_NODE combines the sets of its operands with an outer product through Operation, so nested
+    work scales with the sum of branch sizes rather than their product. Results come out in cartesian order, the same
+    order as executing Transformer.iter_transform. A statement with '->' below its root, or whose root arrows write a
+    variable it reads, depends on per-combination side effects and is expanded and executed variant by variant instead.
+    Nested tasks are evaluated with explicit stacks (execute_single_command, evaluate_batch), so nesting depth is
+    limited by memory rather than by Python's recursion limit.
+    Statements resolved by VariableResolver carry VARIABLE nodes, which are read from and written to the environment's
+    Frame by slot index; unresolved identifiers still go through Environment.lookup and add_variable.
+    With backend='numpy', value sets are kept as NumPy arrays and combined by broadcasting (see ArrayOperation); sets the
+    array path cannot reproduce exactly, or a missing NumPy installation, fall back to the pure-Python combination.
+    A batch bound to a DataColumn (see data_binding) is a value set as it is: the memory-mapped values, or a zero-copy
+    NumPy view of them with backend='numpy'.
 
     Methods:
         execute(ast) -> list:
             Traverse top-level commands, executing calculations and assignments; returns flattened results.
+        execute_statements(statements, collect=True) -> list:
+            Same as execute, but consumes any iterable of top-level nodes (e.g. Transformer.iter_transform) one at a time;
+            with collect=False results are discarded as they are produced and an empty list is returned.
+        iter_execute(statements) -> Iterator:
+            Lazy execute_statements: yields each result as soon as its statement or combination has been evaluated.
+        execute_factorized(ast, collect=True) -> list:
+            Execute untransformed top-level nodes (Parser.parse output or Parser.iter_parse), evaluating semicolon batches
+            factorized.
+        iter_factorized(ast) -> Iterator[list]:
+            Lazy execute_factorized: yields the results of each semicolon branch (or expanded variant) as lists.
+        iter_batches(ast) -> Iterator[list]:
+            evaluate_batch for a top-level branch, streaming the outer product at its root BATCH_SIZE results at a
+            time (operand value sets are still evaluated whole; an outer product the numpy backend combines as arrays
+            is yielded at once). When a combination raises, the results before it are still sent to the root
+            arrows and yielded before the exception propagates, as executing the expanded form would have done. When
+            evaluating an operand's value set raises, the branch is run again variant by variant (its operands have
+            no side effects), so the combinations before the failing one yield and reach the arrows as well.
+        evaluate_batch(ast) -> list:
+            Return the value set of a SCALAR, MULTI_EXPR or TASK_NODE node, applying root arrows of task nodes.
+        iter_combine(operator, value_sets, targets) -> Iterator[list]:
+            Outer product of value sets as lists of at most BATCH_SIZE results, sending each result to the arrow
+            targets (the results computed before a failing combination included) before it is yielded.
+        combine(operator, value_sets) -> list | numpy.ndarray:
+            Apply operator to every combination of the value sets, first set varying slowest.
+        as_list(values) -> list:
+            Convert an array value set back to a list of Python scalars.
+        factorizable(task) -> bool:
+            Whether a top-level task node can be evaluated factorized without changing side effects.
         execute_single_command(ast) -> int | float | list:
             Evaluate a single node (MULTI_EXPR, TASK_NODE, SCALAR), apply operator to values, and handle arrow chains.
         variable_assignment_execute(values_and_variables):
             Perform batch assignments by routing each value/name pair through arrow execution.
-        execute_arrow(values, command: str):
-            If command is 'print', emit via built-ins; otherwise store in env under the given name.
+        execute_arrow(values, command):
+            If command is 'print', emit via output or the built-ins; a VARIABLE node stores into its frame slot;
+            otherwise store in env under the given name.
+        read_slot(variable) -> int | float:
+            Value of a resolved VARIABLE node; raises KeyError like Environment.lookup when it is unset.
     """
 
-    def __init__(self):
-        self.operation = Operation()
+    BATCH_SIZE = 65536
+
+    def __init__(self, backend: str = 'python', output=None, combination_limit: int | None = None,
+                 memo_size: int | None = None):
+        if backend not in ('python', 'numpy'):
+            raise ValueError(f"Invalid backend: {backend!r}")
+        if combination_limit is not None and combination_limit < 1:
+            raise ValueError(f"Invalid combination limit: {combination_limit}")
+        self.output = output
+        self.combination_limit = combination_limit
+        self.operation = MemoizingOperation(memo_size) if memo_size is not None else Operation()
         self.env = Environment()
         self.builtin_functions = BuiltinsFunction()
+        self.transformer = Transformer()
+        self.array_operation = ArrayOperation() if backend == 'numpy' and ArrayOperation.available() else None
 
     def execute(self, ast) -> list:
-        all_results = []
-        for command in ast.args:
+        return self.execute_statements(ast.args)
+
+    def execute_statements(self, statements, collect: bool = True) -> list:
+        if not collect:
+            for _ in self.iter_execute(statements):
+                pass
+            return []
+        return list(self.iter_execute(statements))
+
+    def iter_execute(self, statements) -> Iterator:
+        for command in statements:
             if command.type == NodeType.CALCULATION.value:
                 results = self.execute_single_command(command.args)
                 if isinstance(results, list):
-                    all_results.extend(results)
+                    yield from results
                 else:
-                    all_results.append(results)
+                    yield results
             elif command.type == NodeType.VARIABLE_ASSIGNMENT.value:
                 self.variable_assignment(command)
+
+    def execute_factorized(self, ast, collect: bool = True) -> list:
+        if not collect:
+            for _ in self.iter_factorized(ast):
+                pass
+            return []
+        all_results = []
+        for batch in self.iter_factorized(ast):
+            all_results.extend(batch)
         return all_results
 
-    def execute_single_command(self, ast) -> int | float | list:
-        values = [[]]
-        index = 0
-        if ast.type == NodeType.MULTI_EXPR.value:
-            for subexpression in ast.args:
-                values[index].append(self.execute_single_command(subexpression))
-            return values[0]
-        operator = ast.command.args if ast.command else None
+    def iter_factorized(self, ast) -> Iterator[list]:
+        for command in ast:
+            if command.type == NodeType.CALCULATION.value:
+                tasks = command.args.args if command.args.type == NodeType.MULTI_EXPR.value else [command.args]
+                for task in tasks:
+                    if not self.factorizable(task):
+                        for variant in self.transformer.expand(task):
+                            yield [self.execute_single_command(variant)]
+                    elif self.combination_limit is not None and self.transformer.count(task) > self.combination_limit:
+                        for piece in self.transformer.split(task, self.combination_limit):
+                            yield from self.iter_batches(piece)
+                    else:
+                        yield from self.iter_batches(task)
+            elif command.type == NodeType.VARIABLE_ASSIGNMENT.value:
+                self.variable_assignment(self.transformer.variable_assignment(command))
+
+    def evaluate_batch(self, ast) -> list:
+        batch_types = self.transformer.batch_types
+        if ast.type not in batch_types:
+            return self.leaf_batch(ast)
+        if ast.args.__class__ is DataColumn:
+            return ast.args.batch(self.array_operation is not None)
+        task_type = NodeType.TASK_NODE.value
+        scalar_type = NodeType.SCALAR.value
+        variable_type = NodeType.VARIABLE.value
+        pending = []
+        value_sets = []
+        targets = []
+        position = 0
+        while True:
+            args = ast.args
+            is_task = ast.type == task_type
+            for position in range(position, len(args)):
+                current = args[position]
+                if is_task and current.type == scalar_type and current.args == '->':
+                    targets.append(None)
+                elif is_task and targets:
+                    if targets[-1] is None:
+                        targets[-1] = current if current.type == variable_type else current.args
+                elif current.args.__class__ is DataColumn:
+                    value_sets.append(current.args.batch(self.array_operation is not None))
+                elif current.type in batch_types:
+                    break
+                else:
+                    value_sets.append(self.leaf_batch(current))
+            else:
+                if is_task:
+                    if targets:
+                        results = [result for batch in self.iter_combine(ast.command.args, value_sets, targets)
+                                   for result in batch]
+                    else:
+                        results = self.combine(ast.command.args, value_sets)
+                elif self.array_operation is not None:
+                    results = self.array_operation.concatenate(value_sets)
+                else:
+                    results = [value for values in value_sets for value in values]
+                if not pending:
+                    return results
+                ast, position, value_sets, targets = pending.pop()
+                value_sets.append(results)
+                continue
+            pending.append((ast, position + 1, value_sets, targets))
+            ast, position, value_sets, targets = current, 0, [], []
+
+    def leaf_batch(self, ast) -> list:
+        if ast.type == NodeType.VARIABLE.value:
+            return [self.read_slot(ast)]
+        if isinstance(ast.args, str):
+            return [self.env.lookup(ast.args)]
+        return [ast.args]
+
+    def iter_batches(self, ast) -> Iterator[list]:
+        if ast.type != NodeType.TASK_NODE.value:
+            yield self.as_list(self.evaluate_batch(ast))
+            return
+        try:
+            value_sets, targets = self.task_operands(ast)
+        except Exception:
+            for variant in self.transformer.expand(ast):
+                yield [self.execute_single_command(variant)]
+            return
+        yield from self.iter_combine(ast.command.args, value_sets, targets)
+
+    def iter_combine(self, operator: str, value_sets: list, targets: list) -> Iterator[list]:
+        if self.array_operation is not None:
+            results = self.array_operation.combine(operator, value_sets)
+            if results is not None:
+                results = results.tolist()
+                if targets:
+                    self.apply_targets(results, targets)
+                yield results
+                return
+            value_sets = [self.as_list(values) for values in value_sets]
+        calculate = self.operation.calculate
+        combinations = product(*value_sets)
+        while True:
+            results = []
+            append = results.append
+            try:
+                for combination in islice(combinations, self.BATCH_SIZE):
+                    append(calculate(operator, list(combination)))
+            except Exception:
+                if results:
+                    if targets:
+                        self.apply_targets(results, targets)
+                    yield results
+                raise
+            if not results:
+                return
+            if targets:
+                self.apply_targets(results, targets)
+            yield results
+
+    def task_operands(self, ast) -> tuple[list, list]:
+        value_sets = []
+        targets = []
         for current in ast.args:
-            if current.type == NodeType.TASK_NODE.value:
-                values[index].append(self.execute_single_command(current))
+            if current.type == NodeType.SCALAR.value and current.args == '->':
+                targets.append(None)
+            elif targets:
+                if targets[-1] is None:
+                    targets[-1] = current if current.type == NodeType.VARIABLE.value else current.args
+            elif current.type in self.transformer.batch_types:
+                value_sets.append(self.evaluate_batch(current))
+            else:
+                value_sets.append(self.leaf_batch(current))
+        return value_sets, targets
+
+    def apply_targets(self, results: list, targets: list):
+        for result in results:
+            for target in targets:
+                self.execute_arrow(result, target)
+
+    def combine(self, operator: str, value_sets: list):
+        if self.array_operation is not None:
+            results = self.array_operation.combine(operator, value_sets)
+            if results is not None:
+                return results
+            value_sets = [self.as_list(values) for values in value_sets]
+        calculate = self.operation.calculate
+        if len(value_sets) == 1:
+            return [calculate(operator, [value]) for value in value_sets[0]]
+        return [calculate(operator, list(combination)) for combination in product(*value_sets)]
+
+    @staticmethod
+    def as_list(values) -> list:
+        return values.tolist() if hasattr(values, 'tolist') else values
+
+    def factorizable(self, task) -> bool:
+        targets = []
+        reads = set()
+        arrow = False
+        for current in task.args:
+            if current.type == NodeType.SCALAR.value and current.args == '->':
+                arrow = True
+                targets.append(None)
+            elif arrow:
+                if current.type == NodeType.VARIABLE.value:
+                    if targets[-1] is None:
+                        targets[-1] = current.command
+                    continue
+                if current.type != NodeType.SCALAR.value:
+                    return False
+                if targets[-1] is None:
+                    targets[-1] = current.args
+            elif current.type == NodeType.VARIABLE.value:
+                reads.add(current.command)
             elif current.type == NodeType.SCALAR.value:
-                if not isinstance(current.args, str):
-                    values[index].append(current.args)
-                else:
-                    if current.args == '->':
-                        index += 1
+                if isinstance(current.args, str):
+                    reads.add(current.args)
+            elif not self.collect_reads(current, reads):
+                return False
+        if None in targets:
+            return False
+        return not reads.intersection(targets)
+
+    def collect_reads(self, ast, reads: set) -> bool:
+        variable_type = NodeType.VARIABLE.value
+        scalar_type = NodeType.SCALAR.value
+        stack = [ast]
+        while stack:
+            current = stack.pop()
+            if current.type == variable_type:
+                reads.add(current.command)
+            elif current.type == scalar_type:
+                if current.args == '->':
+                    return False
+                if isinstance(current.args, str):
+                    reads.add(current.args)
+            elif current.args.__class__ is not DataColumn:
+                stack.extend(current.args)
+        return True
+
+    def execute_single_command(self, ast) -> int | float | list:
+        if ast.type == NodeType.MULTI_EXPR.value:
+            return [self.execute_single_command(subexpression) for subexpression in ast.args]
+        task_type = NodeType.TASK_NODE.value
+        variable_type = NodeType.VARIABLE.value
+        scalar_type = NodeType.SCALAR.value
+        calculate = self.operation.calculate
+        frame_values = self.env.frame.values
+        pending = []
+        values = [[]]
+        position = 0
+        while True:
+            args = ast.args
+            for position in range(position, len(args)):
+                current = args[position]
+                if current.type == task_type:
+                    break
+                if current.type == variable_type:
+                    if len(values) > 1:
+                        values[-1].append(current)
+                    else:
+                        value = frame_values[current.args]
+                        if value is UNSET:
+                            raise KeyError(f"Variable '{current.command}' not found in environment")
+                        values[0].append(value)
+                elif current.type == scalar_type:
+                    if not isinstance(current.args, str):
+                        values[-1].append(current.args)
+                    elif current.args == '->':
                         values.append([])
+                    elif len(values) > 1:
+                        values[-1].append(current.args)
                     else:
-                        if index:
-                            values[index].append(current.args)
-                        else:
-                            values[index].append(self.env.lookup(current.args))
-        if index:
-            result = self.operation.calculate(operator, values[0])
-            for item in values[1:]:
-                self.execute_arrow(result, item[0])
-            return result
-        else:
-            return self.operation.calculate(operator, values[0])
+                        values[0].append(self.env.lookup(current.args))
+            else:
+                result = calculate(ast.command.args if ast.command else None, values[0])
+                for item in values[1:]:
+                    self.execute_arrow(result, item[0])
+                if not pending:
+                    return result
+                ast, position, values = pending.pop()
+                values[-1].append(result)
+                continue
+            pending.append((ast, position + 1, values))
+            ast, position, values = current, 0, [[]]
 
     def variable_assignment(self, values_and_variables):
         for current in values_and_variables:
             for item in current[1:]:
-                self.execute_arrow(current[0].args, item.args)
+                self.execute_arrow(current[0].args, item if item.type == NodeType.VARIABLE.value else item.args)
 
-    def execute_arrow(self, values, command: str):
-        if command == 'print':
-            self.builtin_functions.print(values)
+    def execute_arrow(self, values, command):
+        if command.__class__ is Node:
+            self.env.frame.values[command.args] = values
+        elif command == 'print':
+            if self.output is not None:
+                self.output.write(values)
+            else:
+                self.builtin_functions.print(values)
         else:
             self.env.add_variable(values, command)
+
+    def read_slot(self, variable: Node):
+        value = self.env.frame.values[variable.args]
+        if value is UNSET:
+            raise KeyError(f"Variable '{variable.command}' not found in environment")
+        return value
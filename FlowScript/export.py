@@ -0,0 +1,93 @@
+import csv
+import sys
+from array import array
+
+from .output import JsonlSink, OutputBuffer
+
+NPY_MAGIC = b'\x93NUMPY\x01\x00'
+NPY_HEADER_BYTES = 128
+
+
+class CsvSink:
+    """Writes results as a one-column CSV file with a 'value' header, to a file or to stdout when path is None."""
+
+    def __init__(self, path: str | None = None):
+        self.file = open(path, 'w', encoding='utf-8', newline='') if path is not None else None
+        self.writer = csv.writer(self.file or sys.stdout)
+        self.writer.writerow(['value'])
+
+    def write_values(self, values: list):
+        self.writer.writerows([[value] for value in values])
+
+    def flush(self):
+        (self.file or sys.stdout).flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+        else:
+            sys.stdout.flush()
+
+
+class NpySink:
+    """
+    Writes results as a one-dimensional float64 .npy file (numpy.load(path), also with mmap_mode='r').
+
+    The header is written with a placeholder length and rewritten by close() once the number of values is known, so
+    values are streamed to disk as they arrive and NumPy is not needed to write the file. Integers above 2**53 lose
+    precision and bools are stored as 0.0 or 1.0.
+
+    Raises:
+        TypeError: When a value is not a number.
+    """
+
+    def __init__(self, path: str):
+        self.file = open(path, 'wb')
+        self.count = 0
+        self.file.write(npy_header(0))
+
+    def write_values(self, values: list):
+        self.file.write(array('d', values).tobytes())
+        self.count += len(values)
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        try:
+            self.file.seek(0)
+            self.file.write(npy_header(self.count))
+        finally:
+            self.file.close()
+
+
+def npy_header(count: int) -> bytes:
+    descr = '<f8' if sys.byteorder == 'little' else '>f8'
+    header = repr({'descr': descr, 'fortran_order': False, 'shape': (count,)})
+    return NPY_MAGIC + (NPY_HEADER_BYTES - len(NPY_MAGIC) - 2).to_bytes(2, 'little') + \
+        header.ljust(NPY_HEADER_BYTES - len(NPY_MAGIC) - 3).encode('latin1') + b'\n'
+
+
+EXPORTERS = {
+    'csv': CsvSink,
+    'jsonl': JsonlSink,
+    'npy': NpySink,
+}
+
+
+def open_export(kind: str, path: str | None = None, chunk_size: int = 8192) -> OutputBuffer:
+    """
+    Build an OutputBuffer that streams results to the exporter named kind ('csv', 'jsonl' or 'npy').
+
+    Results are written chunk_size at a time, so memory stays bounded however many results a program produces; csv and
+    jsonl write to stdout when path is None. Close the buffer to finish the file.
+
+    Raises:
+        ValueError: For an unknown kind, or when 'npy' is given no path.
+    """
+
+    if kind not in EXPORTERS:
+        raise ValueError(f"Invalid export format: {kind!r}")
+    if kind == 'npy' and path is None:
+        raise ValueError("Export 'npy' requires a path")
+    return OutputBuffer(EXPORTERS[kind](path), chunk_size)
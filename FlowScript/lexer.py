@@ -1,4 +1,7 @@
-from .token_fscc import Token, TokenType, CharacterSets
+import re
+from collections.abc import Iterable, Iterator
+
+from .token_fscc import Token, TokenTable, TokenType, CharacterSets
 from .builtins_fscc import BuiltinsFunction
 
 
@@ -14,19 +17,40 @@ class Lexer:
     - Whitespace (space, tab, comma, newline) is skipped
     - Comments: single-line starting with #, and triple-# block comments ###...###
 
+    make_tokens() runs a single pass of the precompiled TOKEN_PATTERN over the source: leading
+    whitespace is folded into each match, every lexeme is cut out of the code with one slice,
+    and only newlines update the line/column bookkeeping. Punctuation tokens are immutable in
+    practice, so one instance per lexeme is shared within a line. The character-at-a-time
+    scanner is kept as make_tokens_legacy() for comparison and benchmarking.
+
+    iter_tokens() streams the same tokens from an iterable of source chunks. Each round scans the
+    buffered text up to its last newline (no lexeme crosses a line end), so only the trailing
+    partial line - or a ### block comment still waiting for its closing ### - is carried over to
+    the next chunk and memory stays bounded by the chunk and line size.
+
     Attributes:
+        TOKEN_PATTERN (re.Pattern): Master regex with one named group per lexeme class.
         builtins (BuiltinsFunction): Registry used to classify function identifiers.
         code (str): Original source text.
+        first_line (int): Line number of the first line of code, for fragments of a larger file.
         position (int): Current index in code (-1 before the first advance).
         current_character (str | None): Current character or None at EOF.
         single_character (dict[str, str]): Map of single-char lexemes to token types.
         character_start_token (dict[str, str]): Starters for potentially multi-char tokens.
         multi_characters (dict[str, str]): Map of multi-char lexemes to token types.
+        words (dict[str, tuple[str, object]]): Precomputed (type, value) pairs for reserved words.
 
     Methods:
+        make_tokens() -> list[Token]: Produce the full token stream, tracking line numbers for errors.
+        make_token_table(chunk_size=65536) -> TokenTable: Same tokens packed into a compact TokenTable; the code is
+            scanned chunk by chunk so no full list of Token objects is built.
+        iter_tokens(chunks=None) -> Iterator[Token]: Generate tokens from source chunks (default: code).
+        scan(code, line, line_start=0, final=True) -> tuple[list[Token], int, int, int]: Tokenize one piece of
+            source; returns the tokens, the offset scanned up to, and the line and line start reached.
+        make_tokens_legacy() -> list[Token]: Character-at-a-time scanner kept as a reference.
+        make_word(string) -> Token: Classify an identifier-like lexeme.
         advance(): Move to the next character.
         peek(position=1) -> string: Look ahead without consuming.
-        make_tokens() -> list[Token]: Produce the full token stream, tracking line numbers for errors.
         make_command_multi_character(): Emit single- or multi-character operator tokens.
         make_number() -> Token: Scan an int or float literal.
         make_string() -> Token: Scan identifiers, built-in function names, or strings.
@@ -36,9 +60,25 @@ class Lexer:
         SyntaxError: For unknown characters or malformed numbers (e.g., multiple decimal points).
     """
 
-    def __init__(self, code):
+    TOKEN_PATTERN = re.compile(r"""
+        [ \t,]*
+        (?:
+            (?P<SINGLE>[-+*/();](?!>))
+          | (?P<WORD>[A-Za-z][A-Za-z_'"]*)
+          | (?P<NUMBER>[0-9][0-9.]*)
+          | (?P<NEWLINE>\n)
+          | (?P<ARROW>->)
+          | (?P<BLOCK_COMMENT>\#\#\#(?s:.*?)(?:\#\#\#|\Z))
+          | (?P<COMMENT>\#[^\n]*)
+          | (?P<END>\Z)
+          | (?P<ERROR>.)
+        )
+    """, re.VERBOSE)
+
+    def __init__(self, code, first_line: int = 1):
         self.builtins = BuiltinsFunction()
         self.code = code
+        self.first_line = first_line
         self.position = -1
         self.current_character = None
         self.single_character = {
@@ -56,6 +96,10 @@ class Lexer:
         self.multi_characters = {
             '->': TokenType.TT_ARROW.value,
         }
+        self.words = {name: (TokenType.TT_FUNCTION.value, name) for name in self.builtins.functions}
+        for name in ('True', 'False'):
+            self.words.setdefault(name, (TokenType.TT_BOOLEAN.value, bool(name)))
+        self.words.setdefault('None', (TokenType.TT_NONE.value, 'None'))
         self.advance()
 
     def advance(self, character_ahead: int = 1):
@@ -68,8 +112,99 @@ class Lexer:
         return None
 
     def make_tokens(self) -> list[Token]:
+        return self.scan(self.code, self.first_line)[0]
+
+    def make_token_table(self, chunk_size: int = 1 << 16) -> TokenTable:
+        chunks = (self.code[start:start + chunk_size] for start in range(0, len(self.code), chunk_size))
+        return TokenTable.from_tokens(self.iter_tokens(chunks))
+
+    def iter_tokens(self, chunks: Iterable[str] | None = None) -> Iterator[Token]:
+        if chunks is None:
+            chunks = (self.code,)
+        pending = ''
+        line = self.first_line
+        line_start = 0
+        for chunk in chunks:
+            pending += chunk
+            cut = pending.rfind('\n') + 1
+            if not cut:
+                continue
+            tokens, end, line, line_start = self.scan(pending[:cut], line, line_start, final=False)
+            yield from tokens
+            pending = pending[end:]
+            line_start -= end
+        yield from self.scan(pending, line, line_start)[0]
+
+    def scan(self, code: str, line: int, line_start: int = 0, final: bool = True) -> tuple[list[Token], int, int, int]:
+        tokens: list[Token] = []
+        append = tokens.append
+        single_character = self.single_character
+        words = self.words
+        identifier = TokenType.TT_IDENTIFIER.value
+        int_type = TokenType.TT_INT.value
+        float_type = TokenType.TT_FLOAT.value
+        arrow = self.multi_characters['->']
+        punctuation = {}
+        for match in self.TOKEN_PATTERN.finditer(code):
+            kind = match.lastgroup
+            if kind == 'SINGLE':
+                lexeme = match.group(kind)
+                token = punctuation.get(lexeme)
+                if token is None:
+                    token = punctuation[lexeme] = Token(single_character[lexeme], lexeme, line)
+                append(token)
+            elif kind == 'NUMBER':
+                lexeme = match.group(kind)
+                if '.' in lexeme:
+                    if lexeme.count('.') > 1:
+                        raise SyntaxError(f"Multiple decimal points, line {line}")
+                    append(Token(float_type, float(lexeme), line))
+                else:
+                    append(Token(int_type, int(lexeme), line))
+            elif kind == 'WORD':
+                lexeme = match.group(kind)
+                word = words.get(lexeme)
+                if word is None:
+                    append(Token(identifier, lexeme, line))
+                else:
+                    append(Token(word[0], word[1], line))
+            elif kind == 'NEWLINE':
+                line += 1
+                line_start = match.end()
+                punctuation = {}
+            elif kind == 'ARROW':
+                token = punctuation.get('->')
+                if token is None:
+                    token = punctuation['->'] = Token(arrow, '->', line)
+                append(token)
+            elif kind == 'BLOCK_COMMENT':
+                comment = match.group(kind)
+                if not final and (len(comment) < 6 or not comment.endswith('###')):
+                    return tokens, match.start(kind), line, line_start
+                newlines = comment.count('\n')
+                if newlines:
+                    line += newlines
+                    line_start = match.start(kind) + comment.rfind('\n') + 1
+                    punctuation = {}
+            elif kind == 'ERROR':
+                column = match.start(kind) - line_start + 1
+                raise SyntaxError(f"{match.group(kind)}, line {line}, column {column}")
+        return tokens, len(code), line, line_start
+
+    def make_word(self, string: str, line: int | None = None) -> Token:
+        if string in self.builtins.functions:
+            return Token(TokenType.TT_FUNCTION.value, string, line)
+        elif string[0] == string[-1] in ['"', "'"]:
+            return Token(TokenType.TT_STRING.value, string, line)
+        elif string in ['True', 'False']:
+            return Token(TokenType.TT_BOOLEAN.value, bool(string), line)
+        elif string == 'None':
+            return Token(TokenType.TT_NONE.value, string, line)
+        return Token(TokenType.TT_IDENTIFIER.value, string, line)
+
+    def make_tokens_legacy(self) -> list[Token]:
         tokens: list[Token] = []
-        line = 1
+        line = self.first_line
         while self.current_character is not None:
             if self.current_character in self.character_start_token:
                 tokens.append(self.make_command_multi_character())
@@ -124,15 +259,7 @@ class Lexer:
         while self.current_character is not None and self.current_character in CharacterSets.ALPHABET_DOWN.value + CharacterSets.ALPHABET_UP.value + '_' + "'" + '"':
             string += self.current_character
             self.advance()
-        if string in self.builtins.functions:
-            return Token(TokenType.TT_FUNCTION.value, string)
-        elif string[0] == string[-1] in ['"', "'"]:
-            return Token(TokenType.TT_STRING.value, string)
-        elif string in ['True', 'False']:
-            return Token(TokenType.TT_BOOLEAN.value, bool(string))
-        elif string == 'None':
-            return Token(TokenType.TT_NONE.value, string)
-        return Token(TokenType.TT_IDENTIFIER.value, string)
+        return self.make_word(string)
 
     def skip_token(self):
         if self.peek() == self.peek(2) == '#':
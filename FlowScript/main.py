@@ -1,25 +1,206 @@
+import argparse
+import os
 import sys
+import time
 
 from .transformer_ast import Transformer
+from .transpiler import PythonEngine, Transpiler
+from .vm import VirtualMachine
+from .batch import BatchReport, BatchRunner, expand_sources, is_pattern
+from .data_binding import bind_data, parse_binding
 from .executor import Executor
 from .lexer import Lexer
+from .memo import DEFAULT_MEMO_SIZE
 from .parser import Parser
-from .read_file import reader
+from .parallel import ParallelExecutor
+from .export import open_export
+from .output import OutputBuffer, open_output
+from .optimizer import optimize
+from .planner import Planner, parse_size
+from .profiler import Profiler
+from .program_cache import (ProgramCache, decode_bytecode, decode_modules, encode_bytecode, encode_modules, load_program,
+                            parse_program)
+from .read_file import reader, read_chunks
+from .sharding import ShardedExecutor
+from .resolver import VariableResolver, resolve_variables
+from .server import default_socket_path, remote_exception, request_remote, serve
+from .watch import WatchSession, watch
 
 
-def main():
-    """
-    Entry point for compiling and executing a .fscc program.
+COMPILED_CACHE_LIMIT = 100_000
+COMPILED_CODECS = {'vm': (encode_bytecode, decode_bytecode), 'python': (encode_modules, decode_modules)}
+
+
+def build_argument_parser() -> argparse.ArgumentParser:
+    arguments = argparse.ArgumentParser(prog='fscc', description='Compile and execute a FlowScript (.fscc) program.',
+                                        epilog="'fscc serve' starts the daemon used by --remote (see 'fscc serve "
+                                               "--help'); run a file named serve as ./serve")
+    arguments.add_argument('files', nargs='*', metavar='file',
+                           help='path to the .fscc source file; several files, glob patterns or directories run as a '
+                                'batch')
+    arguments.add_argument('--engine', choices=('tree', 'factorized', 'vm', 'python'), default='tree',
+                           help="'tree' executes every expanded combination; 'factorized' evaluates each semicolon "
+                                "branch once and combines the value sets; 'vm' compiles every expanded combination to "
+                                "bytecode and runs it on a stack machine; 'python' transpiles them to Python source "
+                                "and runs the compiled code")
+    arguments.add_argument('--dump-python', action='store_true',
+                           help='print the Python source --engine python generates for the program instead of '
+                                'running it')
+    arguments.add_argument('--backend', choices=('python', 'numpy'), default='python',
+                           help="how --engine factorized combines batches; 'numpy' broadcasts them as arrays and "
+                                "falls back to Python when NumPy is not installed")
+    arguments.add_argument('--jobs', type=int, default=1,
+                           help='run independent statements on a pool of this many processes (output order is kept); '
+                                'for a batch, the number of worker processes')
+    arguments.add_argument('--report', metavar='PATH',
+                           help='write the per-file results and errors of a batch as JSON to PATH')
+    arguments.add_argument('--no-cache', action='store_true',
+                           help='always lex and parse the source instead of using the compiled-program cache')
+    arguments.add_argument('--cache-dir', default=None,
+                           help='compiled-program cache location (default: $FSCC_CACHE_DIR or ~/.cache/fscc)')
+    arguments.add_argument('--clear-cache', action='store_true',
+                           help='remove every cached program before running (exits when no file is given)')
+    arguments.add_argument('--stream', action='store_true',
+                           help='read, lex, parse and execute the file one statement at a time in constant memory '
+                                '(bypasses the program cache)')
+    arguments.add_argument('--output', choices=('stdout', 'file', 'jsonl', 'binary'), default='stdout',
+                           help="where printed values go: text lines on stdout or in a file, JSON lines (stdout "
+                                "unless --output-path is given) or raw float64 numbers")
+    arguments.add_argument('--output-path', metavar='PATH', help='destination file for --output file, jsonl or binary')
+    arguments.add_argument('--flush-size', type=int, default=8192,
+                           help='printed values buffered before each write to the output (1 writes every value)')
+    arguments.add_argument('--export', choices=('csv', 'jsonl', 'npy'),
+                           help='stream every result, as it is computed, to a CSV column, JSON lines or a float64 .npy '
+                                'file instead of discarding it')
+    arguments.add_argument('--export-path', metavar='PATH',
+                           help='destination of --export (csv and jsonl default to stdout; npy requires a path)')
+    arguments.add_argument('--plan', action='store_true',
+                           help='print the combinations and estimated memory of every statement, then exit without '
+                                'executing')
+    arguments.add_argument('--max-combinations', type=int, metavar='N',
+                           help='with --engine factorized, evaluate semicolon branches with more combinations in '
+                                'chunks of at most N')
+    arguments.add_argument('--memory-budget', metavar='SIZE',
+                           help="like --max-combinations, with N derived from a result memory budget such as '512M'")
+    arguments.add_argument('--optimize', action='store_true',
+                           help='fold constants, propagate constant variables and drop assignments nothing reads '
+                                'before executing')
+    arguments.add_argument('--optimize-report', action='store_true',
+                           help='print how many nodes --optimize removed on stderr (implies --optimize)')
+    arguments.add_argument('--shards', type=int, metavar='N',
+                           help='split the expansion of every statement with at least --shard-min combinations into '
+                                'contiguous ranges evaluated on N processes (results and output keep their order)')
+    arguments.add_argument('--shard-min', type=int, default=ShardedExecutor.MIN_COMBINATIONS, metavar='N',
+                           help='smallest number of combinations --shards splits across processes '
+                                f'(default: {ShardedExecutor.MIN_COMBINATIONS})')
+    arguments.add_argument('--memoize', type=int, nargs='?', const=DEFAULT_MEMO_SIZE, metavar='N',
+                           help='reuse the results of repeated calculations (same operator and operand values), '
+                                f'keeping the N most recently used (default: {DEFAULT_MEMO_SIZE})')
+    arguments.add_argument('--memoize-report', action='store_true',
+                           help='print the hits, misses and evictions of --memoize on stderr (implies --memoize)')
+    arguments.add_argument('--bind', action='append', default=[], metavar='NAME=PATH[:SPEC]',
+                           help='bind NAME to a numeric dataset read as a semicolon batch: a memory-mapped .npy file, '
+                                'a raw binary file of SPEC values (f8, f4, i8, i4, i2, i1, u8, u4, u2, u1, b1; '
+                                'default f8) or the SPEC column of a CSV file (header name or index; default 0) '
+                                '(repeatable)')
+    arguments.add_argument('--profile', action='store_true',
+                           help='report stage times, peak memory, counts and the slowest statements on stderr')
+    arguments.add_argument('--profile-json', metavar='PATH',
+                           help='write the profile as JSON to PATH (implies profiling)')
+    arguments.add_argument('--watch', action='store_true',
+                           help='keep running and re-execute the statements affected by each change to the file')
+    arguments.add_argument('--remote', action='store_true',
+                           help='run the program on the fscc daemon, or locally when no daemon is running')
+    add_socket_argument(arguments)
+    return arguments
+
+
+def build_serve_parser() -> argparse.ArgumentParser:
+    arguments = argparse.ArgumentParser(prog='fscc serve',
+                                        description='Start the daemon that keeps the interpreter warm for --remote.')
+    arguments.add_argument('--jobs', type=int, default=None,
+                           help='worker processes running the requests (default: one per CPU)')
+    add_socket_argument(arguments)
+    return arguments
+
+
+def add_socket_argument(arguments: argparse.ArgumentParser):
+    arguments.add_argument('--socket', metavar='PATH', default=None,
+                           help='daemon socket for serve and --remote (default: $FSCC_SOCKET or fscc-<uid>.sock in '
+                                '$XDG_RUNTIME_DIR or the temp directory)')
+
+
+CONFLICTS = (
+    ('a batch', ('--stream', '--profile', '--watch', '--remote', '--export', '--output', '--plan', '--optimize',
+                 '--memoize', '--shards', '--dump-python', '--bind')),
+    ('--watch', ('--stream', '--profile', '--remote', '--jobs', '--export', '--output', '--optimize', '--memoize',
+                 '--shards', '--dump-python', '--bind')),
+    ('--remote', ('--stream', '--profile', '--jobs', '--export', '--output', '--optimize', '--memoize', '--shards',
+                  '--dump-python', '--bind')),
+    ('--jobs', ('--stream', '--profile', '--export', '--output', '--optimize', '--memoize', '--shards',
+                '--dump-python')),
+    ('--profile', ('--stream', '--export', '--optimize', '--memoize', '--shards', '--dump-python', '--bind',
+                   '--engine vm', '--engine python')),
+    ('--shards', ('--stream', '--memoize', '--dump-python')),
+    ('--optimize', ('--stream',)),
+    ('--dump-python', ('--export',)),
+)
+
+
+def active_modes(options: argparse.Namespace, batch: bool) -> dict[str, str]:
+    """Map each CONFLICTS name that options turn on to how it was spelled on the command line."""
 
-    Workflow:
-    - Reads the source path from sys.argv[1] using reader; errors if absent.
-    - Tokenizes with Lexer.make_tokens and prints the token stream.
-    - Parses tokens into an AST via Parser.parse and prints it.
-    - Transforms the AST for MULTI_EXPR/TASK_NODE expansion with Transformer.transform and prints it.
-    - Executes with Executor.execute and returns a flattened list of results.
+    modes = {
+        'a batch': batch,
+        '--stream': options.stream,
+        '--profile': options.profile or options.profile_json is not None,
+        '--watch': options.watch,
+        '--remote': options.remote,
+        '--jobs': options.jobs > 1,
+        '--export': options.export is not None,
+        '--output': options.output != 'stdout',
+        '--plan': options.plan,
+        '--optimize': options.optimize,
+        '--memoize': options.memoize is not None,
+        '--shards': options.shards is not None,
+        '--dump-python': options.dump_python,
+        '--bind': bool(options.bind),
+        '--engine vm': options.engine == 'vm',
+        '--engine python': options.engine == 'python',
+    }
+    spelled = {'--output': f'--output {options.output}', '--jobs': f'--jobs {options.jobs}'}
+    return {mode: spelled.get(mode, mode) for mode, active in modes.items() if active}
 
-    Returns:
-        list: Collected execution results.
+
+def check_options(arguments: argparse.ArgumentParser, options: argparse.Namespace, batch: bool):
+    """Reject invalid values and every pair of modes listed in CONFLICTS through arguments.error."""
+
+    if options.memoize is not None and options.memoize < 1:
+        arguments.error(f'invalid --memoize size: {options.memoize}')
+    if options.shards is not None and (options.shards < 1 or options.shard_min < 1):
+        arguments.error('--shards and --shard-min must be positive')
+    if options.backend == 'numpy' and options.engine != 'factorized':
+        arguments.error('--backend numpy requires --engine factorized')
+    modes = active_modes(options, batch)
+    for mode, conflicts in CONFLICTS:
+        if mode in modes:
+            for conflict in conflicts:
+                if conflict in modes:
+                    arguments.error(f'{modes[mode]} cannot be combined with {modes[conflict]}')
+
+
+def main(argv=None):
+    """
+    Entry point of the fscc command: compile and execute a .fscc program, a batch of programs, or `fscc serve`.
+
+    A single file is loaded through ProgramCache (lexed and parsed only when its source changed), resolved to frame
+    slots and run by the --engine runner: the tree-walking Executor, factorized evaluation, the bytecode VirtualMachine
+    or transpiled Python code (PythonEngine). The code of the last two is cached too (see compiled_kind), so an
+    unchanged file skips parsing, expansion and compilation altogether. The other options each select one mode around that pipeline (--stream,
+    --jobs, --shards, --watch, --remote, --profile, --plan, --export, ...; see the README). check_options validates
+    them once, up front, against the CONFLICTS table. Several files, glob patterns or directories run as a batch on
+    BatchRunner. `fscc serve` is a subcommand with its own parser (build_serve_parser) and starts the
+    FlowScriptServer daemon that --remote talks to.
 
     Raises:
         Exception: When no input file is provided.
@@ -28,18 +209,239 @@ def main():
         SyntaxError: For lexical or parsing issues surfaced during processing.
     """
 
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ['serve']:
+        options = build_serve_parser().parse_args(argv[1:])
+        serve(options.socket or default_socket_path(), options.jobs)
+        return
+    arguments = build_argument_parser()
+    options = arguments.parse_args(argv)
+    batch = len(options.files) > 1 or any(os.path.isdir(source) or is_pattern(source) for source in options.files)
+    options.file = options.files[0] if options.files and not batch else None
+    options.optimize = options.optimize or options.optimize_report
+    if options.memoize_report and options.memoize is None:
+        options.memoize = DEFAULT_MEMO_SIZE
+    check_options(arguments, options, batch)
+    cache = None if options.no_cache else ProgramCache(options.cache_dir)
     try:
-        code = reader(sys.argv[1])
-    except IndexError:
+        options.bindings = dict(parse_binding(text) for text in options.bind)
+    except (OSError, ValueError) as error:
+        arguments.error(str(error))
+    if options.clear_cache:
+        ProgramCache(options.cache_dir).clear()
+        if not options.files:
+            return
+    try:
+        planner = Planner(options.max_combinations,
+                          parse_size(options.memory_budget) if options.memory_budget is not None else None)
+    except ValueError as error:
+        arguments.error(str(error))
+    options.combination_limit = planner.limit
+    if batch:
+        report = execute_batch(options)
+        if report.failed():
+            raise SystemExit(1)
+        return
+    if options.file is None:
         raise Exception("No input file specified.")
-    lexer = Lexer(code)
-    tokens = lexer.make_tokens()
-    parser = Parser(tokens)
-    ast = parser.parse()
-    transformer = Transformer()
-    ast_transformed = transformer.transform(ast)
-    executor = Executor()
-    executor.execute(ast_transformed)
+    if options.plan:
+        print(planner.plan(load_bound_program(options, cache)).format())
+        return
+    if options.watch:
+        try:
+            watch(options.file, WatchSession(options.engine, options.backend,
+                                             combination_limit=options.combination_limit))
+        except KeyboardInterrupt:
+            pass
+        return
+    if options.remote and execute_remote(options):
+        return
+    if options.jobs > 1:
+        executor = Executor(backend=options.backend, combination_limit=options.combination_limit)
+        ParallelExecutor(executor, workers=options.jobs, engine=options.engine).execute(
+            load_bound_program(options, cache))
+        return
+    try:
+        output = open_output(options.output, options.output_path, options.flush_size)
+        export = open_export(options.export, options.export_path, options.flush_size) if options.export else None
+    except ValueError as error:
+        arguments.error(str(error))
+    try:
+        execute_file(options, cache, output, export)
+    finally:
+        try:
+            output.close()
+        finally:
+            if export is not None:
+                export.close()
+
+
+def load_bound_program(options: argparse.Namespace, cache: ProgramCache | None) -> list:
+    statements = load_program(options.file, cache)
+    if options.bindings:
+        statements = list(bind_data(statements, options.bindings))
+    return statements
+
+
+def execute_batch(options: argparse.Namespace) -> BatchReport:
+    runner = BatchRunner(options.jobs, options.engine, options.backend, not options.no_cache, options.cache_dir,
+                         options.combination_limit)
+    start = time.perf_counter()
+    results = []
+    for result in runner.iter_run(expand_sources(options.files)):
+        sys.stdout.write(result['output'])
+        results.append(result)
+    sys.stdout.flush()
+    report = BatchReport(results, time.perf_counter() - start)
+    print(report.format(), file=sys.stderr)
+    if options.report:
+        with open(options.report, 'w', encoding='utf-8') as file:
+            file.write(report.to_json())
+    return report
+
+
+def execute_remote(options: argparse.Namespace) -> bool:
+    request = {'source': reader(options.file), 'engine': options.engine, 'backend': options.backend,
+               'combination_limit': options.combination_limit}
+    response = request_remote(request, options.socket)
+    if response is None:
+        return False
+    sys.stdout.write(response['output'])
+    sys.stdout.flush()
+    if not response['ok']:
+        raise remote_exception(response['error'])
+    return True
+
+
+def execute_file(options: argparse.Namespace, cache: ProgramCache | None, output: OutputBuffer,
+                 export: OutputBuffer | None = None):
+    if options.profile or options.profile_json:
+        report = Profiler(options.engine, options.backend, output=output).profile_file(options.file)
+        output.flush()
+        if options.profile:
+            print(report.format(), file=sys.stderr)
+        if options.profile_json:
+            with open(options.profile_json, 'w', encoding='utf-8') as file:
+                file.write(report.to_json())
+        return
+    executor = Executor(backend=options.backend, output=output, combination_limit=options.combination_limit,
+                        memo_size=options.memoize)
+    if options.engine == 'vm':
+        runner = VirtualMachine(executor)
+    elif options.engine == 'python':
+        runner = PythonEngine(executor)
+    else:
+        runner = executor
+    kind = None
+    if options.stream:
+        parsed = Parser(Lexer('').iter_tokens(read_chunks(options.file))).iter_parse()
+        if options.bindings:
+            parsed = bind_data(parsed, options.bindings)
+        statements = VariableResolver(executor.env.frame).resolve(parsed)
+    else:
+        source = reader(options.file)
+        kind = compiled_kind(options, cache, export)
+        compiled = cache.load_compiled(source, kind, COMPILED_CODECS[options.engine][1]) if kind is not None else None
+        if compiled is not None:
+            names, code = compiled
+            for name in names:
+                executor.env.frame.slot(name)
+            try:
+                run_compiled(runner, code, export)
+            finally:
+                report_memoization(options, executor, output)
+            return
+        statements = parse_program(source, cache)
+        if options.optimize:
+            statements, report = optimize(statements, live=(), keep_results=export is not None)
+            if options.optimize_report:
+                print(report.format(), file=sys.stderr)
+        if options.bindings:
+            statements = list(bind_data(statements, options.bindings))
+        if options.shards:
+            sharded = ShardedExecutor(executor, options.shards, options.engine, options.shard_min)
+            for results in sharded.iter_execute(statements, collect=export is not None):
+                if export is not None:
+                    export.extend(results)
+            return
+        statements = resolve_variables(statements, executor.env.frame)
+        names = list(executor.env.frame.names)
+    if options.dump_python:
+        transpiler = Transpiler(direct=options.memoize is None)
+        for module in transpiler.iter_transpile(statements):
+            print(module.source)
+        return
+    code = None
+    try:
+        if options.engine == 'vm':
+            code = run_compiled(runner, runner.compiler.iter_compile(Transformer().iter_transform(statements)),
+                                export, COMPILED_CACHE_LIMIT if kind is not None else None)
+        elif options.engine == 'python':
+            code = run_compiled(runner, runner.transpiler.iter_transpile(statements), export,
+                                COMPILED_CACHE_LIMIT // Transpiler.MODULE_SIZE if kind is not None else None)
+        elif export is None:
+            if options.engine == 'factorized':
+                executor.execute_factorized(statements, collect=False)
+            else:
+                runner.execute_statements(Transformer().iter_transform(statements), collect=False)
+        elif options.engine == 'factorized':
+            for results in executor.iter_factorized(statements):
+                export.extend(results)
+        else:
+            for result in runner.iter_execute(Transformer().iter_transform(statements)):
+                export.write(result)
+        if code is not None:
+            cache.store_compiled(source, kind, COMPILED_CODECS[options.engine][0], (names, code))
+    finally:
+        report_memoization(options, executor, output)
+
+
+def compiled_kind(options: argparse.Namespace, cache: ProgramCache | None, export: OutputBuffer | None) -> str | None:
+    """
+    ProgramCache kind of the code compiled for this run, or None when it is not cached.
+
+    Only --engine vm and --engine python code is cached, and not with --stream, --bind, --shards, --dump-python or
+    --optimize-report (whose output needs the statements). --memoize makes the transpiler call the Operation instead
+    of inlining the arithmetic (Transpiler.direct), --optimize changes the code, and so does --export with it (results
+    are kept).
+    """
+
+    if (cache is None or options.engine not in COMPILED_CODECS or options.stream or options.bindings or options.shards
+            or options.dump_python or options.optimize_report):
+        return None
+    kind = options.engine
+    if options.engine == 'python':
+        kind += '-direct' if options.memoize is None else '-calls'
+    if options.optimize:
+        kind += '-optimized-results' if export is not None else '-optimized'
+    return kind
+
+
+def run_compiled(runner, code, export: OutputBuffer | None, keep: int | None = None) -> list | None:
+    """
+    Run code one piece (VirtualMachine code of one statement, or a PythonModule) at a time, writing results to export
+    when given.
+
+    With keep, returns the list of pieces that ran, for ProgramCache.store_compiled, unless there were more than keep;
+    otherwise None.
+    """
+
+    kept = [] if keep is not None else None
+    for piece in code:
+        if kept is not None:
+            kept.append(piece)
+            if len(kept) > keep:
+                kept = None
+        results = runner.run(piece, collect=export is not None)
+        if export is not None:
+            export.extend(results)
+    return kept
+
+
+def report_memoization(options: argparse.Namespace, executor: Executor, output: OutputBuffer):
+    if options.memoize_report:
+        output.flush()
+        print(executor.operation.cache.format(), file=sys.stderr)
 
 
 if __name__ == '__main__':
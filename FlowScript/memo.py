@@ -0,0 +1,106 @@
+from collections import OrderedDict
+
+from .builtins_fscc import Operation
+
+DEFAULT_MEMO_SIZE = 65536
+MISSING = object()
+
+
+class MemoCache:
+    """
+    Bounded least-recently-used map from (operator, operand values, operand types) to a calculation result.
+
+    Attributes:
+        max_size (int): Entries kept; the least recently used entry is evicted beyond it.
+        entries (OrderedDict): Cached results, least recently used first.
+        hits (int): Calculations answered from the cache.
+        misses (int): Calculations computed and stored.
+        bypassed (int): Calculations computed without the cache (unhashable or zero operands).
+        evictions (int): Entries dropped to stay within max_size.
+
+    Methods:
+        stats() -> dict: Counters, current size and hit rate.
+        format() -> str: One-line summary of stats().
+        clear(): Drop every entry and reset the counters.
+    """
+
+    __slots__ = ['max_size', 'entries', 'hits', 'misses', 'bypassed', 'evictions']
+
+    def __init__(self, max_size: int = DEFAULT_MEMO_SIZE):
+        if max_size < 1:
+            raise ValueError(f"Invalid memo size: {max_size}")
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = self.misses = self.bypassed = self.evictions = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'bypassed': self.bypassed,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def format(self) -> str:
+        stats = self.stats()
+        return (f"memo: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.1%} hit rate), "
+                f"{stats['bypassed']} bypassed, {stats['evictions']} evictions, "
+                f"{stats['size']}/{stats['max_size']} entries")
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = self.bypassed = self.evictions = 0
+
+
+class MemoizingOperation(Operation):
+    """
+    Operation that answers repeated calculations from a MemoCache; installed by Executor(memo_size=...).
+
+    Every function in calculator is wrapped, so calculate() and callers that use calculator directly (VirtualMachine
+    reductions) go through the cache on all engines. Keys hold the operand values and their types, so 1, 1.0 and True
+    stay distinct, and they never refer to variables: a variable reassigned through '->' is read again and yields a
+    different key, so no entry can go stale and nothing needs invalidating. Calculations are computed without the cache
+    when an operand is unhashable, or equal to zero (0.0 and -0.0 compare equal but can give differently signed
+    results, and zero operands are cheap anyway); calculations that raise are never stored.
+
+    Attributes:
+        cache (MemoCache): Results and hit/miss statistics.
+    """
+
+    __slots__ = ['cache']
+
+    def __init__(self, max_size: int = DEFAULT_MEMO_SIZE):
+        super().__init__()
+        self.cache = MemoCache(max_size)
+        self.calculator = {operator: self.memoize(operator, function) for operator, function in self.calculator.items()}
+
+    def memoize(self, operator: str, function):
+        cache = self.cache
+        entries = cache.entries
+
+        def memoized(numbers: list) -> int | float:
+            if 0 in numbers:
+                cache.bypassed += 1
+                return function(numbers)
+            key = (operator, *numbers, *map(type, numbers))
+            try:
+                value = entries.get(key, MISSING)
+            except TypeError:
+                cache.bypassed += 1
+                return function(numbers)
+            if value is MISSING:
+                value = entries[key] = function(numbers)
+                cache.misses += 1
+                if len(entries) > cache.max_size:
+                    entries.popitem(last=False)
+                    cache.evictions += 1
+                return value
+            entries.move_to_end(key)
+            cache.hits += 1
+            return value
+
+        return memoized
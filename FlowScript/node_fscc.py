@@ -9,27 +9,41 @@ class Node:
         type: Node category (NodeType or its value).
         command: Command name for task nodes; ignored otherwise.
         args: Sequence of child nodes or a scalar for scalar nodes.
+        line: Source line a top-level statement starts on (None for nested nodes).
 
     Iteration:
         Yields elements from args.
 
+    Pickling:
+        A node pickles as flatten() of its subtree and is rebuilt by unflatten(), so statements of any depth can be
+        sent to worker processes.
+
     __repr__:
         - Scalar nodes: the scalar value.
+        - Variable nodes: the variable name.
         - Task nodes: "['<command>', <arg1>, <arg2>, ...]".
         - Other composites: "[<arg1>, <arg2>, ...]".
     """
 
-    def __init__(self, node_type, args, command=None):
+    __slots__ = ['type', 'command', 'args', 'line']
+
+    def __init__(self, node_type, args, command=None, line=None):
         self.type = node_type
         self.command = command
         self.args = args
+        self.line = line
 
     def __iter__(self):
         return iter(self.args)
 
+    def __reduce__(self):
+        return unflatten, (flatten(self),)
+
     def __repr__(self) -> str:
         if self.type == NodeType.SCALAR.value:
             output = f'{self.args}'
+        elif self.type == NodeType.VARIABLE.value:
+            output = f'{self.command}'
         else:
             output = '['
             if self.type == NodeType.TASK_NODE.value:
@@ -37,3 +51,57 @@ class Node:
             output += ', '.join(map(str, self.args))
             output += ']'
         return output
+
+
+def flatten(node: Node) -> list[tuple]:
+    """
+    Shallow encoding of node's subtree: one (type, command, args, line) record per node, children before parents.
+
+    In a record, a child node is replaced by the 1-tuple (index,) of its own record and lists stay lists, so the result
+    nests no deeper than the lists inside one node; a node reached twice is stored once. unflatten() reverses it.
+    """
+
+    records, indices = [], {}
+    stack = [(node, False)]
+    while stack:
+        current, ready = stack.pop()
+        if id(current) in indices:
+            continue
+        if ready:
+            indices[id(current)] = len(records)
+            records.append((current.type, refer(current.command, indices), refer(current.args, indices), current.line))
+            continue
+        stack.append((current, True))
+        values = [current.command, current.args]
+        while values:
+            value = values.pop()
+            if isinstance(value, Node):
+                stack.append((value, False))
+            elif isinstance(value, list):
+                values.extend(value)
+    return records
+
+
+def refer(value, indices: dict[int, int]):
+    if isinstance(value, Node):
+        return (indices[id(value)],)
+    if isinstance(value, list):
+        return [refer(item, indices) for item in value]
+    return value
+
+
+def unflatten(records: list[tuple]) -> Node:
+    """Rebuild the node encoded by flatten() (its last record)."""
+
+    nodes = []
+    for node_type, command, args, line in records:
+        nodes.append(Node(node_type, resolve(args, nodes), resolve(command, nodes), line))
+    return nodes[-1]
+
+
+def resolve(value, nodes: list[Node]):
+    if isinstance(value, tuple):
+        return nodes[value[0]]
+    if isinstance(value, list):
+        return [resolve(item, nodes) for item in value]
+    return value
@@ -0,0 +1,370 @@
+from collections.abc import Iterable
+
+from .builtins_fscc import Operation
+from .node_fscc import Node
+from .profiler import count_nodes
+from .token_fscc import NodeType
+from .transformer_ast import Transformer
+
+CONSTANT_TYPES = (int, float, bool)
+
+
+class OptimizationReport:
+    """
+    What Optimizer.optimize changed.
+
+    Attributes:
+        nodes_before (int): Nodes in the input statements.
+        nodes_after (int): Nodes in the optimized statements.
+        folded (int): Task nodes evaluated at compile time.
+        propagated (int): Variable reads replaced by their constant value.
+        removed_targets (int): '->' targets and assignment columns dropped because nothing reads them.
+        removed_statements (int): Statements dropped because they no longer have any effect.
+    """
+
+    __slots__ = ['nodes_before', 'nodes_after', 'folded', 'propagated', 'removed_targets', 'removed_statements']
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    @property
+    def nodes_removed(self) -> int:
+        return self.nodes_before - self.nodes_after
+
+    def to_dict(self) -> dict:
+        report = {name: getattr(self, name) for name in self.__slots__}
+        report['nodes_removed'] = self.nodes_removed
+        return report
+
+    def format(self) -> str:
+        return (f"optimizer: {self.nodes_before} -> {self.nodes_after} nodes ({self.nodes_removed} removed); "
+                f"{self.folded} folded, {self.propagated} propagated, {self.removed_targets} dead targets, "
+                f"{self.removed_statements} dead statements")
+
+
+class Optimizer:
+    """
+    Static pass over Parser.parse output that does at compile time what Executor would redo on every run.
+
+    - Constant folding: a task whose operands are all numeric constants is evaluated through Operation; a nested task
+      becomes a scalar, a top-level task (or one with '->' targets) becomes -(value), which Operation returns
+      unchanged. A task whose evaluation raises (ZeroDivisionError, TypeError, ...) is left as it is, so the error
+      still happens at run time, after the same earlier effects.
+    - Constant propagation: a variable assigned a constant by a single-combination statement or a VAR statement is
+      replaced by that constant in later statements, until something assigns it again. Names a statement writes are
+      never substituted inside that statement.
+    - Dead assignment elimination (only when live is given): '->' targets and assignment columns whose variable is not
+      read anywhere in the program and is not in live are dropped; 'print' is always kept. With keep_results=False
+      (results are discarded, as in fscc) statements left without any effect are dropped too. Targets of nested tasks
+      are only dropped when the whole statement then folds to constants: a statement without nested '->' is
+      factorizable, and the factorized engine evaluates its operands in a different order, which would change which
+      error a failing statement raises.
+
+    The pass runs before VariableResolver and Transformer, so both engines profit, and it builds new nodes instead of
+    modifying the input, whose scalar nodes Parser shares. Every walk uses an explicit stack (see postorder), so any
+    nesting depth the engines run can be optimized.
+
+    Attributes:
+        live (set[str] | None): Variables observed after the run; None keeps every assignment.
+        keep_results (bool): Whether statement results are used.
+        report (OptimizationReport): Counts of the last optimize call.
+
+    Methods:
+        optimize(statements) -> list[Node]: Optimized statements.
+    """
+
+    def __init__(self, live: Iterable[str] | None = None, keep_results: bool = True):
+        self.live = set(live) if live is not None else None
+        self.keep_results = keep_results
+        self.operation = Operation()
+        self.transformer = Transformer()
+        self.report = OptimizationReport()
+        self.constants = {}
+        self.scalars = {}
+
+    def optimize(self, statements: Iterable[Node]) -> list[Node]:
+        statements = list(statements)
+        self.report = OptimizationReport()
+        self.report.nodes_before = count_nodes(statements)
+        self.constants = {}
+        optimized = [self.propagate(statement) for statement in statements]
+        if self.live is not None:
+            reads = set(self.live)
+            for statement in optimized:
+                self.collect_reads(statement, reads)
+            optimized = [statement for statement in (self.eliminate(statement, reads) for statement in optimized)
+                         if statement is not None]
+        self.report.nodes_after = count_nodes(optimized)
+        return optimized
+
+    def scalar(self, value) -> Node:
+        key = type(value), repr(value)
+        node = self.scalars.get(key)
+        if node is None:
+            node = self.scalars[key] = Node(NodeType.SCALAR.value, value)
+        return node
+
+    @staticmethod
+    def is_arrow(node: Node) -> bool:
+        return node.type == NodeType.SCALAR.value and node.args == '->'
+
+    @staticmethod
+    def name(node: Node) -> str | None:
+        if node.type == NodeType.VARIABLE.value:
+            return node.command
+        if node.type == NodeType.SCALAR.value and isinstance(node.args, str) and node.args != '->':
+            return node.args
+        return None
+
+    @staticmethod
+    def constant(node: Node) -> bool:
+        return node.type == NodeType.SCALAR.value and isinstance(node.args, CONSTANT_TYPES)
+
+    def split_task(self, task: Node) -> tuple[list, list]:
+        for index, child in enumerate(task.args):
+            if self.is_arrow(child):
+                return task.args[:index], task.args[index:]
+        return task.args, []
+
+    def segments(self, arrows: list) -> list[list]:
+        segments = []
+        for child in arrows:
+            if self.is_arrow(child):
+                segments.append([child])
+            else:
+                segments[-1].append(child)
+        return segments
+
+    def writes(self, node: Node, names: set):
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current.type == NodeType.MULTI_EXPR.value:
+                stack.extend(current.args)
+            elif current.type == NodeType.TASK_NODE.value:
+                operands, arrows = self.split_task(current)
+                stack.extend(operands)
+                for segment in self.segments(arrows):
+                    if len(segment) > 1:
+                        name = self.name(segment[1])
+                        if name is not None:
+                            names.add(name)
+                    stack.extend(segment[1:])
+
+    def postorder(self, node: Node, nested: bool, children) -> list[tuple[Node, bool]]:
+        """
+        (node, nested) for node and every descendant children(node, nested) yields, each after its descendants.
+
+        fold and strip rebuild the tree in this order with an explicit results table instead of recursing, so nesting
+        depth is limited by memory rather than by Python's recursion limit.
+        """
+
+        order = []
+        stack = [(node, nested)]
+        while stack:
+            current = stack.pop()
+            order.append(current)
+            stack.extend(children(*current))
+        order.reverse()
+        return order
+
+    def propagate(self, statement: Node) -> Node:
+        if statement.type == NodeType.VARIABLE_ASSIGNMENT.value:
+            values, groups = statement.args[0], statement.args[1:]
+            for index, value in enumerate(values):
+                for group in groups:
+                    name = self.name(group[index])
+                    if name is None:
+                        continue
+                    if self.constant(value):
+                        self.constants[name] = value.args
+                    else:
+                        self.constants.pop(name, None)
+            return statement
+        if statement.type != NodeType.CALCULATION.value:
+            return statement
+        written = set()
+        self.writes(statement.args, written)
+        known = self.constants
+        if written:
+            known = {name: value for name, value in known.items() if name not in written}
+        root = self.fold(statement.args, known, nested=False)
+        for name in written:
+            self.constants.pop(name, None)
+        task = root.args[0] if root.type == NodeType.MULTI_EXPR.value and len(root.args) == 1 else root
+        if task.type == NodeType.TASK_NODE.value and self.transformer.count(task) == 1:
+            operands, arrows = self.split_task(task)
+            if len(operands) == 1 and self.constant(operands[0]) and task.command.args in ('-', '/'):
+                for segment in self.segments(arrows):
+                    name = self.name(segment[1]) if len(segment) > 1 else None
+                    if name is not None and name != 'print':
+                        self.constants[name] = operands[0].args
+        return Node(statement.type, root, line=statement.line)
+
+    def fold_children(self, node: Node, nested: bool) -> list[tuple[Node, bool]]:
+        if node.type == NodeType.MULTI_EXPR.value:
+            return [(branch, nested) for branch in node.args]
+        if node.type != NodeType.TASK_NODE.value:
+            return []
+        operands, arrows = self.split_task(node)
+        return ([(operand, True) for operand in operands]
+                + [(child, True) for child in arrows if child.type == NodeType.TASK_NODE.value])
+
+    def fold(self, node: Node, known: dict, nested: bool) -> Node:
+        folded = {}
+        for current, current_nested in self.postorder(node, nested, self.fold_children):
+            if current.type == NodeType.MULTI_EXPR.value:
+                branches = [folded[id(branch), current_nested] for branch in current.args]
+                if current_nested and len(branches) == 1 and self.constant(branches[0]):
+                    result = branches[0]
+                else:
+                    result = Node(current.type, branches, current.command)
+            elif current.type == NodeType.TASK_NODE.value:
+                operands, arrows = self.split_task(current)
+                result = self.fold_task(current, [folded[id(operand), True] for operand in operands],
+                                        [folded[id(child), True] if child.type == NodeType.TASK_NODE.value else child
+                                         for child in arrows], current_nested)
+            else:
+                result = current
+                name = self.name(current)
+                if name is not None and name in known:
+                    self.report.propagated += 1
+                    result = self.scalar(known[name])
+            folded[id(current), current_nested] = result
+        return folded[id(node), nested]
+
+    def fold_task(self, task: Node, operands: list, arrows: list, nested: bool) -> Node:
+        """Rebuild task from its already folded operands and arrows, evaluating it when they are all constants."""
+
+        operator = task.command.args
+        if (operands and all([self.constant(operand) for operand in operands])
+                and not (len(operands) == 1 and operator in ('-', '/'))):
+            try:
+                value = self.operation.calculate(operator, [operand.args for operand in operands])
+            except Exception:
+                pass
+            else:
+                if isinstance(value, CONSTANT_TYPES):
+                    self.report.folded += 1
+                    if nested and not arrows:
+                        return self.scalar(value)
+                    return Node(task.type, [self.scalar(value)] + arrows, self.scalar('-'))
+        return Node(task.type, operands + arrows, task.command)
+
+    def collect_reads(self, node, reads: set):
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if isinstance(current, list):
+                stack.extend(current)
+            elif current.type == NodeType.VARIABLE_ASSIGNMENT.value:
+                continue
+            elif current.type in (NodeType.CALCULATION.value, NodeType.MULTI_EXPR.value):
+                stack.append(current.args)
+            elif current.type == NodeType.TASK_NODE.value:
+                operands, arrows = self.split_task(current)
+                stack.extend(operands)
+                for segment in self.segments(arrows):
+                    stack.extend([item for item in segment[1:]
+                                  if item.type in (NodeType.TASK_NODE.value, NodeType.MULTI_EXPR.value)])
+            else:
+                name = self.name(current)
+                if name is not None:
+                    reads.add(name)
+
+    def dead(self, target: Node, reads: set) -> bool:
+        name = self.name(target)
+        return name is not None and name != 'print' and name not in reads
+
+    def eliminate(self, statement: Node, reads: set) -> Node | None:
+        if statement.type == NodeType.VARIABLE_ASSIGNMENT.value:
+            values, groups = statement.args[0], statement.args[1:]
+            columns = [index for index in range(len(values))
+                       if not all([self.dead(group[index], reads) for group in groups])]
+            if len(columns) == len(values):
+                return statement
+            self.report.removed_targets += len(values) - len(columns)
+            if not columns:
+                self.report.removed_statements += 1
+                return None
+            args = [[row[index] for index in columns] for row in statement.args]
+            return Node(statement.type, args, line=statement.line)
+        if statement.type != NodeType.CALCULATION.value:
+            return statement
+        removed_targets = self.report.removed_targets
+        root = self.strip(statement.args, reads, nested=False, deep=True)
+        if not self.folded(root):
+            self.report.removed_targets = removed_targets
+            root = self.strip(statement.args, reads, nested=False, deep=False)
+        if not self.keep_results and self.inert(root):
+            self.report.removed_statements += 1
+            return None
+        return Node(statement.type, root, line=statement.line)
+
+    def strip(self, node: Node, reads: set, nested: bool, deep: bool) -> Node:
+        def children(current: Node, current_nested: bool) -> list[tuple[Node, bool]]:
+            if current.type == NodeType.MULTI_EXPR.value:
+                return [(branch, current_nested) for branch in current.args]
+            if deep and current.type == NodeType.TASK_NODE.value:
+                return [(operand, True) for operand in self.split_task(current)[0]]
+            return []
+
+        stripped = {}
+        for current, current_nested in self.postorder(node, nested, children):
+            stripped[id(current), current_nested] = self.strip_node(current, reads, current_nested, deep, stripped)
+        return stripped[id(node), nested]
+
+    def strip_node(self, node: Node, reads: set, nested: bool, deep: bool, stripped: dict) -> Node:
+        """strip for one node whose children strip already rebuilt (in stripped, by id and nested)."""
+
+        if node.type == NodeType.MULTI_EXPR.value:
+            branches = [stripped[id(branch), nested] for branch in node.args]
+            if nested and len(branches) == 1 and self.constant(branches[0]):
+                return branches[0]
+            return Node(node.type, branches, node.command)
+        if node.type != NodeType.TASK_NODE.value:
+            return node
+        operands, arrows = self.split_task(node)
+        new_operands = [stripped[id(operand), True] for operand in operands] if deep else operands
+        changed = any([new is not old for new, old in zip(new_operands, operands)])
+        kept = []
+        for segment in self.segments(arrows):
+            if len(segment) > 1 and self.dead(segment[1], reads):
+                self.report.removed_targets += 1
+                changed = True
+            else:
+                kept.extend(segment)
+        if not changed:
+            return node
+        if kept:
+            return Node(node.type, new_operands + kept, node.command)
+        return self.fold_task(node, new_operands, [], nested)
+
+    def folded(self, node: Node) -> bool:
+        if node.type == NodeType.MULTI_EXPR.value:
+            return all([self.folded(branch) for branch in node.args])
+        if self.constant(node):
+            return True
+        if node.type != NodeType.TASK_NODE.value:
+            return False
+        operands, arrows = self.split_task(node)
+        return (all([self.constant(operand) for operand in operands])
+                and not any([child.type in (NodeType.TASK_NODE.value, NodeType.MULTI_EXPR.value) for child in arrows]))
+
+    def inert(self, node: Node) -> bool:
+        if node.type == NodeType.MULTI_EXPR.value:
+            return all([self.inert(branch) for branch in node.args])
+        if self.constant(node):
+            return True
+        if node.type != NodeType.TASK_NODE.value or len(node.args) != 1 or not self.constant(node.args[0]):
+            return False
+        return node.command.args in ('-', '/')
+
+
+def optimize(statements: Iterable[Node], live: Iterable[str] | None = None,
+             keep_results: bool = True) -> tuple[list[Node], OptimizationReport]:
+    """Run Optimizer over Parser.parse output and return the optimized statements with the report."""
+
+    optimizer = Optimizer(live, keep_results)
+    return optimizer.optimize(statements), optimizer.report
@@ -0,0 +1,180 @@
+import json
+import sys
+from array import array
+
+
+class StdoutSink:
+    """Writes each value as a line of text, like print(); sys.stdout is looked up on every write so redirection works."""
+
+    def write_values(self, values: list):
+        sys.stdout.write(''.join([f'{value}\n' for value in values]))
+
+    def flush(self):
+        sys.stdout.flush()
+
+    def close(self):
+        self.flush()
+
+
+class FileSink:
+    """Writes each value as a line of text to a file."""
+
+    def __init__(self, path: str):
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write_values(self, values: list):
+        self.file.write(''.join([f'{value}\n' for value in values]))
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class JsonlSink:
+    """Writes each value as one JSON document per line, to a file or to stdout when path is None."""
+
+    def __init__(self, path: str | None = None):
+        self.file = open(path, 'w', encoding='utf-8') if path is not None else None
+
+    def write_values(self, values: list):
+        dumps = json.dumps
+        (self.file or sys.stdout).write(''.join([dumps(value) + '\n' for value in values]))
+
+    def flush(self):
+        (self.file or sys.stdout).flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+        else:
+            sys.stdout.flush()
+
+
+class BinarySink:
+    """
+    Writes values as consecutive native-endian float64 numbers (readable with numpy.fromfile(path, dtype=float)).
+
+    Raises:
+        TypeError: When a value is not a number (bool counts as 0 or 1).
+    """
+
+    def __init__(self, path: str):
+        self.file = open(path, 'wb')
+
+    def write_values(self, values: list):
+        self.file.write(array('d', values).tobytes())
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class MemorySink:
+    """Keeps every value in the values list, for embedding and inspection."""
+
+    def __init__(self):
+        self.values = []
+
+    def write_values(self, values: list):
+        self.values.extend(values)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+SINKS = {
+    'stdout': StdoutSink,
+    'file': FileSink,
+    'jsonl': JsonlSink,
+    'binary': BinarySink,
+    'memory': MemorySink,
+}
+
+
+class OutputBuffer:
+    """
+    Buffered destination for values routed to print.
+
+    Values are collected in a list and handed to the sink flush_size at a time, so printing a million values costs a
+    few thousand writes instead of a million print() calls. Values reach the sink in the order they were written;
+    close() flushes whatever is left, so callers must close the buffer (also when execution fails) before anything
+    else is written to the same destination.
+
+    Attributes:
+        sink: Object with write_values(values), flush() and close(); see SINKS.
+        flush_size (int): Number of buffered values that triggers a flush.
+
+    Methods:
+        write(value): Buffer one value.
+        extend(values): Buffer every value of a list.
+        flush(): Hand all buffered values to the sink.
+        close(): Flush and close the sink.
+    """
+
+    __slots__ = ['sink', 'flush_size', 'pending']
+
+    def __init__(self, sink=None, flush_size: int = 8192):
+        if flush_size < 1:
+            raise ValueError(f"Invalid flush size: {flush_size}")
+        self.sink = sink if sink is not None else StdoutSink()
+        self.flush_size = flush_size
+        self.pending = []
+
+    def write(self, value):
+        pending = self.pending
+        pending.append(value)
+        if len(pending) >= self.flush_size:
+            self.flush()
+
+    def extend(self, values: list):
+        pending = self.pending
+        pending.extend(values)
+        if len(pending) >= self.flush_size:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            values, self.pending = self.pending, []
+            self.sink.write_values(values)
+        self.sink.flush()
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self.sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+        return False
+
+
+def open_output(kind: str = 'stdout', path: str | None = None, flush_size: int = 8192) -> OutputBuffer:
+    """
+    Build an OutputBuffer with the sink named kind ('stdout', 'file', 'jsonl', 'binary' or 'memory').
+
+    Raises:
+        ValueError: For an unknown kind, or when 'file' or 'binary' is given no path.
+    """
+
+    if kind not in SINKS:
+        raise ValueError(f"Invalid output: {kind!r}")
+    if kind in ('file', 'binary') and path is None:
+        raise ValueError(f"Output {kind!r} requires a path")
+    if kind in ('file', 'binary'):
+        sink = SINKS[kind](path)
+    elif kind == 'jsonl':
+        sink = JsonlSink(path)
+    else:
+        sink = SINKS[kind]()
+    return OutputBuffer(sink, flush_size)
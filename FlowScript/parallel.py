@@ -0,0 +1,139 @@
+import contextlib
+import io
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from .dependencies import DependencyGraph
+from .executor import Executor
+from .node_fscc import Node
+from .transpiler import PythonEngine
+from .vm import VirtualMachine
+
+
+def run_statement(executor: Executor, statement: Node, engine: str = 'tree') -> list:
+    """Execute one top-level statement from Parser.parse with the given engine and return its results."""
+
+    if engine == 'factorized':
+        return executor.execute_factorized([statement])
+    if engine == 'vm':
+        return VirtualMachine(executor).execute_statements(executor.transformer.iter_transform([statement]))
+    if engine == 'python':
+        return PythonEngine(executor).execute_statements([statement])
+    return executor.execute_statements(executor.transformer.iter_transform([statement]))
+
+
+def execute_chunk(chunk: list, engine: str = 'tree', backend: str = 'python',
+                  combination_limit: int | None = None) -> list:
+    """
+    Worker entry point: run (statement, variables, writes) items in isolation.
+
+    Every statement gets a fresh Executor (with the given backend and combination_limit) seeded with the variables it
+    reads, and its print output is captured.
+    Returns one (results, written values, output, exception) tuple per item.
+    """
+
+    outcomes = []
+    for statement, variables, writes in chunk:
+        executor = Executor(backend=backend, combination_limit=combination_limit)
+        for name, value in variables.items():
+            executor.env.add_variable(value, name)
+        output = io.StringIO()
+        results, error = [], None
+        with contextlib.redirect_stdout(output):
+            try:
+                results = run_statement(executor, statement, engine)
+            except Exception as exception:
+                error = exception
+        written = {name: value for name, value in executor.env.variables['global'].items() if name in writes}
+        outcomes.append((results, written, output.getvalue(), error))
+    return outcomes
+
+
+class ParallelExecutor:
+    """
+    Runs independent top-level statements concurrently on a process pool, with sequential semantics.
+
+    A DependencyGraph groups the statements into levels; all statements in one level only depend on earlier levels, so
+    they are dispatched together in chunks. Each worker receives the statement plus the current values of the variables
+    it reads, and sends back its results, the values it wrote and its captured print output. Writes are applied to the
+    executor's environment in statement order after each level, and output is written to stdout in statement order as
+    soon as every earlier statement has finished, so variables, results and printed text match sequential execution.
+
+    When a statement raises, the statements before it that have not run yet are executed in-process (their inputs are
+    already final), their output is emitted, and the exception is re-raised after the failing statement's own output.
+    Independent statements after the failing one may already have run, so the environment can hold their writes.
+
+    Attributes:
+        executor (Executor): Owns the environment that receives the writes; the workers use its backend and
+            combination_limit.
+        workers (int): Size of the process pool.
+        chunk_size (int): Statements sent to a worker per task.
+        engine (str): 'tree', 'factorized', 'vm' or 'python', as for main().
+
+    Methods:
+        execute(ast) -> list: Execute Parser.parse output and return results in statement order.
+    """
+
+    def __init__(self, executor: Executor | None = None, workers: int | None = None, chunk_size: int = 64,
+                 engine: str = 'tree'):
+        self.executor = executor if executor is not None else Executor()
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.engine = engine
+
+    def execute(self, ast: list[Node]) -> list:
+        graph = DependencyGraph(list(ast))
+        outcomes = [None] * len(graph.statements)
+        emitted = 0
+        backend = 'numpy' if self.executor.array_operation is not None else 'python'
+        settings = self.engine, backend, self.executor.combination_limit
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for level in graph.levels():
+                futures = []
+                for start in range(0, len(level), self.chunk_size):
+                    indices = level[start:start + self.chunk_size]
+                    chunk = [self.work_item(graph, index) for index in indices]
+                    futures.append((indices, pool.submit(execute_chunk, chunk, *settings)))
+                for indices, future in futures:
+                    for index, outcome in zip(indices, future.result()):
+                        outcomes[index] = outcome
+                for index in level:
+                    self.apply_writes(outcomes[index])
+                failed = [index for index in level if outcomes[index][3] is not None]
+                if failed:
+                    self.finish_before(graph, outcomes, min(failed), emitted, settings)
+                emitted = self.emit(outcomes, emitted)
+        results = []
+        for outcome in outcomes:
+            results.extend(outcome[0])
+        return results
+
+    def work_item(self, graph: DependencyGraph, index: int) -> tuple:
+        effects = graph.effects[index]
+        variables = self.executor.env.variables['global']
+        snapshot = {name: variables[name] for name in effects.reads if name in variables}
+        return graph.statements[index], snapshot, effects.writes
+
+    def apply_writes(self, outcome: tuple):
+        for name, value in outcome[1].items():
+            self.executor.env.add_variable(value, name)
+
+    def finish_before(self, graph: DependencyGraph, outcomes: list, failed: int, emitted: int, settings: tuple):
+        for index in range(failed):
+            if outcomes[index] is None:
+                outcomes[index] = execute_chunk([self.work_item(graph, index)], *settings)[0]
+                self.apply_writes(outcomes[index])
+                if outcomes[index][3] is not None:
+                    failed = index
+                    break
+        self.emit(outcomes[:failed + 1], emitted)
+        raise outcomes[failed][3]
+
+    @staticmethod
+    def emit(outcomes: list, emitted: int) -> int:
+        while emitted < len(outcomes) and outcomes[emitted] is not None:
+            sys.stdout.write(outcomes[emitted][2])
+            emitted += 1
+        sys.stdout.flush()
+        return emitted
@@ -1,9 +1,21 @@
-from .token_fscc import TokenType, NodeType
+from collections import deque
+from collections.abc import Iterable, Iterator
+
+from .token_fscc import Token, TokenType, NodeType
 from .node_fscc import Node
 
 class Parser:
     """
-    Recursive-descent parser that consumes a mutable list of Token objects and produces AST Nodes.
+    Descent parser that consumes Token objects from any iterable and produces AST Nodes.
+
+    Tokens are pulled on demand through a small lookahead buffer, so iter_parse() can emit each top-level statement as
+    soon as its last token has been read, without holding the rest of the token stream in memory.
+
+    Nesting is tracked on an explicit stack of open tasks instead of the call stack, so expressions nested deeper than
+    Python's recursion limit parse like any other.
+
+    Scalar nodes are immutable, so equal literals, identifiers, operators and arrows share one Node (hash-consed by
+    type and value, up to SCALAR_CACHE_LIMIT distinct scalars so a streamed parse stays bounded).
 
     - Builds:
         - Scalar nodes for literals and identifiers.
@@ -12,88 +24,114 @@ class Parser:
         - Variable-assignment structures as [values, variables].
 
     Attributes:
-        tokens: In-place token buffer.
+        tokens: Iterator over the remaining tokens.
+        lookahead: Tokens peeked but not consumed yet (None marks the end of input).
         current_token: Cursor to the active token.
-        position: Current index within tokens.
+        position: Index of the active token in the stream.
         operator_type: TokenType values considered operators.
         value_type: TokenType values considered scalar/identifier-like.
         operator: Scratch field for the active operator.
+        scalars: Shared scalar nodes keyed by (type, value).
 
     Methods:
         parse() -> list[Node]: Parses top-level expressions until input is exhausted.
+        iter_parse() -> Iterator[Node]: Yields top-level expressions one at a time, tagged with their source line.
         parse_expression() -> Node: Parses a single expression (scalar or operator-led task/multi-expr).
         variable_assignment_parser() -> list[list[Node]]: Parses values and variable targets.
+        scalar(value) -> Node: Returns the shared scalar node for value.
         advance(): Moves the cursor forward.
         peek(token_ahead: int = 1): Peeks ahead without consuming.
 
     Raises:
-        SyntaxError: When an operator is not followed by '(' or on mismatched parentheses.
+        SyntaxError: When an operator is not followed by '(', on mismatched parentheses, or when a top-level statement
+            starts with anything but an operator or a value.
     """
 
-    def __init__(self, tokens):
-        self.tokens = tokens
+    SCALAR_CACHE_LIMIT = 4096
+
+    def __init__(self, tokens: Iterable[Token]):
+        self.tokens = iter(tokens)
+        self.lookahead = deque()
         self.current_token = None
         self.position = -1
         self.operator_type = (TokenType.TT_PLUS.value, TokenType.TT_MINUS.value, TokenType.TT_MUL.value, TokenType.TT_DIV.value)
         self.value_type = (TokenType.TT_INT.value, TokenType.TT_FLOAT.value, TokenType.TT_IDENTIFIER.value, TokenType.TT_BOOLEAN.value, TokenType.TT_STRING.value, TokenType.TT_NONE.value, TokenType.TT_FUNCTION.value)
         self.operator = None
+        self.scalars = {}
 
     def advance(self):
         self.position += 1
-        self.current_token = self.tokens[self.position] if self.position < len(self.tokens) else None
+        self.current_token = self.lookahead.popleft() if self.lookahead else next(self.tokens, None)
 
     def peek(self, token_ahead: int = 1):
-        if self.position + token_ahead < len(self.tokens):
-            return self.tokens[self.position + token_ahead]
-        else:
-            return None
+        while len(self.lookahead) < token_ahead:
+            self.lookahead.append(next(self.tokens, None))
+        return self.lookahead[token_ahead - 1]
 
     def parse(self) -> list[Node]:
-        expressions = []
-        while self.position < len(self.tokens) - 1:
-            if self.peek().type in self.operator_type:
-                expressions.append(Node(NodeType.CALCULATION.value, self.parse_expression()))
-            elif self.peek().type in self.value_type:
-                expressions.append(Node(NodeType.VARIABLE_ASSIGNMENT.value, self.variable_assignment_parser()))
-        return expressions
+        return list(self.iter_parse())
+
+    def iter_parse(self) -> Iterator[Node]:
+        while (token := self.peek()) is not None:
+            if token.type in self.operator_type:
+                yield Node(NodeType.CALCULATION.value, self.parse_expression(), line=token.line)
+            elif token.type in self.value_type:
+                yield Node(NodeType.VARIABLE_ASSIGNMENT.value, self.variable_assignment_parser(), line=token.line)
+            else:
+                raise SyntaxError(f"Unexpected '{token.value}', line {token.line}")
 
     def parse_expression(self) -> Node:
-        self.advance()
-        if self.current_token is not None and self.current_token.type in self.operator_type:
-            operator = self.current_token.value
-            expr = [Node(NodeType.SCALAR.value, operator), []]
-            index = 1
-            self.advance()
-            if self.current_token is not None and self.current_token.type != TokenType.TT_LPAREN.value:
-                raise SyntaxError(f"Only expected '(' before {expr[0]}")
-            while self.peek().type != TokenType.TT_RPAREN.value:
-                if self.peek().type == TokenType.TT_SEMICOLON.value:
-                    expr[index] = Node(NodeType.TASK_NODE.value, expr[index], expr[0])
-                    expr.append([])
-                    index += 1
-                    self.advance()
-                expr[index].append(self.parse_expression())
+        operator_type = self.operator_type
+        left_parenthesis = TokenType.TT_LPAREN.value
+        right_parenthesis = TokenType.TT_RPAREN.value
+        semicolon = TokenType.TT_SEMICOLON.value
+        multi_type = NodeType.MULTI_EXPR.value
+        task_type = NodeType.TASK_NODE.value
+        tasks = []
+        while True:
             self.advance()
-            if index:
-                expr[-1] = Node(NodeType.TASK_NODE.value, expr[-1], expr[0])
-                return Node(NodeType.MULTI_EXPR.value, expr[1:])
+            if self.current_token is not None and self.current_token.type in operator_type:
+                operator = self.scalar(self.current_token.value)
+                self.advance()
+                if self.current_token is not None and self.current_token.type != left_parenthesis:
+                    raise SyntaxError(f"Only expected '(' before {operator}")
+                tasks.append((operator, [[]]))
             else:
-                return Node(NodeType.TASK_NODE.value, expr[1], expr[0])
-        else:
-            return Node(NodeType.SCALAR.value, self.current_token.value)
+                node = self.scalar(self.current_token.value)
+                if not tasks:
+                    return node
+                tasks[-1][1][-1].append(node)
+            while self.peek().type == right_parenthesis:
+                self.advance()
+                operator, groups = tasks.pop()
+                node = Node(multi_type, [Node(task_type, group, operator) for group in groups])
+                if not tasks:
+                    return node
+                tasks[-1][1][-1].append(node)
+            if self.peek().type == semicolon:
+                tasks[-1][1].append([])
+                self.advance()
+
+    def scalar(self, value) -> Node:
+        key = type(value), value
+        node = self.scalars.get(key)
+        if node is None:
+            node = Node(NodeType.SCALAR.value, value)
+            if len(self.scalars) < self.SCALAR_CACHE_LIMIT:
+                self.scalars[key] = node
+        return node
 
     def variable_assignment_parser(self) -> list[list[Node]]:
         self.advance()
-        values_and_variables = [[Node(NodeType.SCALAR.value, self.current_token.value)]]
+        values_and_variables = [[self.scalar(self.current_token.value)]]
         index = 0
         while self.peek() and self.peek().type in self.value_type + (TokenType.TT_ARROW.value,):
             self.advance()
             if self.current_token.type != TokenType.TT_ARROW.value:
-                values_and_variables[index].append(Node(NodeType.SCALAR.value, self.current_token.value))
+                values_and_variables[index].append(self.scalar(self.current_token.value))
             else:
                 index += 1
                 values_and_variables.append([])
-        self.advance()
         if len(set(len(list_variables) for list_variables in values_and_variables)) > 1:
             raise ValueError("VariableError: too few values or variables")
         return values_and_variables
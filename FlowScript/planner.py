@@ -0,0 +1,226 @@
+import json
+import sys
+from collections.abc import Iterable
+
+from .data_binding import DataColumn
+from .node_fscc import Node
+from .token_fscc import NodeType
+from .transformer_ast import Transformer
+
+RESULT_BYTES = sys.getsizeof(0.0) + 8
+NODE_BYTES = sys.getsizeof(Node(NodeType.TASK_NODE.value, None))
+SIZE_SUFFIXES = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30, 'T': 1 << 40}
+
+
+def parse_size(text: str) -> int:
+    """
+    Parse a byte count such as '1048576', '512K', '256M' or '2G' (binary multiples, optional trailing 'B').
+
+    Raises:
+        ValueError: When text is not a positive size.
+    """
+
+    value = text.strip().upper().removesuffix('B')
+    multiplier = SIZE_SUFFIXES.get(value[-1:], 1)
+    if value[-1:] in SIZE_SUFFIXES:
+        value = value[:-1]
+    try:
+        size = int(float(value) * multiplier)
+    except ValueError:
+        raise ValueError(f"Invalid size: {text!r}") from None
+    if size < 1:
+        raise ValueError(f"Invalid size: {text!r}")
+    return size
+
+
+def format_size(size: int) -> str:
+    for unit, multiplier in reversed(SIZE_SUFFIXES.items()):
+        if size >= multiplier:
+            return f'{size / multiplier:.1f} {unit}iB'
+    return f'{size} B'
+
+
+class StatementPlan:
+    """
+    Planned cost of one top-level statement.
+
+    Attributes:
+        line (int | None): Source line of the statement.
+        combinations (int): Number of expanded variants (results for a CALCULATION; 1 for an assignment).
+        result_bytes (int): Estimated memory to hold every result at once.
+        expanded_bytes (int): Estimated memory of Transformer.transform's fully expanded statement.
+        chunks (int): Pieces the factorized engine evaluates it in under the plan's limit.
+    """
+
+    __slots__ = ['line', 'combinations', 'result_bytes', 'expanded_bytes', 'chunks']
+
+    def __init__(self, line: int | None, combinations: int, result_bytes: int, expanded_bytes: int, chunks: int):
+        self.line = line
+        self.combinations = combinations
+        self.result_bytes = result_bytes
+        self.expanded_bytes = expanded_bytes
+        self.chunks = chunks
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Plan:
+    """
+    Outcome of Planner.plan.
+
+    Attributes:
+        statements (list[StatementPlan]): One entry per top-level statement, in order.
+        limit (int | None): Largest number of combinations evaluated at once, or None without a budget.
+
+    Methods:
+        combinations() -> int: Total number of combinations.
+        over_budget() -> list[StatementPlan]: Statements that will be evaluated in chunks.
+        to_dict() -> dict / to_json() -> str: Machine-readable plan.
+        format() -> str: Text report.
+    """
+
+    def __init__(self, statements: list[StatementPlan], limit: int | None):
+        self.statements = statements
+        self.limit = limit
+
+    def combinations(self) -> int:
+        return sum([statement.combinations for statement in self.statements])
+
+    def over_budget(self) -> list[StatementPlan]:
+        return [statement for statement in self.statements if statement.chunks > 1]
+
+    def to_dict(self) -> dict:
+        return {
+            'limit': self.limit,
+            'combinations': self.combinations(),
+            'result_bytes': sum([statement.result_bytes for statement in self.statements]),
+            'statements': [statement.to_dict() for statement in self.statements],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def format(self) -> str:
+        lines = [f"{'line':>6}  {'combinations':>16}  {'results':>10}  {'expanded':>10}  {'chunks':>8}"]
+        for statement in self.statements:
+            lines.append(f"{statement.line if statement.line is not None else '-':>6}  {statement.combinations:>16,}  "
+                         f"{format_size(statement.result_bytes):>10}  {format_size(statement.expanded_bytes):>10}  "
+                         f"{statement.chunks:>8,}")
+        total = self.to_dict()
+        lines.append(f"{'total':>6}  {total['combinations']:>16,}  {format_size(total['result_bytes']):>10}")
+        if self.limit is not None:
+            lines.append(f"limit: {self.limit:,} combinations at once; {len(self.over_budget())} statements over it "
+                         f"are evaluated in chunks")
+        return '\n'.join(lines)
+
+
+class Planner:
+    """
+    Planning pass that sizes every statement before anything is expanded.
+
+    Combination counts are exact and come from the MULTI_EXPR/TASK_NODE structure alone (Transformer.count): a
+    MULTI_EXPR has the sum of its branches' counts and a TASK_NODE the product of its batched operands' counts. Byte
+    estimates use RESULT_BYTES per result (a float object and its list slot) and, for the expanded form, the TASK_NODE
+    copies each variant needs (unchanged subtrees are shared between variants). A budget in combinations or bytes
+    becomes the limit handed to Executor(combination_limit=...), which splits larger factorized branches into pieces of
+    at most that many combinations, in order.
+
+    Attributes:
+        max_combinations (int | None): Combination budget.
+        max_bytes (int | None): Memory budget for the results evaluated at once.
+        limit (int | None): Combinations evaluated at once under both budgets, or None.
+
+    Methods:
+        plan(statements) -> Plan: Plan Parser.parse output.
+        plan_statement(statement) -> StatementPlan: Plan one top-level statement.
+        chunks(node, limit) -> int: Number of pieces Transformer.split(node, limit) yields, computed without splitting.
+        variant_bytes(node) -> int: Estimated bytes of the nodes one expanded variant adds.
+
+    chunks and variant_bytes use explicit stacks like Transformer.count, so any nesting depth can be planned.
+    """
+
+    def __init__(self, max_combinations: int | None = None, max_bytes: int | None = None):
+        if max_combinations is not None and max_combinations < 1:
+            raise ValueError(f"Invalid combination budget: {max_combinations}")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f"Invalid memory budget: {max_bytes}")
+        self.max_combinations = max_combinations
+        self.max_bytes = max_bytes
+        self.transformer = Transformer()
+        limits = [limit for limit in (max_combinations, max_bytes and max(1, max_bytes // RESULT_BYTES)) if limit]
+        self.limit = min(limits) if limits else None
+
+    def plan(self, statements: Iterable[Node]) -> Plan:
+        return Plan([self.plan_statement(statement) for statement in statements], self.limit)
+
+    def plan_statement(self, statement: Node) -> StatementPlan:
+        if statement.type != NodeType.CALCULATION.value:
+            return StatementPlan(statement.line, 1, 0, 0, 1)
+        combinations = self.transformer.count(statement.args)
+        chunks = self.chunks(statement.args, self.limit) if self.limit is not None else 1
+        expanded_bytes = combinations * (NODE_BYTES + self.variant_bytes(statement.args))
+        return StatementPlan(statement.line, combinations, combinations * RESULT_BYTES, expanded_bytes, chunks)
+
+    def chunks(self, node: Node, limit: int) -> int:
+        counts = self.transformer.counts(node)
+        batch_types = self.transformer.batch_types
+        total = 0
+        # Every piece Transformer.split makes of a subtree is repeated factor times, so the pieces are summed over a
+        # stack of (node, its combinations, limit, factor) instead of recursing.
+        stack = [(node, counts.get(id(node), 1), limit, 1)]
+        while stack:
+            node, combinations, limit, factor = stack.pop()
+            if combinations <= limit:
+                total += factor
+            elif node.args.__class__ is DataColumn:
+                total += factor * -(-combinations // limit)
+            elif node.type == NodeType.MULTI_EXPR.value:
+                chunks = 0
+                group_combinations = 0
+                for branch in node.args:
+                    branch_combinations = counts.get(id(branch), 1)
+                    if group_combinations and group_combinations + branch_combinations > limit:
+                        chunks += 1
+                        group_combinations = 0
+                    if branch_combinations > limit:
+                        stack.append((branch, branch_combinations, limit, factor))
+                    else:
+                        group_combinations += branch_combinations
+                total += factor * (chunks + (group_combinations > 0))
+            else:
+                for index, child in enumerate(node.args):
+                    if child.type in batch_types:
+                        child_combinations = counts[id(child)]
+                        if child_combinations > 1:
+                            break
+                rest = combinations // child_combinations
+                if rest <= limit:
+                    stack.append((child, child_combinations, limit // rest, factor))
+                else:
+                    args = list(node.args)
+                    args[index] = Node(NodeType.SCALAR.value, 0)
+                    stack.append((Node(node.type, args, node.command), rest, limit, factor * child_combinations))
+        return total
+
+    def variant_bytes(self, node: Node) -> int:
+        batch_types = self.transformer.batch_types
+        sizes = {}
+        stack = [node]
+        while stack:
+            current = stack[-1]
+            if current.type not in batch_types or current.args.__class__ is DataColumn:
+                sizes[id(stack.pop())] = 0
+                continue
+            pending = [child for child in current.args if child.type in batch_types and id(child) not in sizes]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            if current.type == NodeType.MULTI_EXPR.value:
+                size = max([sizes.get(id(branch), 0) for branch in current.args], default=0)
+            else:
+                batched = [sizes[id(child)] for child in current.args if child.type in batch_types]
+                size = NODE_BYTES + sys.getsizeof(list(current.args)) + sum(batched) if batched else 0
+            sizes[id(current)] = size
+        return sizes[id(node)]
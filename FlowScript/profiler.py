@@ -0,0 +1,289 @@
+import json
+import time
+import tracemalloc
+
+from .array_backend import ArrayOperation
+from .builtins_fscc import Operation
+from .environment import Environment
+from .executor import Executor
+from .lexer import Lexer
+from .node_fscc import Node
+from .parser import Parser
+from .read_file import reader
+from .token_fscc import NodeType
+from .transformer_ast import Transformer
+
+
+class CountingOperation(Operation):
+    """Operation that counts calculate() calls; installed on an Executor only while profiling."""
+
+    __slots__ = ['calls']
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def calculate(self, operator: str, numbers: list) -> int | float:
+        self.calls += 1
+        return super().calculate(operator, numbers)
+
+
+class CountingArrayOperation(ArrayOperation):
+    """ArrayOperation that counts the combinations it computes; installed on a numpy Executor only while profiling."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def combine(self, operator: str, value_sets: list):
+        results = super().combine(operator, value_sets)
+        if results is not None:
+            self.calls += results.size
+        return results
+
+
+class CountingEnvironment(Environment):
+    """Environment that counts lookup() calls; installed on an Executor only while profiling."""
+
+    def __init__(self):
+        super().__init__()
+        self.lookups = 0
+
+    def lookup(self, variable: str, parent: str = 'global') -> int | float:
+        self.lookups += 1
+        return super().lookup(variable, parent)
+
+
+def count_nodes(ast: list[Node]) -> int:
+    count = 0
+    stack = list(ast)
+    while stack:
+        node = stack.pop()
+        count += 1
+        if node.command is not None:
+            stack.append(node.command)
+        if isinstance(node.args, Node):
+            stack.append(node.args)
+        elif isinstance(node.args, list):
+            for child in node.args:
+                if isinstance(child, list):
+                    stack.extend(child)
+                else:
+                    stack.append(child)
+    return count
+
+
+class StatementProfile:
+    """
+    Cost of one top-level statement.
+
+    Attributes:
+        line (int | None): Source line the statement starts on.
+        kind (str): 'calculation' or 'assignment'.
+        combinations (int): Statements Transformer expanded it into (tree engine) or results it produced (factorized).
+        seconds (float): Time spent transforming and executing it.
+    """
+
+    __slots__ = ['line', 'kind', 'combinations', 'seconds']
+
+    def __init__(self, line: int | None, kind: str):
+        self.line = line
+        self.kind = kind
+        self.combinations = 0
+        self.seconds = 0.0
+
+    def to_dict(self) -> dict:
+        return {'line': self.line, 'kind': self.kind, 'combinations': self.combinations, 'seconds': self.seconds}
+
+
+class ProfileReport:
+    """
+    Measurements collected by Profiler.
+
+    Attributes:
+        stages (dict[str, dict[str, float]]): 'seconds' and 'peak_bytes' per stage (read, lex, parse, execute); peak_bytes
+            is None when memory tracing was off. For the tree engine, execute includes the streamed transformation,
+            whose share is transform_seconds.
+        transform_seconds (float): Time spent inside Transformer.iter_transform.
+        tokens (int): Tokens produced by the lexer.
+        nodes (int): AST nodes produced by the parser.
+        statements (list[StatementProfile]): Per-statement costs in source order.
+        lookups (int): Environment.lookup calls.
+        calculations (int): Operation.calculate calls, plus the combinations the numpy backend computed as arrays.
+        array_calculations (int): The part of calculations computed as arrays.
+
+    Methods:
+        slowest(count) -> list[StatementProfile]: The most expensive statements.
+        to_dict() -> dict: JSON-serializable form.
+        to_json() -> str: to_dict() encoded as JSON.
+        format(top=10) -> str: Human-readable summary.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.transform_seconds = 0.0
+        self.tokens = 0
+        self.nodes = 0
+        self.statements = []
+        self.lookups = 0
+        self.calculations = 0
+        self.array_calculations = 0
+
+    def slowest(self, count: int = 10) -> list[StatementProfile]:
+        return sorted(self.statements, key=lambda statement: statement.seconds, reverse=True)[:count]
+
+    def to_dict(self) -> dict:
+        return {
+            'stages': self.stages,
+            'transform_seconds': self.transform_seconds,
+            'tokens': self.tokens,
+            'nodes': self.nodes,
+            'combinations': sum(statement.combinations for statement in self.statements),
+            'lookups': self.lookups,
+            'calculations': self.calculations,
+            'array_calculations': self.array_calculations,
+            'statements': [statement.to_dict() for statement in self.statements],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def format(self, top: int = 10) -> str:
+        lines = ['stage         seconds        peak']
+        for name, stage in self.stages.items():
+            peak = f"{stage['peak_bytes'] / 1024:9.1f} KiB" if stage['peak_bytes'] is not None else '          -'
+            lines.append(f"{name:<10} {stage['seconds']:10.4f}  {peak}")
+        if self.transform_seconds:
+            lines.append(f"  transform {self.transform_seconds:10.4f}  (part of execute)")
+        combinations = sum(statement.combinations for statement in self.statements)
+        lines.append(f'tokens {self.tokens}, nodes {self.nodes}, statements {len(self.statements)}, '
+                     f'combinations {combinations}')
+        calculations = f'Operation.calculate {self.calculations}'
+        if self.array_calculations:
+            calculations += f' ({self.array_calculations} as NumPy arrays)'
+        lines.append(f'Environment.lookup {self.lookups}, {calculations}')
+        slowest = self.slowest(top)
+        if slowest:
+            lines.append('slowest statements:')
+            for statement in slowest:
+                lines.append(f'  line {statement.line!s:>6}  {statement.seconds:10.4f} s  '
+                             f'{statement.combinations:>8} combinations  {statement.kind}')
+        return '\n'.join(lines)
+
+
+class Profiler:
+    """
+    Runs a program through the pipeline and measures every stage, as used by `fscc --profile`.
+
+    The profiler drives the same stages as main() itself, timing each with perf_counter and, with trace_memory, its
+    peak allocation with tracemalloc (tracing slows execution down, so absolute times are higher than in a plain run).
+    Statements are transformed and executed one at a time to attribute time and combinations to their source line.
+    Call counts come from CountingEnvironment and CountingOperation (and CountingArrayOperation with backend='numpy',
+    whose combinations count as calculations too), which replace the executor's environment and operation for the
+    profiled run only, so the regular classes carry no instrumentation. Profiled statements are not slot-resolved
+    (VariableResolver), so every variable read is an Environment.lookup call that can be counted.
+
+    Attributes:
+        engine (str): 'tree' or 'factorized', as for main().
+        backend (str): Executor backend.
+        trace_memory (bool): Whether to record peak memory per stage.
+        output (OutputBuffer | None): Destination for printed values, as for Executor.
+        executor (Executor | None): Executor of the last run.
+
+    Methods:
+        profile_file(file) -> ProfileReport: Read, compile and execute a .fscc file.
+        profile(code) -> ProfileReport: Compile and execute source text.
+    """
+
+    def __init__(self, engine: str = 'tree', backend: str = 'python', trace_memory: bool = True, output=None):
+        self.engine = engine
+        self.output = output
+        self.backend = backend
+        self.trace_memory = trace_memory
+        self.executor = None
+
+    def profile_file(self, file: str) -> ProfileReport:
+        report = ProfileReport()
+        with self.tracing():
+            code = self.stage(report, 'read', reader, file)
+            return self.profile(code, report)
+
+    def profile(self, code: str, report: ProfileReport | None = None) -> ProfileReport:
+        report = report if report is not None else ProfileReport()
+        with self.tracing():
+            tokens = self.stage(report, 'lex', lambda source: Lexer(source).make_tokens(), code)
+            report.tokens = len(tokens)
+            ast = self.stage(report, 'parse', lambda stream: Parser(stream).parse(), tokens)
+            report.nodes = count_nodes(ast)
+            del tokens
+            self.stage(report, 'execute', self.execute, ast, report)
+        return report
+
+    def execute(self, ast: list[Node], report: ProfileReport):
+        executor = self.executor = Executor(backend=self.backend, output=self.output)
+        executor.env = CountingEnvironment()
+        executor.operation = CountingOperation()
+        if executor.array_operation is not None:
+            executor.array_operation = CountingArrayOperation()
+        transformer = Transformer()
+        clock = time.perf_counter
+        try:
+            for statement in ast:
+                kind = 'calculation' if statement.type == NodeType.CALCULATION.value else 'assignment'
+                profile = StatementProfile(statement.line, kind)
+                report.statements.append(profile)
+                start = clock()
+                if self.engine == 'factorized':
+                    results = executor.execute_factorized([statement])
+                    profile.combinations = len(results) if kind == 'calculation' else 1
+                else:
+                    variants = transformer.iter_transform([statement])
+                    while True:
+                        transform_start = clock()
+                        variant = next(variants, None)
+                        report.transform_seconds += clock() - transform_start
+                        if variant is None:
+                            break
+                        profile.combinations += 1
+                        executor.execute_statements((variant,), collect=False)
+                profile.seconds = clock() - start
+        finally:
+            report.lookups = executor.env.lookups
+            report.calculations = executor.operation.calls
+            if executor.array_operation is not None:
+                report.array_calculations = executor.array_operation.calls
+                report.calculations += report.array_calculations
+
+    def stage(self, report: ProfileReport, name: str, function, *arguments):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            return function(*arguments)
+        finally:
+            seconds = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] - baseline if self.trace_memory else None
+            report.stages[name] = {'seconds': seconds, 'peak_bytes': peak}
+
+    def tracing(self):
+        return MemoryTracing(self.trace_memory)
+
+
+class MemoryTracing:
+    """Context manager that starts tracemalloc if it is not running yet and stops it again on exit."""
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.started = False
+
+    def __enter__(self):
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started = True
+        return self
+
+    def __exit__(self, *exception):
+        if self.started:
+            tracemalloc.stop()
+        return False
@@ -0,0 +1,123 @@
+from collections.abc import Iterable, Mapping, Sequence
+from itertools import islice
+
+from .data_binding import bind_data
+from .executor import Executor
+from .lexer import Lexer
+from .node_fscc import Node
+from .optimizer import optimize as optimize_statements
+from .parser import Parser
+from .resolver import resolve_variables
+from .transformer_ast import Transformer
+from .transpiler import PythonEngine
+from .vm import VirtualMachine
+
+
+class Program:
+    """
+    A FlowScript program compiled once and evaluated many times against different variable bindings.
+
+    Lexing and parsing happen once, in compile_program. With the tree engine the expanded statements are also kept
+    when there are at most EXPANSION_LIMIT of them, so later runs skip Transformer entirely; larger programs are
+    expanded lazily on every run to keep memory flat. With the vm engine the kept expansion is compiled to bytecode
+    once instead, and every run only executes the code on the VirtualMachine; with the python engine the statements
+    themselves are transpiled (their batches become loops, so there is no size limit) and compiled to Python code
+    objects once (PythonEngine). Variables are resolved to slots of the Executor's frame once; the one Executor is
+    reused for every run and its Environment is cleared first, so each run starts from the given bindings and no state leaks from one run into the next. With memo_size, the calculation cache
+    is kept across runs.
+
+    Attributes:
+        EXPANSION_LIMIT (int): Largest number of expanded statements kept between runs.
+        statements (list[Node]): Parsed top-level statements, resolved against executor's frame.
+        engine (str): 'tree', 'factorized', 'vm' or 'python', as for main().
+        executor (Executor): Executor shared by all runs; its env holds the variables of the last run.
+        expanded (list[Node] | None): Cached Transformer.iter_transform output, or None when expanded per run.
+        vm (VirtualMachine | None): Runs the program with the vm engine.
+        code (list[tuple] | None): Bytecode of the cached expansion (vm engine), or None when compiled per run.
+        native (PythonEngine | None): Runs the program with the python engine.
+        modules (list[PythonModule] | None): Transpiled statements (python engine).
+
+    Methods:
+        run(bindings=None, outputs=None) -> list | dict: Execute once with the given variables.
+        run_batch(rows, outputs=None) -> list: Execute once per binding row and collect every run's result.
+    """
+
+    EXPANSION_LIMIT = 100_000
+
+    def __init__(self, statements: list[Node], engine: str = 'tree', backend: str = 'python', output=None,
+                 memo_size: int | None = None):
+        if engine not in ('tree', 'factorized', 'vm', 'python'):
+            raise ValueError(f"Invalid engine: {engine!r}")
+        self.engine = engine
+        self.executor = Executor(backend=backend, output=output, memo_size=memo_size)
+        self.statements = resolve_variables(statements, self.executor.env.frame)
+        self.expanded = None
+        self.vm = VirtualMachine(self.executor) if engine == 'vm' else None
+        self.code = None
+        self.native = PythonEngine(self.executor) if engine == 'python' else None
+        self.modules = None
+        if self.native is not None:
+            self.modules = list(self.native.transpiler.iter_transpile(self.statements))
+        elif engine != 'factorized':
+            expanded = list(islice(Transformer().iter_transform(self.statements), self.EXPANSION_LIMIT + 1))
+            if len(expanded) <= self.EXPANSION_LIMIT:
+                if self.vm is not None:
+                    self.code = self.vm.compiler.compile_statements(expanded)
+                else:
+                    self.expanded = expanded
+
+    def run(self, bindings: Mapping[str, object] | None = None, outputs: Iterable[str] | None = None) -> list | dict:
+        executor = self.executor
+        executor.env.clear()
+        if bindings:
+            executor.env.variables['global'].update(bindings)
+        if self.engine == 'factorized':
+            results = executor.execute_factorized(self.statements)
+        elif self.code is not None:
+            results = self.vm.run(self.code)
+        elif self.vm is not None:
+            results = self.vm.execute_statements(executor.transformer.iter_transform(self.statements))
+        elif self.modules is not None:
+            results = [result for module in self.modules for result in self.native.run(module)]
+        elif self.expanded is not None:
+            results = executor.execute_statements(self.expanded)
+        else:
+            results = executor.execute_statements(executor.transformer.iter_transform(self.statements))
+        if outputs is None:
+            return results
+        return {name: executor.env.lookup(name) for name in outputs}
+
+    def run_batch(self, rows: Iterable[Mapping[str, object]], outputs: Iterable[str] | None = None) -> list:
+        outputs = tuple(outputs) if outputs is not None else None
+        return [self.run(row, outputs) for row in rows]
+
+
+def compile_program(code: str, engine: str = 'tree', backend: str = 'python', output=None,
+                    optimize: bool = False, memo_size: int | None = None,
+                    data: Mapping[str, Sequence] | None = None) -> Program:
+    """
+    Lex and parse FlowScript source once and return a reusable Program.
+
+    Parameters:
+        code (str): Program source.
+        engine (str): 'tree' (default), 'factorized', 'vm' or 'python'.
+        backend (str): Executor backend, 'python' or 'numpy'.
+        output (OutputBuffer | None): Destination for printed values (default: print()); the caller closes it.
+        optimize (bool): Fold constants and propagate constant variables first (Optimizer); every assignment is kept,
+            since run() may be asked for any variable.
+        memo_size (int | None): Keep the results of up to this many distinct calculations (MemoizingOperation),
+            shared by every run; executor.operation.cache holds the statistics.
+        data (Mapping[str, Sequence] | None): Numeric datasets bound by name (bind_data): DataColumn objects from
+            data_binding.open_column, or any sequence of numbers; every read of a name is a ';' batch of its values.
+
+    Raises:
+        SyntaxError: For lexical or parsing errors.
+        ValueError: For an invalid engine or backend, or a statement that assigns to a name in data.
+    """
+
+    statements = Parser(Lexer(code).make_tokens()).parse()
+    if optimize:
+        statements, _ = optimize_statements(statements)
+    if data:
+        statements = list(bind_data(statements, data))
+    return Program(statements, engine, backend, output, memo_size)
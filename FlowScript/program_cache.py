@@ -0,0 +1,277 @@
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+from functools import lru_cache
+
+from .compiler import EVAL, LOAD_VAR, STORE
+from .lexer import Lexer
+from .node_fscc import Node
+from .parser import Parser
+from .read_file import reader
+from .transpiler import PythonModule
+
+CACHE_FORMAT = 2
+MAGIC = b'FSCC'
+FRONT_END_MODULES = ('lexer.py', 'parser.py', 'token_fscc.py', 'node_fscc.py', 'builtins_fscc.py', 'program_cache.py')
+BACK_END_MODULES = ('optimizer.py', 'resolver.py', 'transformer_ast.py', 'compiler.py', 'transpiler.py')
+NODE_OPERANDS = frozenset((LOAD_VAR, STORE, EVAL))
+
+
+def encode_program(ast: list[Node]) -> bytes:
+    """
+    Serialize Parser.parse output into a compact marshal payload.
+
+    Nodes become (type, command, args, line) tuples and child lists stay lists; scalar payloads (int, float, bool, str, None)
+    are stored as they are, so no class references or pickle opcodes are written per node.
+    """
+
+    return marshal.dumps([encode_node(node) for node in ast])
+
+
+def encode_node(node):
+    if isinstance(node, Node):
+        command = encode_node(node.command) if node.command is not None else None
+        return node.type, command, encode_node(node.args), node.line
+    if isinstance(node, list):
+        return [encode_node(item) for item in node]
+    return node
+
+
+def decode_program(data: bytes) -> list[Node]:
+    return [decode_node(item) for item in marshal.loads(data)]
+
+
+def decode_node(item):
+    if isinstance(item, tuple):
+        node_type, command, args, line = item
+        return Node(node_type, decode_node(args), decode_node(command) if command is not None else None, line)
+    if isinstance(item, list):
+        return [decode_node(child) for child in item]
+    return item
+
+
+def encode_bytecode(compiled: tuple[list[str], list[list[tuple]]]) -> bytes:
+    """
+    Serialize (frame slot names, Compiler code per statement): the code and the slot layout it was resolved against.
+
+    Node operands (LOAD_VAR, STORE, EVAL) are stored like encode_program nodes, every other operand as it is.
+
+    Raises:
+        ValueError: When an operand cannot be marshalled (e.g. a bound DataColumn).
+    """
+
+    names, code = compiled
+    return marshal.dumps((names, [[(opcode, encode_node(argument) if opcode in NODE_OPERANDS else argument)
+                                   for opcode, argument in statement] for statement in code]))
+
+
+def decode_bytecode(data: bytes) -> tuple[list[str], list[list[tuple]]]:
+    names, code = marshal.loads(data)
+    return names, [[(opcode, decode_node(argument) if opcode in NODE_OPERANDS else argument)
+                    for opcode, argument in statement] for statement in code]
+
+
+def encode_modules(compiled: tuple[list[str], list[PythonModule]]) -> bytes:
+    """
+    Serialize (frame slot names, Transpiler modules): each module as its source, its constants (task nodes stored like
+    encode_program nodes) and its code object, so decoding neither generates nor compiles Python source.
+    """
+
+    names, modules = compiled
+    return marshal.dumps((names, [(module.source, encode_node(module.constants), module.code) for module in modules]))
+
+
+def decode_modules(data: bytes) -> tuple[list[str], list[PythonModule]]:
+    names, modules = marshal.loads(data)
+    return names, [PythonModule(source, decode_node(constants), code) for source, constants, code in modules]
+
+
+@lru_cache(maxsize=2)
+def interpreter_fingerprint(modules: tuple[str, ...] = FRONT_END_MODULES) -> bytes:
+    """Digest of the cache format, the Python version (marshal is version specific) and the given sources (the front
+    end by default)."""
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f'{CACHE_FORMAT}:{sys.implementation.name}:{sys.version_info[:3]}'.encode())
+    package = os.path.dirname(os.path.abspath(__file__))
+    for module in modules:
+        with open(os.path.join(package, module), 'rb') as source:
+            digest.update(source.read())
+    return digest.digest()
+
+
+def default_cache_directory() -> str:
+    if os.environ.get('FSCC_CACHE_DIR'):
+        return os.environ['FSCC_CACHE_DIR']
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'fscc')
+
+
+class ProgramCache:
+    """
+    On-disk cache of parsed and compiled programs keyed by source content.
+
+    Entries are named after a BLAKE2b hash of the source text and interpreter_fingerprint(), so editing a script,
+    upgrading Python or changing the lexer/parser invalidates its entry automatically. Each file holds MAGIC, the
+    format byte and an encode_program payload; unreadable or stale files count as misses and are removed. Writes go
+    through a temporary file and os.replace, so concurrent runs never observe partial entries.
+
+    Compiled code (VirtualMachine bytecode, see encode_bytecode, or PythonEngine modules, see encode_modules) is stored
+    alongside under a kind naming the engine and every option that changes the code; its key also covers the back-end
+    sources (BACK_END_MODULES), so changing the transformer, resolver, compiler or transpiler invalidates it.
+    fscc --engine vm and --engine python load it instead of parsing, expanding and compiling again.
+
+    The directory is capped at max_bytes: after every store the least recently used entries (by modification time,
+    refreshed on each hit) are deleted until the total fits. Failing to write the cache never fails a run.
+
+    Attributes:
+        SUFFIX (str): File extension of cache entries.
+        directory (str): Cache location (FSCC_CACHE_DIR, else $XDG_CACHE_HOME/fscc or ~/.cache/fscc).
+        max_bytes (int): Size cap for all entries together.
+
+    Methods:
+        key(source, kind=None) -> str: Hex digest identifying source (compiled as kind) under this interpreter.
+        load(source) -> list[Node] | None: Decoded AST on a hit, None on a miss.
+        store(source, ast): Write an entry, then evict down to max_bytes.
+        load_compiled(source, kind, decode) -> object | None: decode() of the stored compiled code, None on a miss.
+        store_compiled(source, kind, encode, compiled): Write encode(compiled), then evict down to max_bytes.
+        write(path, data) -> bool: Atomically replace path with data; on failure the temporary file is removed.
+        invalidate(source): Remove the entry for source, if any.
+        clear(): Remove every entry.
+        evict(): Delete least recently used entries until the directory fits max_bytes.
+    """
+
+    SUFFIX = '.fsccc'
+
+    def __init__(self, directory: str | None = None, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory or default_cache_directory()
+        self.max_bytes = max_bytes
+
+    def key(self, source: str, kind: str | None = None) -> str:
+        if kind is None:
+            digest = hashlib.blake2b(interpreter_fingerprint(), digest_size=20)
+        else:
+            digest = hashlib.blake2b(interpreter_fingerprint(FRONT_END_MODULES + BACK_END_MODULES), digest_size=20)
+            digest.update(kind.encode('utf-8') + b'\0')
+        digest.update(source.encode('utf-8'))
+        return digest.hexdigest()
+
+    def path(self, source: str, kind: str | None = None) -> str:
+        return os.path.join(self.directory, self.key(source, kind) + self.SUFFIX)
+
+    def load(self, source: str) -> list[Node] | None:
+        return self.read(self.path(source), decode_program)
+
+    def load_compiled(self, source: str, kind: str, decode):
+        return self.read(self.path(source, kind), decode)
+
+    def read(self, path: str, decode):
+        try:
+            with open(path, 'rb') as entry:
+                data = entry.read()
+        except OSError:
+            return None
+        if data[:len(MAGIC) + 1] != MAGIC + bytes([CACHE_FORMAT]):
+            self.remove(path)
+            return None
+        try:
+            value = decode(data[len(MAGIC) + 1:])
+        except (EOFError, ValueError, TypeError, IndexError):
+            self.remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def store(self, source: str, ast: list[Node]):
+        try:
+            payload = encode_program(ast)
+        except (ValueError, RecursionError):
+            return
+        if self.write(self.path(source), MAGIC + bytes([CACHE_FORMAT]) + payload):
+            self.evict()
+
+    def store_compiled(self, source: str, kind: str, encode, compiled):
+        try:
+            payload = encode(compiled)
+        except (ValueError, RecursionError):
+            return
+        if self.write(self.path(source, kind), MAGIC + bytes([CACHE_FORMAT]) + payload):
+            self.evict()
+
+    def write(self, path: str, data: bytes) -> bool:
+        temporary = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(descriptor, 'wb') as entry:
+                entry.write(data)
+            os.replace(temporary, path)
+        except OSError:
+            if temporary is not None:
+                self.remove(temporary)
+            return False
+        return True
+
+    def invalidate(self, source: str):
+        self.remove(self.path(source))
+
+    def clear(self):
+        for path, _, _ in self.entries():
+            self.remove(path)
+
+    def entries(self) -> list[tuple[str, float, int]]:
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        entries = []
+        for name in names:
+            if name.endswith(self.SUFFIX):
+                path = os.path.join(self.directory, name)
+                try:
+                    status = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, status.st_mtime, status.st_size))
+        return entries
+
+    def evict(self):
+        entries = sorted(self.entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            self.remove(path)
+            total -= size
+
+    @staticmethod
+    def remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def load_program(file: str, cache: ProgramCache | None) -> list[Node]:
+    """Read and parse a .fscc file, going through cache when one is given."""
+
+    return parse_program(reader(file), cache)
+
+
+def parse_program(code: str, cache: ProgramCache | None) -> list[Node]:
+    """Parse source text, going through cache when one is given."""
+
+    ast = cache.load(code) if cache is not None else None
+    if ast is None:
+        lexer = Lexer(code)
+        tokens = lexer.make_tokens()
+        parser = Parser(tokens)
+        ast = parser.parse()
+        if cache is not None:
+            cache.store(code, ast)
+    return ast
@@ -1,3 +1,35 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TextIO
+
+
+@contextmanager
+def open_source(file: str) -> Iterator[TextIO]:
+    """
+    Open a .fscc file for UTF-8 text reading, mapping failures of the opening and of every read to the errors below.
+
+    Shared by reader and read_chunks, so both validate and report errors the same way.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        UnicodeDecodeError: If the file cannot be decoded with UTF-8.
+        Exception: For any other unexpected errors during file reading.
+    """
+
+    try:
+        if '.fscc' not in file:
+            raise ValueError('File must have ".fscc" extension.')
+        with open(file, 'r', encoding='utf-8') as f:
+            yield f
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"File '{file}' not found.") from e
+    except UnicodeDecodeError as e:
+        raise UnicodeDecodeError(e.encoding, e.object, e.start, e.end,
+                                 f"failed to decode '{file}' with utf-8 ({e.reason})") from e
+    except Exception as e:
+        raise Exception(f"Unexpected error when reading file '{file}'. Error {e}") from e
+
+
 def reader(file: str) -> str:
     """
     Read and return the contents of a UTF-8 encoded text file.
@@ -14,15 +46,23 @@ def reader(file: str) -> str:
         Exception: For any other unexpected errors during file reading.
     """
 
-    try:
-        if '.fscc' not in file:
-            raise ValueError('File must have ".fscc" extension.')
-        with open(file, 'r', encoding='utf-8') as f:
-            code = f.read()
-        return code
-    except FileNotFoundError:
-        raise FileNotFoundError(f"File '{file}' not found.")
-    except UnicodeDecodeError as e:
-        raise UnicodeDecodeError(f"Failed to decode '{file}' with utf-8. Error {e}")
-    except Exception as e:
-        raise Exception(f"Unexpected error when reading file '{file}'. Error {e}")
+    with open_source(file) as f:
+        return f.read()
+
+
+def read_chunks(file: str, chunk_size: int = 1 << 16) -> Iterator[str]:
+    """
+    Yield the contents of a UTF-8 encoded .fscc file in chunks of at most chunk_size characters.
+
+    The file is decoded incrementally, so multi-byte characters split across reads are handled and only one chunk is
+    held in memory at a time. Validation and errors match reader (see open_source).
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        UnicodeDecodeError: If the file cannot be decoded with UTF-8.
+        Exception: For any other unexpected errors during file reading.
+    """
+
+    with open_source(file) as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
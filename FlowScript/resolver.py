@@ -0,0 +1,107 @@
+from collections.abc import Iterable, Iterator
+
+from .data_binding import DataColumn
+from .environment import Frame
+from .node_fscc import Node
+from .token_fscc import NodeType
+
+
+class VariableResolver:
+    """
+    Compile-time pass that binds variable names to Frame slots.
+
+    Rewrites Parser output so that identifiers read in value positions and the names after '->' become VARIABLE
+    nodes holding the slot index (args) and the name (command); Executor then reads and writes frame.values[slot]
+    instead of going through Environment.lookup and add_variable. 'print' targets, computed targets and the values of
+    VARIABLE_ASSIGNMENT statements (which assign literals) are left as they are. Nested tasks are rewritten with an
+    explicit stack, so nesting depth is not limited by Python's recursion limit. The input AST is not modified:
+    rewritten statements share every untouched subtree with it, and each slot has one shared VARIABLE node.
+
+    Attributes:
+        frame (Frame): Frame whose slots are assigned; it must belong to the Environment that executes the result.
+        nodes (dict[int, Node]): VARIABLE node per slot.
+
+    Methods:
+        resolve(statements) -> Iterator[Node]: Rewrite top-level statements one at a time.
+        resolve_statement(statement) -> Node: Rewrite one top-level statement.
+    """
+
+    def __init__(self, frame: Frame):
+        self.frame = frame
+        self.nodes = {}
+
+    def variable(self, name: str) -> Node:
+        slot = self.frame.slot(name)
+        node = self.nodes.get(slot)
+        if node is None:
+            node = self.nodes[slot] = Node(NodeType.VARIABLE.value, slot, name)
+        return node
+
+    def resolve(self, statements: Iterable[Node]) -> Iterator[Node]:
+        for statement in statements:
+            yield self.resolve_statement(statement)
+
+    def resolve_statement(self, statement: Node) -> Node:
+        if statement.type == NodeType.CALCULATION.value:
+            return Node(statement.type, self.resolve_node(statement.args), line=statement.line)
+        if statement.type == NodeType.VARIABLE_ASSIGNMENT.value:
+            targets = [[self.target(target) for target in group] for group in statement.args[1:]]
+            return Node(statement.type, [statement.args[0]] + targets, line=statement.line)
+        return statement
+
+    def resolve_node(self, node: Node) -> Node:
+        task_type = NodeType.TASK_NODE.value
+        batch_types = (NodeType.MULTI_EXPR.value, task_type)
+        if node.type not in batch_types:
+            return self.resolve_leaf(node)
+        scalar_type = NodeType.SCALAR.value
+        pending = []
+        args = []
+        arrow = segment_start = False
+        position = 0
+        while True:
+            children = node.args
+            is_task = node.type == task_type
+            for position in range(position, len(children)):
+                current = children[position]
+                if not is_task:
+                    if current.type in batch_types and current.args.__class__ is not DataColumn:
+                        break
+                    args.append(self.resolve_leaf(current))
+                elif current.type == scalar_type and current.args == '->':
+                    arrow = segment_start = True
+                    args.append(current)
+                elif segment_start:
+                    segment_start = False
+                    args.append(self.target(current))
+                elif arrow:
+                    args.append(current)
+                elif current.type in batch_types and current.args.__class__ is not DataColumn:
+                    break
+                else:
+                    args.append(self.resolve_leaf(current))
+            else:
+                resolved = Node(node.type, args, node.command)
+                if not pending:
+                    return resolved
+                node, position, args, arrow, segment_start = pending.pop()
+                args.append(resolved)
+                continue
+            pending.append((node, position + 1, args, arrow, segment_start))
+            node, position, args, arrow, segment_start = current, 0, [], False, False
+
+    def resolve_leaf(self, node: Node) -> Node:
+        if node.type == NodeType.SCALAR.value and isinstance(node.args, str) and node.args != '->':
+            return self.variable(node.args)
+        return node
+
+    def target(self, node: Node) -> Node:
+        if node.type == NodeType.SCALAR.value and isinstance(node.args, str) and node.args not in ('print', '->'):
+            return self.variable(node.args)
+        return node
+
+
+def resolve_variables(statements: Iterable[Node], frame: Frame) -> list[Node]:
+    """Resolve Parser output against frame; see VariableResolver."""
+
+    return list(VariableResolver(frame).resolve(statements))
@@ -0,0 +1,271 @@
+import asyncio
+import base64
+import builtins
+import hashlib
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import struct
+import tempfile
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+
+from .executor import Executor
+from .lexer import Lexer
+from .output import MemorySink, OutputBuffer
+from .parser import Parser
+from .program_cache import decode_program
+from .resolver import resolve_variables
+from .transpiler import PythonEngine
+from .vm import VirtualMachine
+
+HEADER = struct.Struct('>I')
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+
+def default_socket_path() -> str:
+    if os.environ.get('FSCC_SOCKET'):
+        return os.environ['FSCC_SOCKET']
+    directory = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(directory, f'fscc-{os.getuid()}.sock')
+
+
+def encode_message(message: dict) -> bytes:
+    body = json.dumps(message).encode('utf-8')
+    return HEADER.pack(len(body)) + body
+
+
+class ParseCache:
+    """
+    Bounded least-recently-used map from a source's BLAKE2b digest to its parsed statements, one per worker.
+
+    Keys are digests, so the cache never holds the request sources themselves. The size is bounded by the total UTF-8
+    length of the cached sources (the statements grow with it): beyond max_bytes the least recently used entries are
+    evicted, and a source longer than max_bytes is parsed but not kept. Statements are never mutated, so runs can
+    share them.
+
+    Attributes:
+        max_bytes (int): Total source bytes kept.
+        entries (OrderedDict): (statements, source bytes) per digest, least recently used first.
+        size (int): Total source bytes of the entries.
+
+    Methods:
+        parse(source) -> list: Parsed statements of source, from the cache when present.
+    """
+
+    __slots__ = ['max_bytes', 'entries', 'size']
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+
+    def parse(self, source: str) -> list:
+        data = source.encode('utf-8')
+        key = hashlib.blake2b(data, digest_size=16).digest()
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            return entry[0]
+        statements = Parser(Lexer(source).make_tokens()).parse()
+        if len(data) <= self.max_bytes:
+            self.entries[key] = statements, len(data)
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                self.size -= self.entries.popitem(last=False)[1][1]
+        return statements
+
+
+PARSE_CACHE = ParseCache()
+
+
+def parse_source(source: str) -> list:
+    """Parsed statements of source, cached per worker in PARSE_CACHE."""
+
+    return PARSE_CACHE.parse(source)
+
+
+def execute_request(request: dict) -> dict:
+    """
+    Run one request in isolation and describe the outcome.
+
+    The request carries either 'source' (FlowScript text) or 'program' (base64 of program_cache.encode_program), plus
+    optional 'engine', 'backend', 'combination_limit' and 'bindings'; see run_isolated for the response.
+    """
+
+    if 'program' in request:
+        load = lambda: decode_program(base64.b64decode(request['program']))
+    else:
+        load = lambda: parse_source(request['source'])
+    return run_isolated(load, request.get('engine', 'tree'), request.get('backend', 'python'), request.get('bindings'),
+                        request.get('combination_limit'))
+
+
+def run_isolated(load: Callable[[], list], engine: str = 'tree', backend: str = 'python',
+                 bindings: dict | None = None, combination_limit: int | None = None) -> dict:
+    """
+    Load statements with load() and execute them in a fresh Executor (see Executor for backend and
+    combination_limit), capturing printed values.
+
+    Returns a dict with 'ok', 'results' and 'output' (printed text, also when the run failed), and on failure 'error'
+    with the exception 'type' and 'args'. Errors raised by load() are reported the same way, never raised.
+    """
+
+    sink = MemorySink()
+    output = OutputBuffer(sink)
+    results = []
+    error = None
+    try:
+        statements = load()
+        executor = Executor(backend=backend, output=output, combination_limit=combination_limit)
+        executor.env.variables['global'].update(bindings or {})
+        statements = resolve_variables(statements, executor.env.frame)
+        if engine == 'factorized':
+            results = executor.execute_factorized(statements)
+        elif engine == 'vm':
+            results = VirtualMachine(executor).execute_statements(executor.transformer.iter_transform(statements))
+        elif engine == 'python':
+            results = PythonEngine(executor).execute_statements(statements)
+        else:
+            results = executor.execute_statements(executor.transformer.iter_transform(statements))
+    except Exception as exception:
+        error = {'type': type(exception).__name__, 'args': [str(argument) for argument in exception.args]}
+    output.flush()
+    response = {'ok': error is None, 'results': results, 'output': ''.join([f'{value}\n' for value in sink.values])}
+    if error is not None:
+        response['error'] = error
+    return response
+
+
+class FlowScriptServer:
+    """
+    Long-running daemon that executes FlowScript requests sent over a Unix socket, as started by `fscc serve`.
+
+    Messages in both directions are JSON objects prefixed with their length as a 4-byte big-endian integer; a client
+    may send any number of requests on one connection and gets one response per request, in order. The asyncio loop
+    only does I/O: requests run on a pool of warm worker processes (execute_request), so many connections are served
+    concurrently, a slow script does not block the others, and no state is shared between requests. Workers are
+    started through a fork server so they never inherit the listening socket. The socket is created with owner-only
+    permissions and removed again on SIGTERM or SIGINT.
+
+    Attributes:
+        path (str): Socket path (FSCC_SOCKET, else fscc-<uid>.sock in XDG_RUNTIME_DIR or the temp directory).
+        workers (int | None): Worker processes (default: CPU count).
+
+    Methods:
+        serve_forever(): Bind the socket and serve until cancelled.
+        handle(reader, writer): Serve one connection.
+    """
+
+    def __init__(self, path: str | None = None, workers: int | None = None):
+        self.path = path or default_socket_path()
+        self.workers = workers
+        self.pool = None
+
+    async def serve_forever(self):
+        if os.path.exists(self.path):
+            if daemon_running(self.path):
+                raise RuntimeError(f"fscc daemon already running on '{self.path}'")
+            os.unlink(self.path)
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('forkserver'))
+        previous_umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(self.handle, path=self.path, limit=MAX_MESSAGE_BYTES)
+        finally:
+            os.umask(previous_umask)
+        loop = asyncio.get_running_loop()
+        serving = asyncio.current_task()
+        for signal_number in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signal_number, serving.cancel)
+        try:
+            async with server:
+                await server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break
+                (length,) = HEADER.unpack(header)
+                if length > MAX_MESSAGE_BYTES:
+                    writer.write(encode_message({'ok': False, 'results': [], 'output': '', 'error': {
+                        'type': 'ValueError', 'args': [f'Request of {length} bytes exceeds {MAX_MESSAGE_BYTES}']}}))
+                    await writer.drain()
+                    break
+                try:
+                    request = json.loads(await reader.readexactly(length))
+                except (json.JSONDecodeError, UnicodeDecodeError) as exception:
+                    response = {'ok': False, 'results': [], 'output': '',
+                                'error': {'type': 'ValueError', 'args': [f'Malformed request: {exception}']}}
+                else:
+                    response = await loop.run_in_executor(self.pool, execute_request, request)
+                writer.write(encode_message(response))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def serve(path: str | None = None, workers: int | None = None):
+    asyncio.run(FlowScriptServer(path, workers).serve_forever())
+
+
+def daemon_running(path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+def request_remote(request: dict, path: str | None = None, timeout: float | None = None) -> dict | None:
+    """
+    Send one request to the daemon and return its response, or None when no daemon is listening on path.
+
+    Raises:
+        ConnectionError: When the daemon closes the connection before answering.
+    """
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        try:
+            client.connect(path or default_socket_path())
+        except (FileNotFoundError, ConnectionRefusedError):
+            return None
+        client.sendall(encode_message(request))
+        (length,) = HEADER.unpack(receive_exactly(client, HEADER.size))
+        return json.loads(receive_exactly(client, length))
+
+
+def receive_exactly(client: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = client.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError('fscc daemon closed the connection')
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def remote_exception(error: dict) -> Exception:
+    """Rebuild the exception described by a response's 'error' (built-in types keep their type)."""
+
+    exception_type = getattr(builtins, error['type'], None)
+    if isinstance(exception_type, type) and issubclass(exception_type, Exception):
+        return exception_type(*error['args'])
+    return Exception(f"{error['type']}: {', '.join(error['args'])}")
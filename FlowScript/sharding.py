@@ -0,0 +1,159 @@
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from .dependencies import statement_effects
+from .executor import Executor
+from .node_fscc import Node
+from .output import MemorySink, OutputBuffer
+from .token_fscc import NodeType
+from .transpiler import PythonEngine
+from .vm import VirtualMachine
+
+
+def iter_statement(executor: Executor, statement: Node, engine: str = 'tree') -> Iterator[list]:
+    """Results of one Parser.parse statement with the given engine, as lists of at most Executor.BATCH_SIZE."""
+
+    if engine == 'factorized':
+        yield from executor.iter_factorized([statement])
+        return
+    if engine == 'python':
+        results = PythonEngine(executor).iter_execute([statement])
+    else:
+        runner = VirtualMachine(executor) if engine == 'vm' else executor
+        results = runner.iter_execute(executor.transformer.iter_transform([statement]))
+    while batch := list(islice(results, executor.BATCH_SIZE)):
+        yield batch
+
+
+def execute_range(statement: Node, start: int, stop: int, variables: dict, writes: set, engine: str = 'tree',
+                  backend: str = 'python', collect: bool = True) -> tuple:
+    """
+    Worker entry point: evaluate combinations start to stop of statement's expansion in a fresh Executor.
+
+    Only the pieces of the statement covering the range are built (Transformer.select). Returns (results, printed
+    values, written values, exception): results are those computed before an exception ([] when collect is False) and
+    written holds the final value of every variable in writes the range assigned.
+    """
+
+    sink = MemorySink()
+    output = OutputBuffer(sink)
+    executor = Executor(backend=backend, output=output)
+    for name, value in variables.items():
+        executor.env.add_variable(value, name)
+    results, error = [], None
+    try:
+        for piece in executor.transformer.select(statement.args, start, stop):
+            for batch in iter_statement(executor, Node(statement.type, piece, line=statement.line), engine):
+                if collect:
+                    results.extend(batch)
+    except Exception as exception:
+        error = exception
+    output.flush()
+    written = {name: value for name, value in executor.env.variables['global'].items() if name in writes}
+    return results, sink.values, written, error
+
+
+class ShardedExecutor:
+    """
+    Evaluates the expansion of a single huge statement on a process pool, split into contiguous index ranges.
+
+    A statement with count() combinations is an index space in mixed radix: every batched operand is a digit whose
+    base is its own number of combinations, the first one varying slowest. The space is cut into contiguous ranges
+    (RANGES_PER_WORKER per worker, and none larger than RANGE_LIMIT); each worker receives the statement, its range and
+    the current values of the variables the statement reads, builds only the pieces of the expansion that cover its
+    range (Transformer.select) and evaluates them with the chosen engine. Ranges are merged back in index order, so
+    results, printed values and the final variables are the same as a sequential run; at most two ranges per worker
+    are in flight, which keeps the unconsumed results bounded.
+
+    A statement is sharded when it has at least min_combinations combinations, its arrow targets are known statically
+    and it does not read a variable it writes (its combinations would then depend on each other). Everything else runs
+    in this process on executor, as do variable assignments. When a range raises, the output and writes of the
+    earlier ranges and of the failing range up to the error are applied, then the exception is re-raised; later ranges
+    are discarded.
+
+    Attributes:
+        RANGES_PER_WORKER (int): Ranges per worker process, for load balancing.
+        RANGE_LIMIT (int): Largest number of combinations in one range.
+        MIN_COMBINATIONS (int): Default for min_combinations.
+        executor (Executor): Holds the environment; receives printed values and the writes of sharded statements.
+        workers (int): Size of the process pool.
+        engine (str): 'tree', 'factorized', 'vm' or 'python', as for main().
+        min_combinations (int): Smallest statement that is sharded.
+
+    Methods:
+        iter_execute(statements, collect=True) -> Iterator[list]: Results of Parser.parse output, in order, as lists.
+        execute(statements, collect=True) -> list: All results ([] when collect is False).
+        shardable(statement) -> bool: Whether a statement is split across the pool.
+    """
+
+    RANGES_PER_WORKER = 4
+    RANGE_LIMIT = 1_000_000
+    MIN_COMBINATIONS = 100_000
+
+    def __init__(self, executor: Executor | None = None, workers: int | None = None, engine: str = 'tree',
+                 min_combinations: int = MIN_COMBINATIONS):
+        if min_combinations < 1:
+            raise ValueError(f"Invalid shard threshold: {min_combinations}")
+        self.executor = executor if executor is not None else Executor()
+        self.workers = workers or os.cpu_count() or 1
+        self.engine = engine
+        self.min_combinations = min_combinations
+
+    def execute(self, statements: Iterable[Node], collect: bool = True) -> list:
+        all_results = []
+        for results in self.iter_execute(statements, collect):
+            all_results.extend(results)
+        return all_results
+
+    def iter_execute(self, statements: Iterable[Node], collect: bool = True) -> Iterator[list]:
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for statement in statements:
+                if self.shardable(statement):
+                    yield from self.iter_ranges(pool, statement, collect)
+                elif statement.type == NodeType.CALCULATION.value:
+                    yield from iter_statement(self.executor, statement, self.engine)
+                elif statement.type == NodeType.VARIABLE_ASSIGNMENT.value:
+                    self.executor.variable_assignment(self.executor.transformer.variable_assignment(statement))
+
+    def shardable(self, statement: Node) -> bool:
+        if statement.type != NodeType.CALCULATION.value:
+            return False
+        if self.executor.transformer.count(statement.args) < self.min_combinations:
+            return False
+        effects = statement_effects(statement)
+        return not effects.dynamic and not effects.reads & effects.writes
+
+    def ranges(self, combinations: int) -> list[tuple[int, int]]:
+        count = max(self.workers * self.RANGES_PER_WORKER, -(-combinations // self.RANGE_LIMIT))
+        count = min(count, combinations)
+        bounds = [combinations * index // count for index in range(count + 1)]
+        return list(zip(bounds, bounds[1:]))
+
+    def iter_ranges(self, pool: ProcessPoolExecutor, statement: Node, collect: bool) -> Iterator[list]:
+        effects = statement_effects(statement)
+        variables = self.executor.env.variables['global']
+        snapshot = {name: variables[name] for name in effects.reads if name in variables}
+        backend = 'numpy' if self.executor.array_operation is not None else 'python'
+        ranges = deque(self.ranges(self.executor.transformer.count(statement.args)))
+        futures = deque()
+        try:
+            while ranges or futures:
+                while ranges and len(futures) < 2 * self.workers:
+                    start, stop = ranges.popleft()
+                    futures.append(pool.submit(execute_range, statement, start, stop, snapshot, effects.writes,
+                                               self.engine, backend, collect))
+                results, printed, written, error = futures.popleft().result()
+                for value in printed:
+                    self.executor.execute_arrow(value, 'print')
+                for name, value in written.items():
+                    self.executor.env.add_variable(value, name)
+                if results:
+                    yield results
+                if error is not None:
+                    raise error
+        finally:
+            for future in futures:
+                future.cancel()
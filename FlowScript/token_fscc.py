@@ -1,3 +1,5 @@
+from array import array
+from collections.abc import Iterable, Iterator
 from enum import Enum
 
 
@@ -59,6 +61,7 @@ class NodeType(Enum):
     - SCALAR: Represents an atomic scalar value.
     - TASK_NODE: Executable task node.
     - VARIABLE_ASSIGNMENT: Variable binding or assignment node.
+    - VARIABLE: Variable resolved to a frame slot (args is the slot index, command the name).
     """
 
     CALCULATION = 1
@@ -66,6 +69,7 @@ class NodeType(Enum):
     SCALAR = 3
     TASK_NODE = 4
     VARIABLE_ASSIGNMENT = 5
+    VARIABLE = 6
 
 
 class Token:
@@ -75,15 +79,80 @@ class Token:
     Attributes:
         type: Token category or identifier.
         value: Optional payload or lexeme; may be None.
+        line: 1-based source line the token starts on; None when unknown.
 
     __repr__:
         Returns 'TYPE: VALUE' when value is truthy, otherwise 'TYPE'.
     """
 
-    def __init__(self, type_token, value=None):
+    __slots__ = ['type', 'value', 'line']
+
+    def __init__(self, type_token, value=None, line=None):
         self.type = type_token
         self.value = value
+        self.line = line
 
     def __repr__(self) -> str:
         if self.value: return f'{self.type}: {self.value}'
         return f'{self.type}'
+
+
+TOKEN_TYPES = tuple(member.value for member in TokenType)
+TOKEN_CODES = {token_type: code for code, token_type in enumerate(TOKEN_TYPES)}
+
+
+class TokenTable:
+    """
+    Struct-of-arrays token stream: one small integer type code, one value and one line number per token.
+
+    Type codes index TOKEN_TYPES and live in a byte array, line numbers in an unsigned int array, and values in a plain
+    list (punctuation lexemes are interned strings, so they share one object each). A large program costs a few bytes
+    per token plus the literal values instead of one Token object per token. Iterating yields Token objects on demand,
+    so Parser consumes a table like any other token iterable.
+
+    Attributes:
+        codes (array): TOKEN_TYPES index per token.
+        values (list): Token payloads.
+        lines (array): Source line per token (0 when unknown).
+
+    Methods:
+        from_tokens(tokens) -> TokenTable: Pack any iterable of Token objects.
+        append(token): Pack one token.
+        type_at(index) -> str: TokenType value of a token.
+    """
+
+    __slots__ = ['codes', 'values', 'lines']
+
+    def __init__(self):
+        self.codes = array('B')
+        self.values = []
+        self.lines = array('I')
+
+    @classmethod
+    def from_tokens(cls, tokens: Iterable[Token]) -> 'TokenTable':
+        table = cls()
+        codes, values, lines = table.codes.append, table.values.append, table.lines.append
+        for token in tokens:
+            codes(TOKEN_CODES[token.type])
+            values(token.value)
+            lines(token.line or 0)
+        return table
+
+    def append(self, token: Token):
+        self.codes.append(TOKEN_CODES[token.type])
+        self.values.append(token.value)
+        self.lines.append(token.line or 0)
+
+    def type_at(self, index: int) -> str:
+        return TOKEN_TYPES[self.codes[index]]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> Token:
+        return Token(TOKEN_TYPES[self.codes[index]], self.values[index], self.lines[index] or None)
+
+    def __iter__(self) -> Iterator[Token]:
+        types = TOKEN_TYPES
+        for code, value, line in zip(self.codes, self.values, self.lines):
+            yield Token(types[code], value, line or None)
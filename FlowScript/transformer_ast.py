@@ -1,5 +1,6 @@
-import copy
+from collections.abc import Iterable, Iterator
 
+from .data_binding import DataColumn
 from .node_fscc import Node
 from .token_fscc import NodeType
 
@@ -8,42 +9,173 @@ class Transformer:
     """
     Transforms ASTs by enumerating all combinations produced by MULTI_EXPR and TASK_NODE children.
 
-    - replace_node_in_ast(ast, index, node): Deep-copies ast and substitutes the child at index.
-    - multi_expression(expression, ast, index, result): Expands a MULTI_EXPR child and appends substituted AST variants.
-    - transform_single(ast): Returns a MULTI_EXPR of expansions for one AST or the original when no expansion applies.
-    - variable_assignment_transform(ast): Pairs variables and values from a VARIABLE_ASSIGNMENT node into [var, value] lists.
-    - transform(ast): Processes a sequence of expressions, preserving CALCULATION variants and wrapping all outputs in a MULTI_EXPR.
+    Expansion is lazy: variants are produced one at a time by generators, in cartesian order (the first batched
+    operand varies slowest), so memory stays bounded by the depth of the AST rather than the number of combinations.
+    The top RECURSION_DEPTH levels use nested generators; deeper subtrees are enumerated by iterate(), an odometer over
+    an explicit cursor tree that needs no call stack, so any nesting depth expands in the same order.
+
+    - expand(node): Yields every variant of node; TASK_NODE children are expanded and combined left to right.
+    - multi_expression(expression): Yields the variants of each branch of a MULTI_EXPR in order.
+    - iterate(node): Non-recursive expand: first() builds the cursor of the first variant, build() turns a cursor
+      into its variant (rebuilding only the parts advance() changed) and advance() steps to the next variant.
+    - transform_single(ast): Returns a MULTI_EXPR holding every expansion of one AST.
+    - variable_assignment(ast): Pairs variables and values from a VARIABLE_ASSIGNMENT node into [value, var, ...] lists.
+    - iter_transform(ast): Streams transformed top-level CALCULATION and VARIABLE_ASSIGNMENT nodes.
+    - transform(ast): Eager form of iter_transform, wrapping all outputs in a MULTI_EXPR.
+    - count(node): Number of variants expand(node) yields, computed from the structure without expanding (and without
+      recursion).
+    - counts(node): count of node and of every batched node below it, by node id (nodes without batches count 1 and
+      are left out).
+    - split(node, limit): Yields nodes with at most limit variants each (unless a single variant is left) whose
+      expansions, concatenated, equal expand(node); work items live on an explicit stack, so any depth can be split.
+    - select(node, start, stop): Yields nodes whose expansions, concatenated, equal variants start to stop of
+      expand(node); the variant index is a mixed-radix number with one digit per batched operand, so only the pieces
+      covering the range are built. Like split, it works from one counts table and an explicit stack.
 
     Notes:
-    - Uses copy.deepcopy to avoid in-place mutation.
+    - Variants share unchanged subtrees with the source AST; nodes are never mutated in place.
+    - A MULTI_EXPR whose args is a bound DataColumn expands like any batch, but count, split and select use its length
+      and slices instead of visiting its values.
     - Relies on Node and NodeType semantics (MULTI_EXPR, TASK_NODE, CALCULATION, VARIABLE_ASSIGNMENT).
     """
 
-    def replace_node_in_ast(self, ast: Node, index: int, node: Node) -> Node:
-        ast = copy.deepcopy(ast)
-        ast.args[index] = node
-        return ast
+    batch_types = (NodeType.TASK_NODE.value, NodeType.MULTI_EXPR.value)
+    RECURSION_DEPTH = 64
+    # A cursor is [node, variant or None when it must be rebuilt, branch index (MULTI_EXPR) or batched positions
+    # (TASK_NODE) or None (a node with a single variant), child cursor or list of child cursors].
+
+    def expand(self, node: Node, depth: int = 0) -> Iterator[Node]:
+        if node.type == NodeType.MULTI_EXPR.value:
+            if depth < self.RECURSION_DEPTH:
+                yield from self.multi_expression(node, depth)
+            else:
+                yield from self.iterate(node)
+        elif node.type == NodeType.TASK_NODE.value:
+            positions = [index for index, child in enumerate(node.args) if child.type in self.batch_types]
+            if not positions:
+                yield node
+            elif depth < self.RECURSION_DEPTH:
+                yield from self.expand_positions(node, positions, 0, list(node.args), depth)
+            else:
+                yield from self.iterate(node)
+        else:
+            yield node
 
-    def multi_expression(self, expression: Node, ast: Node, index: int, result: list):
+    def expand_positions(self, ast: Node, positions: list[int], index: int, args: list, depth: int) -> Iterator[Node]:
+        position = positions[index]
+        last = index == len(positions) - 1
+        for variant in self.expand(ast.args[position], depth + 1):
+            args[position] = variant
+            if last:
+                yield Node(ast.type, args[:], ast.command)
+            else:
+                yield from self.expand_positions(ast, positions, index + 1, args, depth)
+
+    def multi_expression(self, expression: Node, depth: int = 0) -> Iterator[Node]:
         for single_expression in expression.args:
-            child_results = self.transform_single(single_expression)
-            if child_results.args[0].type == NodeType.TASK_NODE.value:
-                for single_child_result in child_results.args:
-                    result.append(self.replace_node_in_ast(ast, index, single_child_result))
+            yield from self.expand(single_expression, depth + 1)
+
+    def iterate(self, node: Node) -> Iterator[Node]:
+        cursor = self.first(node)
+        while True:
+            yield self.build(cursor)
+            if not self.advance(cursor):
+                return
+
+    def cursor(self, node: Node) -> list:
+        if node.type == NodeType.MULTI_EXPR.value:
+            return [node, None, 0, None]
+        if node.type == NodeType.TASK_NODE.value:
+            batch_types = self.batch_types
+            positions = [index for index, child in enumerate(node.args) if child.type in batch_types]
+            if positions:
+                return [node, None, positions, None]
+        return [node, node, None, None]
+
+    def first(self, node: Node) -> list:
+        multi_type = NodeType.MULTI_EXPR.value
+        cursor = self.cursor
+        root = cursor(node)
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            if current[1] is not None:
+                continue
+            node = current[0]
+            if node.type == multi_type:
+                current[3] = cursor(node.args[current[2]])
+                stack.append(current[3])
+            else:
+                args = node.args
+                current[3] = [cursor(args[index]) for index in current[2]]
+                stack.extend(current[3])
+        return root
+
+    def advance(self, cursor: list) -> bool:
+        multi_type = NodeType.MULTI_EXPR.value
+        path = []
+        while True:
+            while cursor[2] is not None:
+                if cursor[0].type == multi_type:
+                    path.append([cursor, 0])
+                    cursor = cursor[3]
+                else:
+                    path.append([cursor, len(cursor[3]) - 1])
+                    cursor = cursor[3][-1]
+            advanced = False
+            while path:
+                frame = path[-1]
+                parent, position = frame
+                node = parent[0]
+                if advanced:
+                    parent[1] = None
+                    if node.type != multi_type:
+                        children = parent[3]
+                        for index in range(position + 1, len(children)):
+                            children[index] = self.first(node.args[parent[2][index]])
+                elif node.type == multi_type:
+                    if parent[2] + 1 < len(node.args):
+                        parent[2] += 1
+                        parent[3] = self.first(node.args[parent[2]])
+                        parent[1] = None
+                        advanced = True
+                elif position:
+                    frame[1] = position - 1
+                    cursor = parent[3][position - 1]
+                    break
+                path.pop()
+            else:
+                return advanced
+
+    def build(self, cursor: list) -> Node:
+        multi_type = NodeType.MULTI_EXPR.value
+        stack = [cursor]
+        while stack:
+            current = stack[-1]
+            if current[1] is not None:
+                stack.pop()
+                continue
+            node = current[0]
+            children = current[3]
+            if node.type == multi_type:
+                if children[1] is None:
+                    stack.append(children)
+                    continue
+                current[1] = children[1]
             else:
-                result.append(self.replace_node_in_ast(ast, index, child_results))
+                pending = [child for child in children if child[1] is None]
+                if pending:
+                    stack.extend(pending)
+                    continue
+                args = list(node.args)
+                for index, child in zip(current[2], children):
+                    args[index] = child[1]
+                current[1] = Node(node.type, args, node.command)
+            stack.pop()
+        return cursor[1]
 
     def transform_single(self, ast: Node) -> Node:
-        result = []
-        for index, node in enumerate(ast.args):
-            if node.type == NodeType.TASK_NODE.value:
-                result.append(self.transform_single(node))
-            elif node.type == NodeType.MULTI_EXPR.value:
-                self.multi_expression(node, ast, index, result)
-        if result:
-            return Node(NodeType.MULTI_EXPR.value, result)
-        else:
-            return ast
+        return Node(NodeType.MULTI_EXPR.value, list(self.expand(ast)))
 
     def variable_assignment(self, ast: Node) -> list[list[Node]]:
         number_of_values = len(ast.args[0])
@@ -53,12 +185,176 @@ class Transformer:
                 result[index].append(current[index])
         return result
 
-    def transform(self, ast: list) -> Node:
-        results = []
+    def iter_transform(self, ast: Iterable[Node]) -> Iterator[Node]:
         for expression in ast:
             if expression.type == NodeType.CALCULATION.value:
-                for result in self.transform_single(expression):
-                    results.append(Node(NodeType.CALCULATION.value, result))
+                for result in self.expand(expression.args):
+                    yield Node(NodeType.CALCULATION.value, result, line=expression.line)
             elif expression.type == NodeType.VARIABLE_ASSIGNMENT.value:
-                results.append(Node(NodeType.VARIABLE_ASSIGNMENT.value, self.variable_assignment(expression)))
-        return Node(NodeType.MULTI_EXPR.value, results)
+                yield Node(NodeType.VARIABLE_ASSIGNMENT.value, self.variable_assignment(expression), line=expression.line)
+
+    def transform(self, ast: list) -> Node:
+        return Node(NodeType.MULTI_EXPR.value, list(self.iter_transform(ast)))
+
+    def count(self, node: Node) -> int:
+        if node.type not in self.batch_types:
+            return 1
+        return self.counts(node)[id(node)]
+
+    def counts(self, node: Node) -> dict[int, int]:
+        batch_types = self.batch_types
+        multi_type = NodeType.MULTI_EXPR.value
+        counts = {}
+        if node.type not in batch_types:
+            return counts
+        stack = [node]
+        while stack:
+            current = stack[-1]
+            if current.args.__class__ is DataColumn:
+                counts[id(stack.pop())] = len(current.args)
+                continue
+            pending = [child for child in current.args if child.type in batch_types and id(child) not in counts]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            if current.type == multi_type:
+                total = sum([counts[id(branch)] if branch.type in batch_types else 1 for branch in current.args])
+            else:
+                total = 1
+                for child in current.args:
+                    if child.type in batch_types:
+                        total *= counts[id(child)]
+            counts[id(current)] = total
+        return counts
+
+    def split(self, node: Node, limit: int) -> Iterator[Node]:
+        counts = self.counts(node)
+        batch_types = self.batch_types
+        # Work items are (node, combinations, limit, parent). A piece of a batched operand is put back into its task
+        # through parent, (task, index, rest, limit, parent), and the result is split again under the task's limit.
+        # Items come from a stack of iterators, so pieces are produced in order without recursion. Nodes built here
+        # are only looked at again when they have a single variant, so counts (of the original nodes) defaults to 1.
+        stack = [iter([(node, counts.get(id(node), 1), limit, None)])]
+        while stack:
+            item = next(stack[-1], None)
+            if item is None:
+                stack.pop()
+                continue
+            node, combinations, limit, parent = item
+            if combinations <= limit:
+                if parent is None:
+                    yield node
+                else:
+                    task, index, rest, task_limit, task_parent = parent
+                    stack.append(iter([(self.substitute(task, index, node), combinations * rest, task_limit,
+                                        task_parent)]))
+            elif node.args.__class__ is DataColumn:
+                stack.append(self.split_column(node, combinations, limit, parent))
+            elif node.type == NodeType.MULTI_EXPR.value:
+                stack.append(self.split_branches(node, counts, limit, parent))
+            else:
+                for index, child in enumerate(node.args):
+                    if child.type in batch_types:
+                        child_combinations = counts.get(id(child), 1)
+                        if child_combinations > 1:
+                            break
+                rest = combinations // child_combinations
+                stack.append(iter([(child, child_combinations, max(1, limit // rest),
+                                    (node, index, rest, limit, parent))]))
+
+    @staticmethod
+    def split_column(node: Node, combinations: int, limit: int, parent) -> Iterator[tuple]:
+        for start in range(0, combinations, limit):
+            piece = Node(node.type, node.args[start:start + limit], node.command)
+            yield piece, min(limit, combinations - start), limit, parent
+
+    @staticmethod
+    def split_branches(node: Node, counts: dict, limit: int, parent) -> Iterator[tuple]:
+        group = []
+        group_combinations = 0
+        for branch in node.args:
+            branch_combinations = counts.get(id(branch), 1)
+            if group and group_combinations + branch_combinations > limit:
+                piece = group[0] if len(group) == 1 else Node(node.type, group, node.command)
+                yield piece, group_combinations, limit, parent
+                group = []
+                group_combinations = 0
+            if branch_combinations > limit:
+                yield branch, branch_combinations, limit, parent
+            else:
+                group.append(branch)
+                group_combinations += branch_combinations
+        if group:
+            piece = group[0] if len(group) == 1 else Node(node.type, group, node.command)
+            yield piece, group_combinations, limit, parent
+
+    def select(self, node: Node, start: int, stop: int) -> Iterator[Node]:
+        counts = self.counts(node)
+        batch_types = self.batch_types
+        # Work items are (node, combinations, start, stop, parent), like in split. A piece of a batched operand is put
+        # back into its task through parent, (task, index, rest, after, parent): when after is None the piece covers
+        # whole rows of the task and the result is a finished piece, otherwise it is a single row and the result is
+        # selected again over the range after. Pieces built here have a single variant where they are looked at again.
+        combinations = counts.get(id(node), 1)
+        stack = [iter([(node, combinations, max(start, 0), min(stop, combinations), None)])]
+        while stack:
+            item = next(stack[-1], None)
+            if item is None:
+                stack.pop()
+                continue
+            node, combinations, start, stop, parent = item
+            if start >= stop:
+                continue
+            if start == 0 and stop == combinations:
+                if parent is None:
+                    yield node
+                    continue
+                task, index, rest, after, task_parent = parent
+                task = self.substitute(task, index, node)
+                if after is None:
+                    stack.append(iter([(task, rest * combinations, 0, rest * combinations, task_parent)]))
+                else:
+                    stack.append(iter([(task, rest, after[0], after[1], task_parent)]))
+            elif node.args.__class__ is DataColumn:
+                piece = Node(node.type, node.args[start:stop], node.command)
+                stack.append(iter([(piece, stop - start, 0, stop - start, parent)]))
+            elif node.type == NodeType.MULTI_EXPR.value:
+                stack.append(self.select_branches(node, counts, start, stop, parent))
+            else:
+                for index, child in enumerate(node.args):
+                    if child.type in batch_types:
+                        child_combinations = counts.get(id(child), 1)
+                        if child_combinations > 1:
+                            break
+                rest = combinations // child_combinations
+                first, last = start // rest, stop // rest
+                rows = []
+                if start % rest:
+                    after = start % rest, min(rest, stop - first * rest)
+                    rows.append((child, child_combinations, first, first + 1, (node, index, rest, after, parent)))
+                    first += 1
+                if first < last:
+                    rows.append((child, child_combinations, first, last, (node, index, rest, None, parent)))
+                if stop % rest and last >= first:
+                    after = 0, stop % rest
+                    rows.append((child, child_combinations, last, last + 1, (node, index, rest, after, parent)))
+                stack.append(iter(rows))
+
+    @staticmethod
+    def select_branches(node: Node, counts: dict, start: int, stop: int, parent) -> Iterator[tuple]:
+        offset = 0
+        for branch in node.args:
+            branch_combinations = counts.get(id(branch), 1)
+            if offset + branch_combinations > start:
+                yield (branch, branch_combinations, max(start - offset, 0), min(stop - offset, branch_combinations),
+                       parent)
+            offset += branch_combinations
+            if offset >= stop:
+                return
+
+    @staticmethod
+    def substitute(node: Node, index: int, child: Node) -> Node:
+        args = list(node.args)
+        args[index] = child
+        return Node(node.type, args, node.command)
@@ -0,0 +1,630 @@
+import builtins
+import marshal
+import math
+from collections.abc import Iterable, Iterator
+from itertools import islice, product
+
+from .array_backend import COMPENSATED_SUM
+from .builtins_fscc import Operation
+from .compiler import (ARROW, EVAL, LOAD_NAME, LOAD_VAR, POP, PRINT, PUSH_CONST, REDUCE, REDUCE_ADD, REDUCE_DIV, REDUCERS,
+                       RESULT, STORE, Compiler)
+from .data_binding import DataColumn
+from .environment import UNSET
+from .executor import Executor
+from .node_fscc import Node
+from .token_fscc import NodeType
+from .transformer_ast import Transformer
+
+FILENAME = '<fscc-python>'
+PARAMETERS = 'values, K, append, extend, emit, flush, lookup, assign, execute, calculate, add, subtract, multiply, divide'
+CONSTANT_TYPES = (int, float, bool)
+
+# Instructions only Transpiler emits, around Compiler code: LOOP digits / END_LOOP enclose a statement with ';' batches,
+# BRANCH (digit, branch), MERGE digit and JOIN digit bracket the branches of a batch, ELEMENT digit pushes the value
+# of a value set and EVAL_ELEMENT digit runs the current variant of a task that needs EVAL.
+LOOP = 100
+END_LOOP = 101
+BRANCH = 102
+MERGE = 103
+JOIN = 104
+ELEMENT = 105
+EVAL_ELEMENT = 106
+
+
+class PythonModule:
+    """
+    Python source generated by Transpiler, its constants and the code object compile() made of it.
+
+    The source defines run(values, K, append, ...), which PythonEngine.run calls with the environment's frame slots,
+    constants (K) and the callbacks the code needs. Modules pickle as their source, constants and marshalled code, so
+    they can be cached or sent to another process without being generated or compiled again.
+
+    Attributes:
+        source (str): Generated Python source (fscc --dump-python).
+        constants (list): Values the source refers to as K[i]: task nodes for EVAL and floats without a literal.
+        code (CodeType): Compiled source.
+        function (Callable): The run() function the code defines.
+    """
+
+    __slots__ = ['source', 'constants', 'code', 'function']
+
+    def __init__(self, source: str, constants: list, code=None):
+        self.source = source
+        self.constants = constants
+        self.code = code if code is not None else compile(source, FILENAME, 'exec')
+        namespace = {'__builtins__': builtins, 'UNSET': UNSET, 'product': product, 'variants': variants}
+        exec(self.code, namespace)
+        self.function = namespace['run']
+
+    def __reduce__(self):
+        return load_module, (self.source, self.constants, marshal.dumps(self.code))
+
+
+def load_module(source: str, constants: list, code: bytes) -> PythonModule:
+    """Rebuild a pickled PythonModule from its marshalled code (same Python version) without compiling it again."""
+
+    return PythonModule(source, constants, marshal.loads(code))
+
+
+def variants(digits: tuple) -> Iterator[tuple]:
+    """
+    Digit values of every variant of a statement whose batches are nested in other batches' branches, in order.
+
+    digits holds (base, parent, branch) per digit in preorder; a digit takes the values 0 to base - 1 when parent is -1
+    or digit parent is at branch, and -1 otherwise. The last digit varies fastest, like Transformer.expand.
+    """
+
+    size = len(digits)
+    values = [-1] * size
+    index, advancing = 0, False
+    while index >= 0:
+        if index == size:
+            yield tuple(values)
+            index, advancing = size - 1, True
+            continue
+        base, parent, branch = digits[index]
+        active = parent < 0 or values[parent] == branch
+        if advancing:
+            if active and values[index] + 1 < base:
+                values[index] += 1
+                index, advancing = index + 1, False
+            else:
+                index -= 1
+        elif active and base == 0:
+            index, advancing = index - 1, True
+        else:
+            values[index] = 0 if active else -1
+            index += 1
+
+
+class Transpiler:
+    """
+    Translates top-level statements (Parser.parse output, resolved by VariableResolver) into Python source, one function
+    per module, compiled with compile().
+
+    Every task is translated once, whatever its number of variants: a statement with ';' batches becomes a loop over
+    the variants in Transformer.expand order, with one digit per batch (the first one varying slowest). With direct=True
+    a batch whose branches are all constant tasks is folded through Operation into its value set, which the loop
+    iterates directly (product() of the sets when no batch sits in another one's branch); any other batch picks its
+    branch with 'if c<digit> == <branch>:' blocks, which stay flat however deep the batches nest, and a task that needs
+    EVAL loops over its expansion. Nested batches get their digits from variants(), which marks the digits of branches
+    that are not taken with -1.
+
+    Statements are lowered to Compiler instructions, so the evaluation order, the EVAL fallback for computed targets
+    and every other decision match the VirtualMachine; each instruction is then replayed on a symbolic stack of Python
+    expressions:
+    - variables become locals (v<slot>), loaded from the frame on first use, checked for UNSET once and written through
+      to the frame on every store, so the environment is exact even when the code raises; after an ARROW or EVAL, which
+      may write the frame behind the code's back, at the top of a loop and after a batch's branches, they are loaded
+      again;
+    - with direct=True, '+' becomes 0 + a + b (sum() for three or more operands where sum() is compensated), '-' an
+      in-place subtraction, '/' an in-place division with a zero check before each divisor and '*' an in-place product
+      behind a zero test per operand, so values, types and errors are those of Operation; operators with more than
+      UNROLL_LIMIT operands, and every operator when direct is False (an Executor with a MemoizingOperation), call the
+      Operation function instead;
+    - '-> print' appends to a buffer that is flushed to the Executor's output (or print()) before EVAL and when the
+      function returns or raises.
+
+    Attributes:
+        UNROLL_LIMIT (int): Largest operand count turned into arithmetic.
+        MODULE_SIZE (int): Statements per module in iter_transpile.
+        compiler (Compiler): Lowers tasks and variable assignments, and decides which tasks need EVAL.
+        transformer (Transformer): Expands the tasks that need EVAL and counts variants.
+        operation (Operation): Folds constant branches.
+        direct (bool): Whether '+', '-', '*' and '/' are inlined and constant branches are folded.
+
+    Methods:
+        transpile(statements) -> PythonModule: One module for every statement.
+        iter_transpile(statements, size=MODULE_SIZE) -> Iterator[PythonModule]: Modules of at most size statements.
+        lower(statement) -> list[tuple]: Instructions of one statement.
+        generate(code) -> tuple[str, list]: Source and constants for the instructions.
+    """
+
+    UNROLL_LIMIT = 16
+    MODULE_SIZE = 1024
+
+    def __init__(self, direct: bool = True):
+        self.compiler = Compiler()
+        self.transformer = Transformer()
+        self.operation = Operation()
+        self.direct = direct
+
+    def transpile(self, statements: Iterable[Node]) -> PythonModule:
+        code = []
+        for statement in statements:
+            code.extend(self.lower(statement))
+        return PythonModule(*self.generate(code))
+
+    def iter_transpile(self, statements: Iterable[Node], size: int = MODULE_SIZE) -> Iterator[PythonModule]:
+        statements = iter(statements)
+        while chunk := list(islice(statements, size)):
+            yield self.transpile(chunk)
+
+    def generate(self, code: list[tuple]) -> tuple[str, list]:
+        writer = ModuleWriter(self.direct, self.UNROLL_LIMIT)
+        for opcode, argument in code:
+            writer.instruction(opcode, argument)
+        return writer.source(), writer.constants
+
+    def lower(self, statement: Node) -> list[tuple]:
+        if statement.type == NodeType.VARIABLE_ASSIGNMENT.value:
+            assignment = Node(statement.type, self.transformer.variable_assignment(statement), line=statement.line)
+            return self.compiler.compile_statement(assignment)
+        if statement.type != NodeType.CALCULATION.value:
+            return []
+        multi_type = NodeType.MULTI_EXPR.value
+        code = []
+        roots = [statement.args]
+        while roots:
+            root = roots.pop()
+            if root.type == multi_type and root.args.__class__ is not DataColumn:
+                roots.extend(reversed(root.args))
+            else:
+                code.extend(self.lower_root(root))
+        return code
+
+    def lower_root(self, root: Node) -> list[tuple]:
+        """Instructions of one top-level variant source: its code and RESULT, inside LOOP and END_LOOP when it has
+        batches. Digits are (kind, data, parent): kind 'branch' (data is the branch count), 'value' (the values) or
+        'eval' (the variants), and parent (digit, branch) of the branch they sit in, or None."""
+
+        task_type = NodeType.TASK_NODE.value
+        variable_type = NodeType.VARIABLE.value
+        scalar_type = NodeType.SCALAR.value
+        multi_type = NodeType.MULTI_EXPR.value
+        code, digits = [], []
+        if root.type != task_type:
+            self.lower_eval(root, None, code, digits)
+        # Actions are (node, parent) to lower an operand, or (opcode, argument) to emit; they are popped in order.
+        actions = [(root, None)] if root.type == task_type else []
+        while actions:
+            current, argument = actions.pop()
+            if current.__class__ is not Node:
+                code.append((current, argument))
+            elif current.type == task_type:
+                layout = self.compiler.layout(current)
+                if layout is None:
+                    self.lower_eval(current, argument, code, digits)
+                    continue
+                end, targets = layout
+                operands = [child for child in current.args[:end]
+                            if child.type in (task_type, variable_type, scalar_type, multi_type)]
+                operator = current.command.args if current.command else None
+                actions.extend(reversed(targets))
+                if operator in REDUCERS:
+                    actions.append((REDUCERS[operator], len(operands)))
+                else:
+                    actions.append((REDUCE, (operator, len(operands))))
+                actions.extend([(child, argument) for child in reversed(operands)])
+            elif current.type == variable_type:
+                code.append((LOAD_VAR, current))
+            elif current.type == scalar_type:
+                code.append((LOAD_NAME, current.args) if isinstance(current.args, str) else (PUSH_CONST, current.args))
+            elif current.args.__class__ is DataColumn:
+                digits.append(('value', current.args, argument))
+                code.append((ELEMENT, len(digits) - 1))
+            elif len(current.args) == 1:
+                actions.append((current.args[0], argument))
+            else:
+                values = self.fold(current.args) if self.direct else None
+                if values is not None:
+                    digits.append(('value', values, argument))
+                    code.append((ELEMENT, len(digits) - 1))
+                    continue
+                digit = len(digits)
+                digits.append(('branch', len(current.args), argument))
+                actions.append((JOIN, digit))
+                for branch in reversed(range(len(current.args))):
+                    actions.extend([(MERGE, digit), (current.args[branch], (digit, branch)), (BRANCH, (digit, branch))])
+        code.append((RESULT, None))
+        if not digits:
+            return code
+        return [(LOOP, digits)] + code + [(END_LOOP, None)]
+
+    def lower_eval(self, node: Node, parent: tuple | None, code: list, digits: list):
+        if self.transformer.count(node) == 1:
+            code.append((EVAL, next(self.transformer.expand(node))))
+            return
+        if node.type == NodeType.MULTI_EXPR.value and node.args.__class__ is DataColumn:
+            digits.append(('eval', node.args, parent))
+        else:
+            digits.append(('eval', list(self.transformer.expand(node)), parent))
+        code.append((EVAL_ELEMENT, len(digits) - 1))
+
+    def fold(self, branches: list[Node]) -> list | None:
+        """Values of branches when every one is a number or a task without '->' whose operands fold, else None."""
+
+        task_type = NodeType.TASK_NODE.value
+        scalar_type = NodeType.SCALAR.value
+        folded = {}
+        stack = list(branches)
+        while stack:
+            current = stack[-1]
+            if current.type == scalar_type:
+                if not isinstance(current.args, CONSTANT_TYPES):
+                    return None
+                folded[id(stack.pop())] = current.args
+                continue
+            if current.type != task_type or not current.command or current.command.args not in REDUCERS:
+                return None
+            pending = [child for child in current.args if id(child) not in folded]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            try:
+                value = self.operation.calculate(current.command.args, [folded[id(child)] for child in current.args])
+            except Exception:
+                return None
+            if not isinstance(value, CONSTANT_TYPES):
+                return None
+            folded[id(current)] = value
+        return [folded[id(branch)] for branch in branches]
+
+
+class ModuleWriter:
+    """Symbolic stack and emitted lines of one Transpiler.generate call. Stack entries are (expression, slot of the
+    local it names or None, constant value or UNSET, whether it may be a list (EVAL)). Inside a loop, lines from
+    segment on belong to the branch guard names (None outside batches); close() puts them under 'if guard:'."""
+
+    def __init__(self, direct: bool, unroll_limit: int):
+        self.direct = direct
+        self.unroll_limit = unroll_limit
+        self.lines = []
+        self.constants = []
+        self.stack = []
+        self.fresh = set()
+        self.known = set()
+        self.temps = 0
+        self.loop = None
+        self.digits = []
+        self.sets = []
+        self.indexed = False
+        self.guard = None
+        self.segment = 0
+        self.branches = {}
+
+    def source(self) -> str:
+        body = '\n'.join(['        ' + line for line in self.lines]) or '        pass'
+        return f'def run({PARAMETERS}):\n    try:\n{body}\n    finally:\n        flush()\n'
+
+    def instruction(self, opcode: int, argument):
+        stack = self.stack
+        if opcode == LOAD_VAR:
+            self.load(argument)
+        elif opcode == PUSH_CONST:
+            stack.append((self.literal(argument), None, argument, False))
+        elif REDUCE_ADD <= opcode <= REDUCE_DIV:
+            operands = stack[len(stack) - argument:]
+            del stack[len(stack) - argument:]
+            stack.append(self.reduce('+-*/'[opcode - REDUCE_ADD], operands))
+        elif opcode == STORE:
+            self.store(argument)
+        elif opcode == RESULT:
+            expression, _, _, many = stack.pop()
+            if many:
+                self.lines.append(f'extend({expression}) if {expression}.__class__ is list else append({expression})')
+            else:
+                self.lines.append(f'append({expression})')
+        elif opcode == PRINT:
+            self.lines.append(f'emit({stack[-1][0]})')
+        elif opcode == POP:
+            stack.pop()
+        elif opcode == LOAD_NAME:
+            temp = self.temp()
+            self.lines.append(f'{temp} = lookup({argument!r})')
+            stack.append((temp, None, UNSET, False))
+        elif opcode == ARROW:
+            self.lines.append(f'assign({stack[-1][0]}, {argument!r})')
+            self.invalidate()
+        elif opcode == EVAL:
+            temp = self.temp()
+            self.lines.append('flush()')
+            self.lines.append(f'{temp} = execute(K[{self.constant(argument)}])')
+            stack.append((temp, None, UNSET, True))
+            self.invalidate()
+        elif opcode == REDUCE:
+            operator, count = argument
+            operands = stack[len(stack) - count:]
+            del stack[len(stack) - count:]
+            temp = self.temp()
+            self.lines.append(f'{temp} = calculate({operator!r}, [{self.join(operands)}])')
+            stack.append((temp, None, UNSET, False))
+        elif opcode == ELEMENT:
+            stack.append((self.element(argument), None, UNSET, False))
+        elif opcode == EVAL_ELEMENT:
+            temp = self.temp()
+            self.lines.append('flush()')
+            self.lines.append(f'{temp} = execute({self.element(argument)})')
+            stack.append((temp, None, UNSET, True))
+            self.invalidate()
+        elif opcode == BRANCH:
+            self.branch(*argument)
+        elif opcode == MERGE:
+            expression, _, _, many = stack.pop()
+            self.lines.append(f'b{argument} = {expression}')
+            self.branches[argument][3] |= many
+        elif opcode == JOIN:
+            self.close()
+            _, _, self.guard, many = self.branches.pop(argument)
+            self.invalidate()
+            stack.append((f'b{argument}', None, UNSET, many))
+        elif opcode == LOOP:
+            self.begin_loop(argument)
+        elif opcode == END_LOOP:
+            self.end_loop()
+        else:
+            raise ValueError(f"Invalid opcode: {opcode!r}")
+        if not stack:
+            self.temps = 0
+
+    def constant(self, value) -> int:
+        self.constants.append(value)
+        return len(self.constants) - 1
+
+    def begin_loop(self, digits: list[tuple]):
+        """Start the body of a loop over digits (see Transpiler.lower_root): each value set becomes a tuple literal or
+        a constant, and the loop runs over digit indexes from variants() when a digit sits in a branch."""
+
+        self.close()
+        self.invalidate()
+        self.loop = len(self.lines)
+        self.segment = self.loop
+        self.indexed = any([parent is not None for _, _, parent in digits])
+        self.sets = []
+        for kind, data, parent in digits:
+            if kind == 'branch':
+                self.sets.append((f'range({data})', data))
+            elif data.__class__ is DataColumn:
+                self.sets.append((f'K[{self.constant(data)}]' + ('.values' if kind == 'value' else ''), len(data)))
+            elif kind == 'value' and all([self.is_literal(value) for value in data]):
+                self.sets.append((f"({''.join([repr(value) + ', ' for value in data])})", len(data)))
+            else:
+                self.sets.append((f'K[{self.constant(data)}]', len(data)))
+        self.digits = digits
+
+    def end_loop(self):
+        self.close()
+        if self.indexed:
+            table = tuple([(size, -1 if parent is None else parent[0], -1 if parent is None else parent[1])
+                           for (_, size), (_, _, parent) in zip(self.sets, self.digits)])
+            header = f"for {', '.join([f'c{digit}' for digit in range(len(table))])}, in variants({table!r}):"
+        else:
+            names = [f'c{digit}' if kind == 'branch' else f'e{digit}' for digit, (kind, _, _) in enumerate(self.digits)]
+            iterables = [expression for expression, _ in self.sets]
+            if len(names) == 1:
+                header = f'for {names[0]} in {iterables[0]}:'
+            else:
+                header = f"for {', '.join(names)} in product({', '.join(iterables)}):"
+        self.lines[self.loop:] = [header] + ['    ' + line for line in self.lines[self.loop:]]
+        self.invalidate()
+        self.loop = None
+        self.segment = len(self.lines)
+
+    def element(self, digit: int) -> str:
+        """The current element of a value set or EVAL digit."""
+
+        if not self.indexed:
+            return f'e{digit}'
+        self.lines.append(f'e{digit} = {self.sets[digit][0]}[c{digit}]')
+        return f'e{digit}'
+
+    def branch(self, digit: int, branch: int):
+        """Start branch of a batch: the first one keeps the locals on the stack in temps (they may not be assigned in
+        another branch) and records the state every branch starts from."""
+
+        if branch == 0:
+            for slot in {source for _, source, _, _ in self.stack if source is not None}:
+                self.materialize(slot)
+            self.branches[digit] = [set(self.fresh), set(self.known), self.guard, False]
+        self.close()
+        fresh, known, _, _ = self.branches[digit]
+        self.fresh, self.known = set(fresh), set(known)
+        self.guard = f'c{digit} == {branch}'
+
+    def close(self):
+        """Put the lines of the current segment under its guard and start a new segment."""
+
+        if self.guard is not None and len(self.lines) > self.segment:
+            self.lines[self.segment:] = [f'if {self.guard}:'] + ['    ' + line for line in self.lines[self.segment:]]
+        self.segment = len(self.lines)
+
+    def literal(self, value) -> str:
+        if self.is_literal(value):
+            return repr(value)
+        return f'K[{self.constant(value)}]'
+
+    @staticmethod
+    def is_literal(value) -> bool:
+        return value is None or value.__class__ in (int, bool, str) or value.__class__ is float and math.isfinite(value)
+
+    def temp(self) -> str:
+        self.temps += 1
+        return f't{self.temps}'
+
+    @staticmethod
+    def join(operands: list) -> str:
+        return ', '.join([operand[0] for operand in operands])
+
+    def load(self, variable: Node):
+        slot = variable.args
+        local = f'v{slot}'
+        if slot not in self.fresh:
+            self.materialize(slot)
+            self.lines.append(f'{local} = values[{slot}]  # {variable.command}')
+            self.fresh.add(slot)
+            self.known.discard(slot)
+        if slot not in self.known:
+            message = f"Variable '{variable.command}' not found in environment"
+            self.lines.append(f'if {local} is UNSET: raise KeyError({message!r})')
+            self.known.add(slot)
+        self.stack.append((local, slot, UNSET, False))
+
+    def store(self, variable: Node):
+        slot = variable.args
+        expression, source, _, _ = self.stack[-1]
+        if source != slot:
+            self.materialize(slot)
+            expression = self.stack[-1][0]
+        self.lines.append(f'v{slot} = values[{slot}] = {expression}  # {variable.command}')
+        self.fresh.add(slot)
+        self.known.add(slot)
+
+    def materialize(self, slot: int):
+        """Copy stack entries that name local v<slot> into temps before the local is reassigned."""
+
+        for index, (expression, source, value, many) in enumerate(self.stack):
+            if source == slot:
+                temp = self.temp()
+                self.lines.append(f'{temp} = {expression}')
+                self.stack[index] = (temp, None, value, many)
+
+    def invalidate(self):
+        self.fresh.clear()
+        self.known.clear()
+
+    def reduce(self, operator: str, operands: list) -> tuple:
+        if not operands:
+            value = 0 if operator != '*' else 1
+            return repr(value), None, value, False
+        if len(operands) == 1 and operator in '-/':
+            return operands[0]
+        temp = self.temp()
+        if not self.direct or len(operands) > self.unroll_limit:
+            function = {'+': 'add', '-': 'subtract', '*': 'multiply', '/': 'divide'}[operator]
+            self.lines.append(f'{temp} = {function}([{self.join(operands)}])')
+        elif operator == '+':
+            if COMPENSATED_SUM and len(operands) > 2:
+                self.lines.append(f'{temp} = sum(({self.join(operands)},))')
+            else:
+                self.lines.append(f"{temp} = {' + '.join(['0'] + [operand[0] for operand in operands])}")
+        elif operator == '-':
+            self.lines.append(f'{temp} = {operands[0][0]}')
+            self.lines.extend([f'{temp} -= {operand[0]}' for operand in operands[1:]])
+        elif operator == '/':
+            self.divide(temp, operands)
+        else:
+            self.multiply(temp, operands)
+        return temp, None, UNSET, False
+
+    def divide(self, temp: str, operands: list):
+        self.lines.append(f'{temp} = {operands[0][0]}')
+        for expression, _, value, _ in operands[1:]:
+            if value is UNSET:
+                self.lines.append(f"if {expression} == 0: raise ZeroDivisionError('Division by zero')")
+            elif value == 0:
+                self.lines.append("raise ZeroDivisionError('Division by zero')")
+                return
+            self.lines.append(f'{temp} /= {expression}')
+
+    def multiply(self, temp: str, operands: list):
+        """Operation returns 0 at the first zero operand, after multiplying the operands before it (which may raise);
+        each runtime zero test becomes a branch that computes that prefix and then 0."""
+
+        branches = []
+        final = None
+        for index, (expression, _, value, _) in enumerate(operands):
+            if value is UNSET:
+                branches.append((f'{expression} == 0', self.product(temp, operands[:index]) + [f'{temp} = 0']))
+            elif value == 0:
+                final = self.product(temp, operands[:index]) + [f'{temp} = 0']
+                break
+        if final is None:
+            final = self.product(temp, operands)
+        if not branches:
+            self.lines.extend(final)
+            return
+        for index, (condition, body) in enumerate(branches):
+            self.lines.append(f"{'if' if index == 0 else 'elif'} {condition}:")
+            self.lines.extend(['    ' + line for line in body])
+        self.lines.append('else:')
+        self.lines.extend(['    ' + line for line in final])
+
+    @staticmethod
+    def product(temp: str, operands: list) -> list[str]:
+        if all(value is not UNSET and value.__class__ in (int, float, bool) for _, _, value, _ in operands):
+            return [] if not operands else [f"{temp} = {' * '.join(['1'] + [operand[0] for operand in operands])}"]
+        return [f'{temp} = 1'] + [f'{temp} *= {operand[0]}' for operand in operands]
+
+
+class PythonEngine:
+    """
+    Runs top-level statements (Parser.parse output, resolved or not) as Transpiler modules against an Executor's
+    environment, output and Operation; they are expanded by the generated loops, not by Transformer.
+
+    Results, printed output, variables and errors match Executor.iter_execute over their expansion. Modules are
+    independent of the environment they run in, so one module can be run any number of times (Program does this for
+    engine='python'); an Executor whose Operation is not a plain Operation (memo_size, profiling) gets modules that call
+    its functions instead of inlining the arithmetic.
+
+    Attributes:
+        executor (Executor): Supplies env, output, builtin print, the Operation and the tree-walker used by EVAL.
+        transpiler (Transpiler): Generates the modules for iter_execute and execute_statements.
+
+    Methods:
+        run(module, collect=True) -> list: Run one module and return its results ([] when collect is False).
+        iter_execute(statements) -> Iterator: Transpile and run Transpiler.MODULE_SIZE statements at a time.
+        execute_statements(statements, collect=True) -> list: Results of the statements as a list.
+    """
+
+    def __init__(self, executor: Executor | None = None):
+        self.executor = executor if executor is not None else Executor()
+        self.transpiler = Transpiler(direct=self.executor.operation.__class__ is Operation)
+
+    def run(self, module: PythonModule, collect: bool = True) -> list:
+        executor = self.executor
+        output = executor.output
+        results = []
+        printed = []
+
+        def flush():
+            if printed:
+                if output is not None:
+                    output.extend(printed)
+                else:
+                    for value in printed:
+                        executor.builtin_functions.print(value)
+                printed.clear()
+
+        calculator = executor.operation.calculator
+        module.function(executor.env.frame.values, module.constants,
+                        results.append if collect else discard, results.extend if collect else discard,
+                        printed.append, flush, executor.env.lookup, executor.env.add_variable,
+                        executor.execute_single_command, executor.operation.calculate,
+                        calculator['+'], calculator['-'], calculator['*'], calculator['/'])
+        return results
+
+    def iter_execute(self, statements: Iterable[Node]) -> Iterator:
+        for module in self.transpiler.iter_transpile(statements):
+            yield from self.run(module)
+
+    def execute_statements(self, statements: Iterable[Node], collect: bool = True) -> list:
+        if not collect:
+            for module in self.transpiler.iter_transpile(statements):
+                self.run(module, collect=False)
+            return []
+        return list(self.iter_execute(statements))
+
+
+def discard(value):
+    pass
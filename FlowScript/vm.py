@@ -0,0 +1,102 @@
+from collections.abc import Iterable, Iterator
+
+from .compiler import (ARROW, EVAL, LOAD_NAME, LOAD_VAR, POP, PRINT, PUSH_CONST, REDUCE, REDUCE_ADD, REDUCE_DIV, RESULT,
+                       STORE, Compiler)
+from .environment import UNSET
+from .executor import Executor
+from .node_fscc import Node
+
+
+class VirtualMachine:
+    """
+    Stack machine that runs Compiler bytecode against an Executor's environment, output and Operation.
+
+    The dispatch loop keeps the value stack and the frame's slot list in locals and handles the common opcodes
+    (LOAD_VAR, PUSH_CONST, REDUCE_ADD..REDUCE_DIV, STORE) first. Reductions call the same Operation functions the
+    tree-walker uses, on the top n values of the stack, so results, printed output, variables and errors match
+    Executor.iter_execute over the same transformed statements. Code can be compiled once and run any number of times
+    (Program does this for engine='vm'); running it only depends on the environment at run time.
+
+    Attributes:
+        executor (Executor): Supplies env, output, builtin print, the Operation and the tree-walker used by EVAL.
+        compiler (Compiler): Compiles statements for iter_execute and execute_statements.
+
+    Methods:
+        iter_run(code) -> Iterator: Run compiled code, yielding every result.
+        run(code, collect=True) -> list: Results of compiled code as a list ([] when collect is False).
+        iter_execute(statements) -> Iterator: Compile and run transformed statements one at a time.
+        execute_statements(statements, collect=True) -> list: Results of transformed statements as a list.
+    """
+
+    def __init__(self, executor: Executor | None = None):
+        self.executor = executor if executor is not None else Executor()
+        self.compiler = Compiler()
+
+    def iter_run(self, code: list[tuple]) -> Iterator:
+        executor = self.executor
+        env = executor.env
+        frame_values = env.frame.values
+        reducers = [executor.operation.calculator[operator] for operator in '+-*/']
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        for opcode, argument in code:
+            if opcode == LOAD_VAR:
+                value = frame_values[argument.args]
+                if value is UNSET:
+                    raise KeyError(f"Variable '{argument.command}' not found in environment")
+                push(value)
+            elif opcode == PUSH_CONST:
+                push(argument)
+            elif REDUCE_ADD <= opcode <= REDUCE_DIV:
+                start = len(stack) - argument
+                value = reducers[opcode - REDUCE_ADD](stack[start:])
+                del stack[start:]
+                push(value)
+            elif opcode == STORE:
+                frame_values[argument.args] = stack[-1]
+            elif opcode == RESULT:
+                value = pop()
+                if isinstance(value, list):
+                    yield from value
+                else:
+                    yield value
+            elif opcode == PRINT:
+                if executor.output is not None:
+                    executor.output.write(stack[-1])
+                else:
+                    executor.builtin_functions.print(stack[-1])
+            elif opcode == POP:
+                pop()
+            elif opcode == LOAD_NAME:
+                push(env.lookup(argument))
+            elif opcode == ARROW:
+                env.add_variable(stack[-1], argument)
+            elif opcode == EVAL:
+                push(executor.execute_single_command(argument))
+            elif opcode == REDUCE:
+                operator, count = argument
+                start = len(stack) - count
+                value = executor.operation.calculate(operator, stack[start:])
+                del stack[start:]
+                push(value)
+            else:
+                raise ValueError(f"Invalid opcode: {opcode!r}")
+
+    def run(self, code: list[tuple], collect: bool = True) -> list:
+        if not collect:
+            for _ in self.iter_run(code):
+                pass
+            return []
+        return list(self.iter_run(code))
+
+    def iter_execute(self, statements: Iterable[Node]) -> Iterator:
+        for code in self.compiler.iter_compile(statements):
+            yield from self.iter_run(code)
+
+    def execute_statements(self, statements: Iterable[Node], collect: bool = True) -> list:
+        if not collect:
+            for _ in self.iter_execute(statements):
+                pass
+            return []
+        return list(self.iter_execute(statements))
@@ -0,0 +1,225 @@
+import contextlib
+import difflib
+import io
+import math
+import os
+import sys
+import time
+
+from .dependencies import statement_effects, StatementEffects
+from .executor import Executor
+from .lexer import Lexer
+from .node_fscc import Node
+from .parallel import run_statement
+from .parser import Parser
+from .read_file import reader
+
+MISSING = object()
+
+
+def strip_comments(line: str, in_block: bool) -> tuple[str, bool]:
+    """Return the code part of one source line and whether a ### block comment is still open after it."""
+
+    code = ''
+    while line:
+        if in_block:
+            end = line.find('###')
+            if end < 0:
+                return code, True
+            line = line[end + 3:]
+            in_block = False
+        start = line.find('#')
+        if start < 0:
+            return code + line, False
+        code += line[:start]
+        if line.startswith('###', start):
+            line = line[start + 3:]
+            in_block = True
+        else:
+            return code, False
+    return code, in_block
+
+
+def split_regions(source: str) -> list[tuple[int, str]]:
+    """
+    Cut source into statement regions: runs of whole lines that hold complete top-level statements.
+
+    A region ends at the first line end where parentheses are balanced, no ### block comment is open and the line does
+    not end with '->', ',' or ';'. Returns (first line number, text) pairs; lexing each text on its own yields the
+    same tokens as lexing the whole file.
+    """
+
+    lines = source.splitlines(keepends=True)
+    regions = []
+    start = 0
+    depth = 0
+    in_block = False
+    for number, line in enumerate(lines):
+        code, in_block = strip_comments(line, in_block)
+        depth += code.count('(') - code.count(')')
+        if in_block or depth > 0 or code.rstrip().endswith(('->', ',', ';')):
+            continue
+        regions.append((start + 1, ''.join(lines[start:number + 1])))
+        start = number + 1
+        depth = 0
+    if start < len(lines):
+        regions.append((start + 1, ''.join(lines[start:])))
+    return regions
+
+
+class StatementRecord:
+    """
+    Outcome of executing one top-level statement, kept between WatchSession updates.
+
+    Attributes:
+        effects (StatementEffects): Static reads and writes of the statement.
+        inputs (tuple): (name, type, value) of every variable read, as seen when the statement ran; floats also carry
+            their sign, so 0.0 and -0.0 differ.
+        writes (dict[str, object]): Variables the statement assigned and their values afterwards.
+        results (list): Values the statement contributed to the program results.
+        output (str): Text the statement printed.
+    """
+
+    __slots__ = ['effects', 'inputs', 'writes', 'results', 'output']
+
+    def __init__(self, effects: StatementEffects, inputs: tuple, writes: dict, results: list, output: str):
+        self.effects = effects
+        self.inputs = inputs
+        self.writes = writes
+        self.results = results
+        self.output = output
+
+
+class WatchSession:
+    """
+    Incremental re-execution of a changing source, as used by `fscc --watch`.
+
+    The source is split into statement regions (split_regions) and difflib matches the region texts of the new source
+    against the previous one. Only regions that are new or changed are lexed and parsed again; unchanged regions keep
+    their statements and the StatementRecord of their last execution.
+
+    Execution replays the program in order against a fresh Environment. A statement whose record is still valid is not
+    executed: its writes are applied to the environment and its results and printed output are reused. A record is
+    valid when the statement is unchanged and every variable it reads (statement_effects) still holds the same value,
+    so edited statements, and everything downstream that reads a variable whose value they changed, run again, while
+    statements unaffected by the edit do not. Statements whose arrow targets are computed at run time record their
+    writes as the environment difference they caused.
+
+    Attributes:
+        engine (str): 'tree', 'factorized', 'vm' or 'python', as for main().
+        backend (str): Executor backend.
+        combination_limit (int | None): Executor combination_limit (factorized chunking, see planner.Planner).
+        stream (TextIO | None): Where printed output is written; None means the current sys.stdout.
+        regions (list[tuple[str, list[Node], list[StatementRecord | None]]]): Region text, statements and records.
+        executor (Executor | None): Executor of the last update, holding the final environment.
+        executed (int): Statements executed by the last update.
+        reused (int): Statements served from records by the last update.
+
+    Methods:
+        update(source) -> list: Bring the session up to date with source and return the program results.
+    """
+
+    def __init__(self, engine: str = 'tree', backend: str = 'python', stream=None,
+                 combination_limit: int | None = None):
+        self.engine = engine
+        self.backend = backend
+        self.combination_limit = combination_limit
+        self.stream = stream
+        self.regions = []
+        self.executor = None
+        self.executed = 0
+        self.reused = 0
+
+    def update(self, source: str) -> list:
+        previous = [region[0] for region in self.regions]
+        current = split_regions(source)
+        matcher = difflib.SequenceMatcher(None, previous, [text for _, text in current], autojunk=False)
+        regions = []
+        for tag, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+            if tag == 'equal':
+                regions.extend(self.regions[old_start:old_end])
+                continue
+            for line, text in current[new_start:new_end]:
+                statements = Parser(Lexer(text, line).make_tokens()).parse()
+                regions.append((text, statements, [None] * len(statements)))
+        self.regions = regions
+        return self.execute()
+
+    def execute(self) -> list:
+        self.executor = Executor(backend=self.backend, combination_limit=self.combination_limit)
+        variables = self.executor.env.variables['global']
+        stream = self.output_stream()
+        self.executed = self.reused = 0
+        results = []
+        for _, statements, records in self.regions:
+            for index, statement in enumerate(statements):
+                record = records[index]
+                if record is None or record.inputs != self.snapshot(record.effects, variables):
+                    records[index] = None
+                    record = records[index] = self.run(statement, variables)
+                    self.executed += 1
+                else:
+                    variables.update(record.writes)
+                    self.reused += 1
+                stream.write(record.output)
+                results.extend(record.results)
+        stream.flush()
+        return results
+
+    def run(self, statement: Node, variables: dict) -> StatementRecord:
+        effects = statement_effects(statement)
+        inputs = self.snapshot(effects, variables)
+        before = dict(variables) if effects.dynamic else None
+        output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output):
+                results = run_statement(self.executor, statement, self.engine)
+        except Exception:
+            self.output_stream().write(output.getvalue())
+            raise
+        if before is None:
+            writes = {name: variables[name] for name in effects.writes if name in variables}
+        else:
+            writes = {name: value for name, value in variables.items()
+                      if name not in before or self.signature(before[name]) != self.signature(value)}
+        return StatementRecord(effects, inputs, writes, results, output.getvalue())
+
+    def output_stream(self):
+        return self.stream if self.stream is not None else sys.stdout
+
+    def snapshot(self, effects: StatementEffects, variables: dict) -> tuple:
+        return tuple((name,) + self.signature(variables.get(name, MISSING)) for name in sorted(effects.reads))
+
+    @staticmethod
+    def signature(value) -> tuple:
+        if value.__class__ is float:
+            return float, value, math.copysign(1.0, value)
+        return type(value), value
+
+
+def watch(file: str, session: WatchSession, interval: float = 0.5):
+    """
+    Run file, then poll it every interval seconds and update session whenever it changes, until interrupted.
+
+    Errors from reading, parsing or executing are reported on stderr and the session waits for the next change.
+    """
+
+    stamp = None
+    while True:
+        try:
+            status = os.stat(file)
+            current = status.st_mtime_ns, status.st_size
+        except OSError:
+            current = None
+        if current is not None and current != stamp:
+            stamp = current
+            started = time.perf_counter()
+            try:
+                session.update(reader(file))
+            except Exception as error:
+                print(f'{type(error).__name__}: {error}', file=sys.stderr)
+            else:
+                elapsed = time.perf_counter() - started
+                print(f'[watch] {session.executed} executed, {session.reused} reused in {elapsed:.3f}s',
+                      file=sys.stderr)
+        time.sleep(interval)
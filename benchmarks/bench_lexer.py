@@ -0,0 +1,65 @@
+"""
+Throughput benchmark for Lexer.make_tokens against the character-at-a-time make_tokens_legacy.
+
+Usage:
+    python benchmarks/bench_lexer.py [--size MB] [--repeat N] [--skip-legacy]
+
+Builds a synthetic .fscc source of roughly the requested size from a mix of nested
+calculations, semicolon batches, assignments and comments, then reports MB/s for each scanner.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from FlowScript.lexer import Lexer
+
+STATEMENTS = (
+    '/(+(6, 2; 9, 7), -(5, 1; 4, 5))\n',
+    '+(2, 3 -> x -> print)        # x=5, print 5\n',
+    '*(x, 2.5 -> total_value)\n',
+    '0, True, False -> c, d, e\n',
+    '-(+(1, 2, 3, 4), *(10, 20; 30, 40), /(144.0, 12))\n',
+)
+
+
+def make_source(size_mb: float) -> str:
+    block = ''.join(STATEMENTS)
+    repeat = max(1, int(size_mb * 1024 * 1024 / len(block)))
+    return block * repeat
+
+
+def measure(method: str, code: str, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        lexer = Lexer(code)
+        start = time.perf_counter()
+        getattr(lexer, method)()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arguments.add_argument('--size', type=float, default=4.0, help='source size in MB')
+    arguments.add_argument('--repeat', type=int, default=3, help='runs per scanner, best is reported')
+    arguments.add_argument('--skip-legacy', action='store_true', help='only time the table-driven scanner')
+    options = arguments.parse_args()
+
+    code = make_source(options.size)
+    megabytes = len(code.encode('utf-8')) / (1024 * 1024)
+    tokens = len(Lexer(code).make_tokens())
+    print(f'source: {megabytes:.2f} MB, {tokens} tokens')
+
+    elapsed = measure('make_tokens', code, options.repeat)
+    print(f'make_tokens         {elapsed:8.3f} s  {megabytes / elapsed:8.2f} MB/s')
+    if not options.skip_legacy:
+        legacy = measure('make_tokens_legacy', code, options.repeat)
+        print(f'make_tokens_legacy  {legacy:8.3f} s  {megabytes / legacy:8.2f} MB/s')
+        print(f'speedup             {legacy / elapsed:8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
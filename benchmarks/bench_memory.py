@@ -0,0 +1,86 @@
+"""
+Memory footprint and traversal speed of the token and AST representations.
+
+Usage:
+    python benchmarks/bench_memory.py [--workload NAME] [--scale F]
+
+Compares a list of Token objects from Lexer.make_tokens with the packed TokenTable from
+Lexer.make_token_table (retained bytes under tracemalloc and parse time from each), then reports
+the retained size of the parsed AST and the time of a full iterative traversal and of executing it.
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from FlowScript.executor import Executor
+from FlowScript.lexer import Lexer
+from FlowScript.parser import Parser
+from FlowScript.profiler import count_nodes
+from FlowScript.transformer_ast import Transformer
+from workloads import WORKLOADS, generate
+
+
+def retained(build):
+    """Return the value built by build() and the bytes still allocated for it afterwards."""
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        value = build()
+        gc.collect()
+        return value, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def timed(function) -> tuple[object, float]:
+    start = time.perf_counter()
+    value = function()
+    return value, time.perf_counter() - start
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arguments.add_argument('--workload', choices=sorted(WORKLOADS), default='flat')
+    arguments.add_argument('--scale', type=float, default=5.0, help='multiplier for the workload size')
+    options = arguments.parse_args()
+
+    code = generate(options.workload, options.scale)
+    print(f'{options.workload}: {len(code) / (1024 * 1024):.2f} MB of source')
+
+    tokens, token_bytes = retained(lambda: Lexer(code).make_tokens())
+    table, table_bytes = retained(lambda: Lexer(code).make_token_table())
+    print(f'list[Token]   {len(tokens):>9} tokens  {token_bytes / 1024:10.1f} KiB  '
+          f'{token_bytes / len(tokens):6.1f} B/token')
+    print(f'TokenTable    {len(table):>9} tokens  {table_bytes / 1024:10.1f} KiB  '
+          f'{table_bytes / len(table):6.1f} B/token  ({token_bytes / table_bytes:.1f}x smaller)')
+
+    _, list_seconds = timed(lambda: Parser(tokens).parse())
+    _, table_seconds = timed(lambda: Parser(table).parse())
+    print(f'parse from list {list_seconds:8.3f} s, from TokenTable {table_seconds:8.3f} s')
+    del tokens
+
+    ast, ast_bytes = retained(lambda: Parser(table).parse())
+    nodes = count_nodes(ast)
+    print(f'AST           {nodes:>9} nodes   {ast_bytes / 1024:10.1f} KiB  {ast_bytes / nodes:6.1f} B/node')
+
+    _, traverse_seconds = timed(lambda: count_nodes(ast))
+    print(f'traverse      {traverse_seconds:8.3f} s')
+    with open(os.devnull, 'w') as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            _, execute_seconds = timed(lambda: Executor().execute_statements(Transformer().iter_transform(ast)))
+        finally:
+            sys.stdout = stdout
+    print(f'transform+execute {execute_seconds:8.3f} s')
+
+
+if __name__ == '__main__':
+    main()
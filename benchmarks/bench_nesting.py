@@ -0,0 +1,102 @@
+"""
+Throughput of every pipeline stage on a single expression nested 10 to 100,000 levels deep.
+
+Usage:
+    python benchmarks/bench_nesting.py [--depth N ...] [--width W] [--repeat N] [--save PATH]
+
+The source is workloads.chain(depth, width): +(1, -(1, *(1, ...))) with a ';' batch of width values at
+the bottom, so the tree engine executes width variants of depth levels each. Every stage is timed on its
+own (best of --repeat runs) and reported in thousands of nesting levels per second; a stage that raises
+(RecursionError on a recursive implementation) is reported as failed instead of aborting the run. Depths
+above the recursion limit are what the explicit-stack parser, resolver, Transformer and Executor are for.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from FlowScript.executor import Executor
+from FlowScript.lexer import Lexer
+from FlowScript.parser import Parser
+from FlowScript.resolver import resolve_variables
+from FlowScript.transformer_ast import Transformer
+from workloads import chain
+
+DEPTHS = (10, 100, 1000, 10000, 100000)
+STAGES = ('lex', 'parse', 'resolve', 'transform', 'execute', 'factorized')
+
+
+def run_stages(code: str) -> dict[str, float | None]:
+    """Seconds per stage; None for a stage that raised (and for the stages depending on it)."""
+
+    seconds = dict.fromkeys(STAGES)
+    executor = Executor()
+    steps = (
+        ('lex', lambda _: Lexer(code).make_tokens()),
+        ('parse', lambda tokens: Parser(tokens).parse()),
+        ('resolve', lambda ast: resolve_variables(ast, executor.env.frame)),
+        ('transform', lambda statements: (statements, list(Transformer().iter_transform(statements)))),
+        ('execute', lambda value: (value[0], executor.execute_statements(value[1]))),
+        ('factorized', lambda value: Executor().execute_factorized(value[0])),
+    )
+    value = None
+    for name, step in steps:
+        gc.collect()
+        start = time.perf_counter()
+        try:
+            value = step(value)
+        except RecursionError:
+            return seconds
+        seconds[name] = time.perf_counter() - start
+    return seconds
+
+
+def measure(depth: int, width: int, repeat: int) -> dict[str, float | None]:
+    code = chain(depth, width)
+    best = dict.fromkeys(STAGES)
+    for _ in range(repeat):
+        for name, elapsed in run_stages(code).items():
+            if elapsed is not None:
+                best[name] = min(elapsed, best[name]) if best[name] is not None else elapsed
+    return best
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arguments.add_argument('--depth', type=int, action='append',
+                           help=f'nesting depth to run (repeatable, default: {", ".join(map(str, DEPTHS))})')
+    arguments.add_argument('--width', type=int, default=1, help="values in the ';' batch at the bottom")
+    arguments.add_argument('--repeat', type=int, default=3, help='timed runs per depth, best is reported')
+    arguments.add_argument('--save', metavar='PATH', help='write the results as JSON')
+    options = arguments.parse_args()
+
+    print(f"{'depth':>8}  " + '  '.join(f'{stage:>10}' for stage in STAGES) + '   (k levels/s)')
+    results = {}
+    for depth in options.depth or DEPTHS:
+        seconds = measure(depth, options.width, options.repeat)
+        results[depth] = seconds
+        cells = [f'{depth / elapsed / 1000:10.1f}' if elapsed else f'{"failed":>10}' for elapsed in seconds.values()]
+        print(f'{depth:>8}  ' + '  '.join(cells))
+
+    if options.save:
+        record = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'recursion_limit': sys.getrecursionlimit(),
+            'width': options.width,
+            'results': results,
+        }
+        with open(options.save, 'w', encoding='utf-8') as file:
+            json.dump(record, file, indent=2)
+        print(f'results written to {options.save}')
+
+
+if __name__ == '__main__':
+    main()
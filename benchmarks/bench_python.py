@@ -0,0 +1,108 @@
+"""
+Transpiled Python code against the tree-walking Executor on the synthetic workloads: speedup.
+
+Usage:
+    python benchmarks/bench_python.py [--workload NAME ...] [--scale F] [--repeat N] [--save PATH]
+
+Every workload is parsed and resolved once. The statements are expanded once
+(Transformer.iter_transform) and executed by Executor.execute_statements, and transpiled as they
+are (Transpiler, which loops over the batches, in modules of Transpiler.MODULE_SIZE statements)
+and run by PythonEngine against the same Executor, whose environment is cleared before each run; that both engines agree is checked by
+tests/test_engines.py. Timings are the best of --repeat runs: 'transpile' generates and compiles
+the source of all statements, 'run' executes the compiled modules, and the speedups are tree/run
+(modules transpiled once and reused, as Program does and as fscc --engine python does when its
+ProgramCache holds the modules) and tree/(transpile + run) (one-shot, a cache miss).
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from FlowScript.executor import Executor
+from FlowScript.lexer import Lexer
+from FlowScript.parser import Parser
+from FlowScript.resolver import resolve_variables
+from FlowScript.transformer_ast import Transformer
+from FlowScript.transpiler import PythonEngine, Transpiler
+from workloads import WORKLOADS, generate
+
+
+def best(function, repeat: int) -> float:
+    elapsed = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    return elapsed
+
+
+def measure(code: str, repeat: int) -> dict:
+    executor = Executor()
+    engine = PythonEngine(executor)
+    statements = resolve_variables(Parser(Lexer(code).make_tokens()).parse(), executor.env.frame)
+    expanded = list(Transformer().iter_transform(statements))
+    modules = list(Transpiler().iter_transpile(statements))
+
+    def run_modules(collect: bool = True) -> list:
+        return [result for module in modules for result in engine.run(module, collect)]
+
+    def run(function):
+        executor.env.clear()
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            function()
+
+    tree_seconds = best(lambda: run(lambda: executor.execute_statements(expanded, collect=False)), repeat)
+    transpile_seconds = best(lambda: list(Transpiler().iter_transpile(statements)), repeat)
+    run_seconds = best(lambda: run(lambda: run_modules(collect=False)), repeat)
+    return {
+        'statements': len(expanded),
+        'source_lines': sum([module.source.count('\n') for module in modules]),
+        'tree_seconds': tree_seconds,
+        'transpile_seconds': transpile_seconds,
+        'run_seconds': run_seconds,
+        'speedup': tree_seconds / run_seconds,
+        'one_shot_speedup': tree_seconds / (transpile_seconds + run_seconds),
+    }
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arguments.add_argument('--workload', action='append', choices=sorted(WORKLOADS),
+                           help='workload to run (repeatable, default: all)')
+    arguments.add_argument('--scale', type=float, default=1.0, help='multiplier for the workload sizes')
+    arguments.add_argument('--repeat', type=int, default=3, help='timed runs per workload, best is reported')
+    arguments.add_argument('--save', metavar='PATH', help='write the results as JSON')
+    options = arguments.parse_args()
+
+    print(f"{'workload':<12} {'statements':>10} {'lines':>10} {'tree s':>9} {'transpile s':>11} {'run s':>9} "
+          f"{'speedup':>8} {'one-shot':>8}")
+    results = {}
+    for workload in options.workload or sorted(WORKLOADS):
+        result = results[workload] = measure(generate(workload, options.scale), options.repeat)
+        print(f"{workload:<12} {result['statements']:>10,} {result['source_lines']:>10,} "
+              f"{result['tree_seconds']:9.4f} {result['transpile_seconds']:11.4f} {result['run_seconds']:9.4f} "
+              f"{result['speedup']:7.2f}x {result['one_shot_speedup']:7.2f}x")
+
+    if options.save:
+        record = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'scale': options.scale,
+            'results': results,
+        }
+        with open(options.save, 'w', encoding='utf-8') as file:
+            json.dump(record, file, indent=2)
+        print(f'results written to {options.save}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+Per-stage timing and peak memory of the FlowScript pipeline on synthetic workloads.
+
+Usage:
+    python benchmarks/bench_stages.py [--workload NAME ...] [--scale F] [--repeat N]
+                                      [--engine tree|factorized] [--save PATH] [--compare PATH] [--tolerance F]
+
+For every workload in benchmarks/workloads.py the source is lexed, parsed, transformed and
+executed, and each stage is timed on its own (best of --repeat runs, without tracing). A separate
+pass under tracemalloc records the peak memory allocated while each stage runs. --save writes
+the numbers as a JSON baseline; --compare reports the ratio to a saved baseline and exits with
+status 1 when a stage got slower or hungrier than --tolerance allows.
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from FlowScript.executor import Executor
+from FlowScript.lexer import Lexer
+from FlowScript.parser import Parser
+from FlowScript.transformer_ast import Transformer
+from workloads import WORKLOADS, generate
+
+
+def stages(code: str, engine: str):
+    """Yield (stage name, callable) pairs; each callable takes the previous stage's output."""
+
+    yield 'lex', lambda _: Lexer(code).make_tokens()
+    yield 'parse', lambda tokens: Parser(tokens).parse()
+    if engine == 'factorized':
+        yield 'execute', lambda ast: Executor().execute_factorized(ast)
+    else:
+        yield 'transform', lambda ast: list(Transformer().iter_transform(ast))
+        yield 'execute', lambda statements: Executor().execute_statements(statements)
+
+
+def run_pipeline(code: str, engine: str, traced: bool) -> dict[str, float]:
+    measurements = {}
+    value = None
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for name, stage in stages(code, engine):
+            gc.collect()
+            if traced:
+                tracemalloc.reset_peak()
+                baseline = tracemalloc.get_traced_memory()[0]
+                value = stage(value)
+                measurements[name] = tracemalloc.get_traced_memory()[1] - baseline
+            else:
+                start = time.perf_counter()
+                value = stage(value)
+                measurements[name] = time.perf_counter() - start
+    return measurements
+
+
+def measure(code: str, engine: str, repeat: int) -> dict[str, dict[str, float]]:
+    seconds = {}
+    for _ in range(repeat):
+        for name, elapsed in run_pipeline(code, engine, traced=False).items():
+            seconds[name] = min(seconds.get(name, float('inf')), elapsed)
+    tracemalloc.start()
+    try:
+        peaks = run_pipeline(code, engine, traced=True)
+    finally:
+        tracemalloc.stop()
+    return {name: {'seconds': seconds[name], 'peak_bytes': peaks[name]} for name in seconds}
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for workload, workload_stages in results.items():
+        for stage, current in workload_stages.items():
+            previous = baseline.get(workload, {}).get(stage)
+            if previous is None:
+                continue
+            for metric in ('seconds', 'peak_bytes'):
+                if previous[metric] > 0 and current[metric] > previous[metric] * (1 + tolerance):
+                    regressions.append(f'{workload}/{stage} {metric}: {previous[metric]:.6g} -> {current[metric]:.6g}')
+    return regressions
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arguments.add_argument('--workload', action='append', choices=sorted(WORKLOADS),
+                           help='workload to run (repeatable, default: all)')
+    arguments.add_argument('--scale', type=float, default=1.0, help='multiplier for the workload sizes')
+    arguments.add_argument('--repeat', type=int, default=3, help='timed runs per workload, best is reported')
+    arguments.add_argument('--engine', choices=('tree', 'factorized'), default='tree')
+    arguments.add_argument('--save', metavar='PATH', help='write the results as a JSON baseline')
+    arguments.add_argument('--compare', metavar='PATH', help='compare against a JSON baseline')
+    arguments.add_argument('--tolerance', type=float, default=0.10,
+                           help='allowed relative slowdown or memory growth before --compare fails')
+    options = arguments.parse_args()
+
+    baseline = None
+    if options.compare:
+        with open(options.compare, encoding='utf-8') as file:
+            baseline = json.load(file)
+        if baseline['scale'] != options.scale or baseline['engine'] != options.engine:
+            arguments.error('--compare baseline was recorded with a different --scale or --engine')
+
+    results = {}
+    for workload in options.workload or sorted(WORKLOADS):
+        code = generate(workload, options.scale)
+        results[workload] = measure(code, options.engine, options.repeat)
+        print(f'{workload}: {len(code) / 1024:.1f} KiB')
+        for stage, current in results[workload].items():
+            line = f'  {stage:<10} {current["seconds"]:9.4f} s  {current["peak_bytes"] / 1024:10.1f} KiB'
+            previous = baseline['results'].get(workload, {}).get(stage) if baseline else None
+            if previous:
+                time_ratio = current['seconds'] / previous['seconds'] if previous['seconds'] else float('nan')
+                memory_ratio = current['peak_bytes'] / previous['peak_bytes'] if previous['peak_bytes'] else float('nan')
+                line += f'  ({time_ratio:.2f}x time, {memory_ratio:.2f}x memory)'
+            print(line)
+
+    if options.save:
+        record = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'scale': options.scale,
+            'engine': options.engine,
+            'results': results,
+        }
+        with open(options.save, 'w', encoding='utf-8') as file:
+            json.dump(record, file, indent=2)
+        print(f'baseline written to {options.save}')
+
+    if baseline:
+        regressions = compare(results, baseline['results'], options.tolerance)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            sys.exit(1)
+        print(f'no regressions beyond {options.tolerance:.0%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Bytecode VM against the tree-walking Executor on the synthetic workloads: speedup.
+
+Usage:
+    python benchmarks/bench_vm.py [--workload NAME ...] [--scale F] [--repeat N] [--save PATH]
+
+Every workload is parsed, resolved and expanded once (Transformer.iter_transform). The expanded
+statements are then executed by Executor.execute_statements and compiled (Compiler) and run by
+VirtualMachine against the same Executor, whose environment is cleared before each run; that both
+engines agree is checked by tests/test_engines.py. Timings are the best of --repeat runs: 'compile'
+is a fresh Compiler over all statements, 'run' executes the compiled code, and the speedups are
+tree/run (code compiled once and reused, as Program does and as fscc --engine vm does when its
+ProgramCache holds the code) and tree/(compile + run) (one-shot, a cache miss).
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from FlowScript.compiler import Compiler
+from FlowScript.executor import Executor
+from FlowScript.lexer import Lexer
+from FlowScript.parser import Parser
+from FlowScript.resolver import resolve_variables
+from FlowScript.transformer_ast import Transformer
+from FlowScript.vm import VirtualMachine
+from workloads import WORKLOADS, generate
+
+
+def best(function, repeat: int) -> float:
+    elapsed = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    return elapsed
+
+
+def measure(code: str, repeat: int) -> dict:
+    executor = Executor()
+    vm = VirtualMachine(executor)
+    statements = resolve_variables(Parser(Lexer(code).make_tokens()).parse(), executor.env.frame)
+    expanded = list(Transformer().iter_transform(statements))
+    bytecode = Compiler().compile_statements(expanded)
+
+    def run(function):
+        executor.env.clear()
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            function()
+
+    tree_seconds = best(lambda: run(lambda: executor.execute_statements(expanded, collect=False)), repeat)
+    compile_seconds = best(lambda: Compiler().compile_statements(expanded), repeat)
+    run_seconds = best(lambda: run(lambda: vm.run(bytecode, collect=False)), repeat)
+    return {
+        'statements': len(expanded),
+        'instructions': len(bytecode),
+        'tree_seconds': tree_seconds,
+        'compile_seconds': compile_seconds,
+        'run_seconds': run_seconds,
+        'speedup': tree_seconds / run_seconds,
+        'one_shot_speedup': tree_seconds / (compile_seconds + run_seconds),
+    }
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arguments.add_argument('--workload', action='append', choices=sorted(WORKLOADS),
+                           help='workload to run (repeatable, default: all)')
+    arguments.add_argument('--scale', type=float, default=1.0, help='multiplier for the workload sizes')
+    arguments.add_argument('--repeat', type=int, default=3, help='timed runs per workload, best is reported')
+    arguments.add_argument('--save', metavar='PATH', help='write the results as JSON')
+    options = arguments.parse_args()
+
+    print(f"{'workload':<12} {'statements':>10} {'instructions':>12} {'tree s':>9} {'compile s':>9} {'run s':>9} "
+          f"{'speedup':>8} {'one-shot':>8}")
+    results = {}
+    for workload in options.workload or sorted(WORKLOADS):
+        result = results[workload] = measure(generate(workload, options.scale), options.repeat)
+        print(f"{workload:<12} {result['statements']:>10,} {result['instructions']:>12,} "
+              f"{result['tree_seconds']:9.4f} {result['compile_seconds']:9.4f} {result['run_seconds']:9.4f} "
+              f"{result['speedup']:7.2f}x {result['one_shot_speedup']:7.2f}x")
+
+    if options.save:
+        record = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'scale': options.scale,
+            'results': results,
+        }
+        with open(options.save, 'w', encoding='utf-8') as file:
+            json.dump(record, file, indent=2)
+        print(f'results written to {options.save}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Parameterized synthetic .fscc workloads for the stage benchmarks.
+
+Each generator returns FlowScript source text whose size is controlled by its arguments, so a
+stage can be measured at several scales:
+    flat         - many short independent statements
+    nested       - deeply nested +(1, +(1, ...)) expressions
+    chain        - one expression nested depth levels deep, with a ';' batch of width values at the bottom
+    wide         - operands that are wide ';' batches, expanding into large cartesian products
+    assignments  - chains of arrow and batch assignments that read the previous variables
+"""
+
+
+def flat(statements: int = 20000) -> str:
+    templates = (
+        '+({i}, {j})\n',
+        '-({j}, 2.5, {i})\n',
+        '*({i}, 3; {j}, 4)\n',
+        '/({j}.5, 2)\n',
+    )
+    return ''.join(templates[i % len(templates)].format(i=i, j=i + 1) for i in range(statements))
+
+
+def nested(depth: int = 200, statements: int = 50) -> str:
+    operators = '+-*'
+    lines = []
+    for statement in range(statements):
+        expression = str(statement + 1)
+        for level in range(depth):
+            expression = f'{operators[level % len(operators)]}(1, {expression})'
+        lines.append(expression + '\n')
+    return ''.join(lines)
+
+
+def chain(depth: int = 10000, width: int = 1) -> str:
+    operators = '+-*'
+    opening = ''.join(f'{operators[level % len(operators)]}(1, ' for level in range(depth))
+    batch = ';'.join(str(value) for value in range(1, width + 1))
+    return opening + batch + ')' * depth + '\n'
+
+
+def wide(width: int = 30, operands: int = 3, statements: int = 4) -> str:
+    batch = ';'.join(str(value) for value in range(1, width + 1))
+    expression = '+(' + ', '.join(f'+({batch})' for _ in range(operands)) + ')\n'
+    return expression * statements
+
+
+def identifier(prefix: str, index: int) -> str:
+    """Letters-only variable name (identifiers cannot contain digits)."""
+
+    letters = ''
+    while True:
+        index, digit = divmod(index, 26)
+        letters = 'abcdefghijklmnopqrstuvwxyz'[digit] + letters
+        if not index:
+            return prefix + letters
+
+
+def assignments(chain: int = 5000) -> str:
+    lines = ['0, 1 -> va, wa\n']
+    for i in range(1, chain + 1):
+        v, w = identifier('v', i), identifier('w', i)
+        previous_v, previous_w = identifier('v', i - 1), identifier('w', i - 1)
+        if i % 10 == 0:
+            lines.append(f'+({previous_v}, {previous_w} -> print)\n{i}, {i}.5 -> {v}, {w}\n')
+        else:
+            lines.append(f'+({previous_v}, 1 -> {v}) -({previous_w}, +(1; 2) -> {w})\n')
+    return ''.join(lines)
+
+
+WORKLOADS = {
+    'flat': flat,
+    'nested': nested,
+    'chain': chain,
+    'wide': wide,
+    'assignments': assignments,
+}
+
+SIZE_PARAMETERS = {
+    'flat': ('statements',),
+    'nested': ('statements',),
+    'chain': ('depth',),
+    'wide': ('width',),
+    'assignments': ('chain',),
+}
+
+
+def generate(name: str, scale: float = 1.0) -> str:
+    """Source of workload name with its size parameters multiplied by scale."""
+
+    generator = WORKLOADS[name]
+    defaults = generator.__defaults__ or ()
+    parameters = generator.__code__.co_varnames[:generator.__code__.co_argcount]
+    arguments = dict(zip(parameters[-len(defaults):], defaults))
+    for parameter in SIZE_PARAMETERS[name]:
+        arguments[parameter] = max(1, int(arguments[parameter] * scale))
+    return generator(**arguments)
@@ -0,0 +1,18 @@
+import pytest
+
+from FlowScript import array_backend
+from FlowScript.builtins_fscc import Operation
+
+pytestmark = pytest.mark.skipif(not array_backend.ArrayOperation.available(), reason='NumPy is not installed')
+
+
+def test_compensated_float_sums_fall_back(monkeypatch):
+    monkeypatch.setattr(array_backend, 'COMPENSATED_SUM', True)
+    operation = array_backend.ArrayOperation()
+    assert operation.combine('+', [[0.1], [0.2], [0.3]]) is None
+    assert operation.combine('+', [[1], [2], [3]]).tolist() == [6]
+    assert operation.combine('+', [[0.1], [0.2]]).tolist() == [Operation().calculate('+', [0.1, 0.2])]
+
+
+def test_zero_divisor_falls_back():
+    assert array_backend.ArrayOperation().combine('/', [[4.0, 8.0], [2.0, 0.0]]) is None
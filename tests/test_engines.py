@@ -0,0 +1,86 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+from FlowScript.executor import Executor
+from FlowScript.lexer import Lexer
+from FlowScript.parser import Parser
+from FlowScript.resolver import resolve_variables
+from FlowScript.transformer_ast import Transformer
+from FlowScript.transpiler import PythonEngine
+from FlowScript.vm import VirtualMachine
+
+RUNNERS = {'vm': VirtualMachine, 'python': PythonEngine}
+
+PROGRAMS = [
+    '/(+(6, 2; 9, 7), -(5, 1; 4, 5))\n',
+    '+(3, 0 -> a)\n+(a, 2; 4 -> b -> print)\n*(b, a; 2, 7)\n',
+    '1, 2 -> a, b -> print, c\n-(a, b, c; 2.5, a -> a)\n',
+    '+(7, *(2, 3 -> t -> print); 1 -> u)\n/(t, u; 1, t)\n',
+    '+(1, 2 -> +(0, 1))\n',
+    '/(+(4;8), -(2;0) -> print)\n',
+    '+(missing, 1)\n',
+    '+(1, 2 ->)\n',
+    '+(1, 2 -> +(0; 1))\n',
+    '+(3 -> x)\n+(5 -> y)\n+(+(1; 2), +(x; 3), +(+(5; y), 1; *(2; 0, y -> y)) -> print)\n+(y, x; y -> x)\n',
+]
+
+
+def generate(rng: random.Random, statements: int) -> str:
+    """Random program of tasks over a few variables, with nested tasks, ';' batches and '->' targets."""
+
+    defined = []
+
+    def operand(depth):
+        if depth and rng.random() < 0.35:
+            return task(depth - 1)
+        if defined and rng.random() < 0.3:
+            return rng.choice(defined)
+        return str(rng.choice([0, 1, 2, 3, 7, 0.5, 2.5, 'True', 9007199254740993]))
+
+    def task(depth):
+        groups = []
+        for _ in range(rng.choice([1, 1, 2, 3])):
+            operands = [operand(depth) for _ in range(rng.randint(1, 3))]
+            if rng.random() < 0.3:
+                target = rng.choice(['a', 'b', 'print'])
+                operands[-1] += f' -> {target}'
+                if target != 'print' and target not in defined:
+                    defined.append(target)
+            groups.append(', '.join(operands))
+        return f"{rng.choice('+-*/')}({'; '.join(groups)})"
+
+    return ''.join(task(rng.randint(0, 3)) + '\n' for _ in range(statements))
+
+
+def snapshot(source: str, engine: str) -> tuple:
+    """Results (or the error), printed text and variables of source run by engine on a fresh Executor."""
+
+    executor = Executor()
+    statements = resolve_variables(Parser(Lexer(source).make_tokens()).parse(), executor.env.frame)
+    runner = RUNNERS[engine](executor) if engine in RUNNERS else executor
+    if engine != 'python':
+        statements = Transformer().iter_transform(statements)
+    printed = io.StringIO()
+    with contextlib.redirect_stdout(printed):
+        try:
+            outcome = 'ok', runner.execute_statements(statements)
+        except Exception as error:
+            outcome = 'error', f'{type(error).__name__}: {error}'
+    return repr(outcome), printed.getvalue(), repr(dict(executor.env.variables['global']))
+
+
+@pytest.mark.parametrize('engine', sorted(RUNNERS))
+@pytest.mark.parametrize('source', PROGRAMS)
+def test_engine_matches_tree(engine, source):
+    assert snapshot(source, engine) == snapshot(source, 'tree')
+
+
+@pytest.mark.parametrize('engine', sorted(RUNNERS))
+def test_engine_matches_tree_on_random_programs(engine):
+    rng = random.Random(2024)
+    for _ in range(200):
+        source = generate(rng, rng.randint(1, 6))
+        assert snapshot(source, engine) == snapshot(source, 'tree'), source
@@ -0,0 +1,55 @@
+import pytest
+
+from FlowScript import compile_program
+from FlowScript.array_backend import ArrayOperation
+
+ENGINES = [('tree', 'python'), ('factorized', 'python'), ('vm', 'python'), ('python', 'python')]
+if ArrayOperation.available():
+    ENGINES.append(('factorized', 'numpy'))
+
+
+@pytest.mark.parametrize('engine, backend', ENGINES)
+def test_failing_combination_keeps_earlier_prints(engine, backend, capsys):
+    program = compile_program('/(+(4;8), -(2;0) -> print)', engine=engine, backend=backend)
+    with pytest.raises(ZeroDivisionError, match='Division by zero'):
+        program.run()
+    assert capsys.readouterr().out == '2.0\n'
+
+
+@pytest.mark.parametrize('engine, backend', ENGINES)
+def test_failing_combination_keeps_earlier_assignments(engine, backend):
+    program = compile_program('/(+(4;8), -(2;0) -> v)', engine=engine, backend=backend)
+    with pytest.raises(ZeroDivisionError):
+        program.run()
+    assert program.executor.env.lookup('v') == 2.0
+
+
+def test_iter_factorized_yields_results_before_failure():
+    program = compile_program('/(+(4;8;12), -(2;1;0))', engine='factorized')
+    results = []
+    with pytest.raises(ZeroDivisionError):
+        for batch in program.executor.iter_factorized(program.statements):
+            results.extend(batch)
+    assert results == [2.0, 4.0]
+
+
+@pytest.mark.parametrize('engine, backend', ENGINES)
+@pytest.mark.parametrize('source, printed, variables', [
+    ('*(/(1,1;1,0), 5 -> print)', '5.0\n', {}),
+    ('/(2, -(7; /(0.5, 0), 1.5) -> a -> print)', '0.2857142857142857\n', {'a': 2 / 7}),
+])
+def test_failing_operand_keeps_earlier_combinations(engine, backend, source, printed, variables, capsys):
+    program = compile_program(source, engine=engine, backend=backend)
+    with pytest.raises(ZeroDivisionError):
+        program.run()
+    assert capsys.readouterr().out == printed
+    assert dict(program.executor.env.variables['global']) == variables
+
+
+def test_iter_factorized_yields_results_before_failing_operand():
+    program = compile_program('*(/(1,1;1,2;1,0), 5)', engine='factorized')
+    results = []
+    with pytest.raises(ZeroDivisionError):
+        for batch in program.executor.iter_factorized(program.statements):
+            results.extend(batch)
+    assert results == [5.0, 2.5]
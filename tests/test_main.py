@@ -0,0 +1,91 @@
+import pytest
+
+from FlowScript.array_backend import ArrayOperation
+from FlowScript.main import build_argument_parser, build_serve_parser, main
+
+ENGINES = [['--engine', 'tree'], ['--engine', 'factorized'], ['--engine', 'vm'], ['--engine', 'python']]
+if ArrayOperation.available():
+    ENGINES.append(['--engine', 'factorized', '--backend', 'numpy'])
+
+MODES = [[], ['--optimize'], ['--jobs', '2'], ['--shards', '2', '--shard-min', '2'], ['--max-combinations', '1'],
+         ['--stream'], ['--plan']]
+
+
+@pytest.fixture
+def script(tmp_path):
+    path = tmp_path / 'a.fscc'
+    path.write_text('+(1, 2 -> print)\n*(3, 4 -> print)\n', encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.parametrize('options, message', [
+    (['--watch', '--jobs', '2'], '--watch cannot be combined with --jobs 2'),
+    (['--remote', '--output', 'file'], '--remote cannot be combined with --output file'),
+    (['--profile', '--engine', 'python'], '--profile cannot be combined with --engine python'),
+    (['--shards', '2', '--stream'], '--shards cannot be combined with --stream'),
+    (['--backend', 'numpy'], '--backend numpy requires --engine factorized'),
+])
+def test_conflicting_options_are_rejected(script, options, message, capsys):
+    with pytest.raises(SystemExit):
+        main([script, '--no-cache'] + options)
+    assert message in capsys.readouterr().err
+
+
+def test_batch_conflicts(script, capsys):
+    with pytest.raises(SystemExit):
+        main([script, script, '--stream'])
+    assert 'a batch cannot be combined with --stream' in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('engine', ['tree', 'factorized', 'vm', 'python'])
+def test_runs_script(script, engine, capsys):
+    main([script, '--no-cache', '--engine', engine])
+    assert capsys.readouterr().out == '3\n12\n'
+
+
+def test_serve_is_a_subcommand():
+    options = build_serve_parser().parse_args(['--jobs', '3', '--socket', 'x.sock'])
+    assert (options.jobs, options.socket) == (3, 'x.sock')
+    assert build_argument_parser().parse_args(['./serve']).files == ['./serve']
+
+
+def test_jobs_runs_deep_statements(tmp_path, capsys):
+    depth = 3000
+    path = tmp_path / 'deep.fscc'
+    path.write_text('1 -> x\n' + '-(' * depth + 'x; 3' + ', 1)' * (depth - 1) + ', 1 -> print)\n+(x, 1 -> print)\n',
+                    encoding='utf-8')
+    main([str(path), '--no-cache', '--jobs', '2'])
+    assert capsys.readouterr().out == f'{2 - depth}\n{3 - depth}\n2\n'
+
+
+@pytest.mark.parametrize('engine', ENGINES, ids=' '.join)
+@pytest.mark.parametrize('mode', MODES, ids=lambda mode: ' '.join(mode) or 'default')
+def test_deep_statements_run_in_every_mode(tmp_path, capsys, engine, mode):
+    depth = 5000
+    path = tmp_path / 'deep.fscc'
+    path.write_text('1 -> x\n' + '-(' * depth + 'x; 3' + ', 1)' * (depth - 1) + ', 1 -> print)\n+(x, 1 -> print)\n',
+                    encoding='utf-8')
+    main([str(path), '--no-cache'] + engine + mode)
+    output = capsys.readouterr().out
+    if mode == ['--plan']:
+        assert output.splitlines()[2].split()[:2] == ['2', '2']
+    else:
+        assert output == f'{2 - depth}\n{3 - depth}\n2\n'
+
+
+def test_bind_accepts_variable_names(tmp_path, capsys):
+    column = tmp_path / 'values.csv'
+    column.write_text('1.5\n2.5\n', encoding='utf-8')
+    path = tmp_path / 'bind.fscc'
+    path.write_text("*(total_value, 2 -> print)\n+(x', 1 -> print)\n", encoding='utf-8')
+    main([str(path), '--no-cache', '--bind', f'total_value={column}', '--bind', f"x'={column}"])
+    assert capsys.readouterr().out == '3.0\n5.0\n2.5\n3.5\n'
+
+
+@pytest.mark.parametrize('name', ['print', 'True', 'None', 'a1', 'x y'])
+def test_bind_rejects_other_names(script, tmp_path, name, capsys):
+    column = tmp_path / 'values.csv'
+    column.write_text('1.5\n', encoding='utf-8')
+    with pytest.raises(SystemExit):
+        main([script, '--no-cache', '--bind', f'{name}={column}'])
+    assert f'{name!r} is not a variable name' in capsys.readouterr().err
@@ -0,0 +1,48 @@
+import pytest
+
+from FlowScript.lexer import Lexer
+from FlowScript.main import main
+from FlowScript.optimizer import optimize
+from FlowScript.parser import Parser
+
+
+def run(tmp_path, source, options, capsys):
+    script = tmp_path / 'a.fscc'
+    script.write_text(source, encoding='utf-8')
+    try:
+        main([str(script), '--no-cache'] + options)
+    except Exception as error:
+        outcome = f'{type(error).__name__}: {error}'
+    else:
+        outcome = None
+    return outcome, capsys.readouterr().out
+
+
+@pytest.mark.parametrize('engine', ['tree', 'factorized', 'vm', 'python'])
+@pytest.mark.parametrize('source', [
+    '/(1, 0 -> a)\n',
+    '1 -> a\n+(a, /(a, 0) -> b)\n',
+    '+(1, 2 -> a -> print)\n*(3, 4 -> b)\n-(5, 1; 2, 2 -> print)\n',
+    '+(1, 2 -> print)\n/(+(1, 1), -(2, 2) -> c)\n+(3, 3 -> print)\n',
+    '2 -> a\n+(a, 1 -> a -> print)\n*(a, a; 1, a -> print)\n',
+])
+def test_optimized_run_matches(tmp_path, capsys, engine, source):
+    expected = run(tmp_path, source, ['--engine', engine], capsys)
+    assert run(tmp_path, source, ['--engine', engine, '--optimize'], capsys) == expected
+
+
+def test_zero_division_is_not_folded_away():
+    statements, report = optimize(Parser(Lexer('/(1, 0 -> a)\n').make_tokens()).parse(), live=(),
+                                  keep_results=False)
+    assert len(statements) == 1
+    assert report.folded == 0
+
+
+def test_deep_nesting(tmp_path, capsys):
+    depth = 5000
+    source = '1 -> x\n' + '+(' * depth + 'x' + ', 1)' * (depth - 1) + ', 1 -> print)\n'
+    assert run(tmp_path, source, ['--optimize'], capsys) == (None, f'{depth + 1}\n')
+    statements, report = optimize(Parser(Lexer('+(' * depth + '1' + ', 1)' * depth).make_tokens()).parse())
+    assert report.folded == depth
+    task = statements[0].args.args[0]
+    assert [operand.args for operand in task.args] == [depth + 1]
@@ -0,0 +1,67 @@
+import io
+
+import pytest
+
+from FlowScript.batch import run_file
+from FlowScript.lexer import Lexer
+from FlowScript.parallel import execute_chunk
+from FlowScript.parser import Parser
+from FlowScript.planner import Planner
+from FlowScript.server import execute_request
+from FlowScript.transformer_ast import Transformer
+from FlowScript.watch import WatchSession
+
+SOURCE = '+(+(1, 0; 2, 0; 3, 0), *(4, 1; 5, 1))\n'
+RESULTS = [5, 6, 6, 7, 7, 8]
+
+
+@pytest.fixture
+def splits(monkeypatch):
+    calls = []
+    split = Transformer.split
+
+    def counting_split(self, node, limit):
+        calls.append(limit)
+        return split(self, node, limit)
+
+    monkeypatch.setattr(Transformer, 'split', counting_split)
+    return calls
+
+
+def test_parallel_workers_use_the_limit(splits):
+    statement = Parser(Lexer(SOURCE).make_tokens()).parse()[0]
+    [(results, _, _, error)] = execute_chunk([(statement, {}, set())], 'factorized', 'python', 2)
+    assert error is None and results == RESULTS
+    assert splits and splits[0] == 2
+
+
+def test_watch_uses_the_limit(splits):
+    session = WatchSession('factorized', stream=io.StringIO(), combination_limit=2)
+    assert session.update(SOURCE) == RESULTS
+    assert splits and splits[0] == 2
+
+
+def test_remote_requests_use_the_limit(splits):
+    response = execute_request({'source': SOURCE, 'engine': 'factorized', 'combination_limit': 2})
+    assert response['ok'] and response['results'] == RESULTS
+    assert splits and splits[0] == 2
+
+
+def test_batch_files_use_the_limit(splits, tmp_path):
+    path = tmp_path / 'a.fscc'
+    path.write_text(SOURCE, encoding='utf-8')
+    result = run_file(str(path), 'factorized', use_cache=False, combination_limit=2)
+    assert result['ok'] and result['results'] == RESULTS
+    assert splits and splits[0] == 2
+
+
+@pytest.mark.parametrize('limit', [1, 2, 4])
+def test_deep_statement_is_planned_and_split(limit):
+    depth = 5000
+    source = '-(' * depth + '1; 2; 3, 4; 5' + ', 1)' * depth + '\n'
+    statement = Parser(Lexer(source).make_tokens()).parse()[0]
+    plan = Planner(limit).plan([statement])
+    pieces = list(Transformer().split(statement.args, limit))
+    assert plan.statements[0].combinations == 4
+    assert plan.statements[0].chunks == len(pieces) == -(-4 // limit)
+    assert plan.statements[0].expanded_bytes > 0
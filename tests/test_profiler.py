@@ -0,0 +1,20 @@
+import pytest
+
+from FlowScript.array_backend import ArrayOperation
+from FlowScript.profiler import Profiler
+
+SOURCE = '/(+(6, 2; 9, 7; 1, 1), -(5, 1; 4, 5))\n'
+
+
+def test_counts_calculations():
+    report = Profiler('factorized', trace_memory=False).profile(SOURCE)
+    assert report.calculations == 11
+    assert report.array_calculations == 0
+
+
+@pytest.mark.skipif(not ArrayOperation.available(), reason='NumPy is not installed')
+def test_counts_numpy_backend_calculations():
+    report = Profiler('factorized', 'numpy', trace_memory=False).profile(SOURCE)
+    assert report.calculations == 11
+    assert report.array_calculations == 11
+    assert '11 as NumPy arrays' in report.format()
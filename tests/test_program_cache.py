@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from FlowScript.compiler import Compiler
+from FlowScript.main import main
+from FlowScript.program_cache import ProgramCache, decode_bytecode
+from FlowScript.lexer import Lexer
+from FlowScript.parser import Parser
+from FlowScript.transpiler import Transpiler
+
+
+def parse(source):
+    return Parser(Lexer(source).make_tokens()).parse()
+
+
+def test_store_and_load(tmp_path):
+    cache = ProgramCache(str(tmp_path))
+    source = '+(1, 2 -> print)'
+    cache.store(source, parse(source))
+    assert repr(cache.load(source)) == repr(parse(source))
+
+
+def test_failed_replace_removes_temporary_file(tmp_path, monkeypatch):
+    def fail(source, destination):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(os, 'replace', fail)
+    cache = ProgramCache(str(tmp_path))
+    cache.store('+(1, 2)', parse('+(1, 2)'))
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize('options', [['--engine', 'vm'], ['--engine', 'python'],
+                                     ['--engine', 'python', '--memoize', '8']])
+def test_compiled_code_is_loaded_from_the_cache(tmp_path, monkeypatch, capsys, options):
+    script = tmp_path / 'a.fscc'
+    script.write_text('+(3, 0 -> a)\n+(a, 2; 4 -> b -> print)\n*(b, a; 2, 7 -> print)\n+(1, 2 -> +(0, 1))\n',
+                      encoding='utf-8')
+    arguments = [str(script), '--cache-dir', str(tmp_path / 'cache')] + options
+    main(arguments)
+    expected = capsys.readouterr().out
+
+    def fail(self, *arguments):
+        raise AssertionError('compiled again')
+
+    monkeypatch.setattr(Compiler, 'compile_statement', fail)
+    monkeypatch.setattr(Transpiler, 'generate', fail)
+    monkeypatch.setattr(Parser, 'parse', fail)
+    main(arguments)
+    assert capsys.readouterr().out == expected == '4\n14\n'
+
+
+def test_failed_run_stores_no_vm_code(tmp_path):
+    script = tmp_path / 'a.fscc'
+    script.write_text('+(1, 2)\n/(1, 0)\n', encoding='utf-8')
+    cache = ProgramCache(str(tmp_path / 'cache'))
+    with pytest.raises(ZeroDivisionError):
+        main([str(script), '--engine', 'vm', '--cache-dir', cache.directory])
+    assert cache.load_compiled(script.read_text(encoding='utf-8'), 'vm', decode_bytecode) is None
@@ -0,0 +1,31 @@
+import pytest
+
+from FlowScript.read_file import read_chunks, reader
+
+
+@pytest.fixture
+def invalid_utf8(tmp_path):
+    path = tmp_path / 'bad.fscc'
+    path.write_bytes(b'+(1, 2 -> print)\n\xff\n')
+    return str(path)
+
+
+def test_reader_reports_decode_errors(invalid_utf8):
+    with pytest.raises(UnicodeDecodeError, match='failed to decode'):
+        reader(invalid_utf8)
+
+
+def test_read_chunks_reports_decode_errors(invalid_utf8):
+    with pytest.raises(UnicodeDecodeError, match='failed to decode'):
+        list(read_chunks(invalid_utf8, chunk_size=4))
+
+
+def test_read_chunks_matches_reader(tmp_path):
+    path = tmp_path / 'a.fscc'
+    path.write_text('+(1, 2 -> print)\n# é ü\n', encoding='utf-8')
+    assert ''.join(read_chunks(str(path), chunk_size=3)) == reader(str(path))
+
+
+def test_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        list(read_chunks(str(tmp_path / 'missing.fscc')))
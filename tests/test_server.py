@@ -0,0 +1,25 @@
+from FlowScript.server import ParseCache, execute_request
+
+
+def test_parse_cache_reuses_statements_by_digest():
+    cache = ParseCache()
+    statements = cache.parse('+(1, 2)\n')
+    assert cache.parse('+(1, 2)\n') is statements
+    assert all(isinstance(key, bytes) and len(key) == 16 for key in cache.entries)
+
+
+def test_parse_cache_stays_within_max_bytes():
+    cache = ParseCache(max_bytes=40)
+    sources = [f'+({index}, {index})\n' for index in range(10)]
+    for source in sources:
+        cache.parse(source)
+    assert cache.size == sum(size for _, size in cache.entries.values()) <= 40
+    assert cache.parse(sources[-1]) is cache.entries.popitem()[1][0]
+    cache.parse('+(1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16)\n')
+    assert cache.size <= 40
+
+
+def test_requests_share_parsed_source():
+    for _ in range(2):
+        response = execute_request({'source': '+(1; 2, 3 -> print)\n'})
+        assert response['ok'] and response['results'] == [1, 5] and response['output'] == '5\n'
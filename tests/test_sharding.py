@@ -0,0 +1,44 @@
+import contextlib
+import io
+
+import pytest
+
+from FlowScript.executor import Executor
+from FlowScript.lexer import Lexer
+from FlowScript.parser import Parser
+from FlowScript.sharding import ShardedExecutor
+
+ENGINES = ['tree', 'factorized', 'vm', 'python']
+
+PROGRAMS = [
+    '+(1; 2; 3, 10; 20; 30; 40 -> print)\n',
+    '2 -> x\n*(x; 3; 5, +(4; 5; 6, 1; 7) -> a -> print)\n+(a, 1 -> b -> print)\n',
+    '/(+(1; 2; 3, 4; 0), -(2; 1; 3, 1; 0) -> c -> print)\n+(c, 1)\n',
+    '-(' * 3000 + '1; 3; 5; 7' + ', 1)' * 2999 + ', 1 -> d -> print)\n+(d, 1 -> print)\n',
+]
+
+
+def snapshot(source: str, engine: str, min_combinations: int) -> tuple:
+    """
+    Results, error, printed text and variables of source run through ShardedExecutor.
+
+    Results are left out when the run fails: both runs hand them over in batches, so how many precede the error differs.
+    """
+
+    executor = Executor()
+    sharded = ShardedExecutor(executor, 2, engine, min_combinations)
+    results, error = [], None
+    printed = io.StringIO()
+    with contextlib.redirect_stdout(printed):
+        try:
+            for batch in sharded.iter_execute(Parser(Lexer(source).make_tokens()).parse()):
+                results.extend(batch)
+        except Exception as exception:
+            error = f'{type(exception).__name__}: {exception}'
+    return results if error is None else None, error, printed.getvalue(), dict(executor.env.variables['global'])
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('source', PROGRAMS, ids=['flat', 'variables', 'error', 'deep'])
+def test_sharded_run_matches_sequential_run(engine, source):
+    assert snapshot(source, engine, 2) == snapshot(source, engine, ShardedExecutor.MIN_COMBINATIONS)
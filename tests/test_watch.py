@@ -0,0 +1,16 @@
+import io
+
+from FlowScript.watch import WatchSession
+
+
+def test_unchanged_statements_are_reused():
+    session = WatchSession(stream=io.StringIO())
+    session.update('3 -> k\n+(k, 1 -> print)\n*(2, 2 -> print)\n')
+    session.update('4 -> k\n+(k, 1 -> print)\n*(2, 2 -> print)\n')
+    assert (session.executed, session.reused) == (2, 1)
+
+
+def test_signature_distinguishes_signed_zeros():
+    assert WatchSession.signature(0.0) != WatchSession.signature(-0.0)
+    assert WatchSession.signature(1.5) == WatchSession.signature(1.5)
+    assert WatchSession.signature(1) != WatchSession.signature(1.0)